@@ -1,5 +1,20 @@
 from __future__ import annotations
 
-from agentic_blueprint_catalog.agents.pi_calculator import PiCalculator
+from typing import Any
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agentic_blueprint_catalog.agents.pi_calculator import PiCalculator
 
 __all__ = ['PiCalculator']
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first access, so that importing the package does not
+    # import academy.
+    if name == 'PiCalculator':
+        from agentic_blueprint_catalog.agents.pi_calculator import PiCalculator  # noqa: PLC0415
+
+        globals()[name] = PiCalculator
+        return PiCalculator
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -3,28 +3,37 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import os
 import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
 
-import parsl
 from academy.agent import action
 from academy.agent import Agent
-from parsl import Config
-from parsl import python_app
-from parsl.executors import HighThroughputExecutor
-from parsl.launchers import MpiExecLauncher
-from parsl.providers import LocalProvider
 
 
-@python_app
-def md_sim_tool(duration: int = 10) -> str:
-    """Simulate call to a Molecular Dynamics tool."""
+def _md_sim(duration: int = 10) -> str:
     import platform  # noqa: PLC0415
 
     time.sleep(duration)
     return platform.uname().node
 
 
+@functools.cache
+def _md_sim_app() -> Callable[..., Any]:
+    # Parsl is imported on first use rather than with the module.
+    from parsl import python_app  # noqa: PLC0415
+
+    return python_app(_md_sim)
+
+
+def md_sim_tool(duration: int = 10) -> Future[str]:
+    """Simulate call to a Molecular Dynamics tool."""
+    return _md_sim_app()(duration)
+
+
 class Director(Agent):
     """Director agent that runs MD sim tools in parallel."""
 
@@ -37,6 +46,12 @@ class Director(Agent):
 
     async def agent_on_startup(self) -> None:
         """On startup, use Parsl as a task executor."""
+        import parsl  # noqa: PLC0415
+        from parsl import Config  # noqa: PLC0415
+        from parsl.executors import HighThroughputExecutor  # noqa: PLC0415
+        from parsl.launchers import MpiExecLauncher  # noqa: PLC0415
+        from parsl.providers import LocalProvider  # noqa: PLC0415
+
         os.environ['PBS_NODEFILE'] = self.nodefile
         with open(self.nodefile) as f:
             nodes = f.readlines()
@@ -86,6 +101,8 @@ class Director(Agent):
 
     async def agent_on_shutdown(self) -> None:
         """Cleanup parsl."""
+        import parsl  # noqa: PLC0415
+
         self.dfk.cleanup()
         self.dfk = None
         parsl.clear()
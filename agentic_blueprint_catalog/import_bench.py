@@ -0,0 +1,78 @@
+"""Measure the cold import time of the catalog's modules.
+
+    python -m agentic_blueprint_catalog.import_bench [module ...]
+
+Every import runs in a fresh interpreter, as on a newly spawned worker, and
+the median of several runs is reported together with the heavy third-party
+packages the import pulled in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = (
+    'agentic_blueprint_catalog.observability',
+    'agentic_blueprint_catalog.observability.message',
+    'agentic_blueprint_catalog.observability.codec',
+    'agentic_blueprint_catalog.observability.monitored_agent',
+    'agentic_blueprint_catalog.observability.dashboard',
+    'agentic_blueprint_catalog.observability.user_agent',
+    'agentic_blueprint_catalog.agents',
+    'agentic_blueprint_catalog.agents.director',
+    'agentic_blueprint_catalog.model.model',
+)
+
+HEAVY = ('academy', 'flask', 'psutil', 'requests', 'aiohttp', 'httpx', 'langchain_core', 'langchain_openai', 'openai', 'parsl', 'globus_compute_sdk')
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, runs: int) -> tuple[float, list[str]]:
+    """Return the median import time of a module in ms and the heavy packages it loads."""
+    times: list[float] = []
+    loaded: list[str] = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result['ms'])
+        loaded = result['loaded']
+    return statistics.median(times), loaded
+
+
+def main() -> None:
+    """Print the import time and heavy dependencies of each module."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=MODULES, help='Modules to import')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module')
+    args = parser.parse_args()
+
+    width = max(len(m) for m in args.modules) + 2
+    print(f'{"module":<{width}}{"ms":>8}  loaded')
+    for module in args.modules:
+        try:
+            ms, loaded = measure(module, args.runs)
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else f'exit code {e.returncode}'
+            print(f'{module:<{width}}{"-":>8}  {error}')
+            continue
+        print(f'{module:<{width}}{ms:>8.1f}  {", ".join(loaded) or "-"}')
+
+
+if __name__ == '__main__':
+    main()
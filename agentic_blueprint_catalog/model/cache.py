@@ -0,0 +1,333 @@
+"""Response cache for the chat models returned by :func:`.model.get_llm`.
+
+LangChain passes a cache the serialized prompt messages and an
+``llm_string`` describing the model, its parameters and any bound tools, so
+an exact hit means the same request to the same model. Responses are kept
+in a memory LRU and, optionally, in a SQLite file shared by every process
+on the node. An optional third tier returns the response of a previous
+prompt whose embedding is close enough to the new one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.caches import BaseCache
+from langchain_core.caches import RETURN_VAL_TYPE
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import message_to_dict
+from langchain_core.messages import messages_from_dict
+from langchain_core.outputs import ChatGeneration
+from langchain_core.outputs import Generation
+
+logger = logging.getLogger(__name__)
+
+# Disk entries removed at once when the store is over its size limit, so
+# that eviction does not run on every write.
+_EVICT_FRACTION = 0.1
+
+
+@dataclass
+class CacheStats:
+    """Counters of a :class:`ResponseCache` since it was created or cleared."""
+
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    semantic_hits: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the counters and the hit rate."""
+        return {**asdict(self), 'hit_rate': self.hit_rate}
+
+
+def _key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f'{llm_string}\x00{prompt}'.encode()).hexdigest()
+
+
+def _dumps(generations: Sequence[Generation]) -> str:
+    items: list[dict[str, Any]] = []
+    for g in generations:
+        if isinstance(g, ChatGeneration):
+            items.append({'message': message_to_dict(g.message), 'info': g.generation_info})
+        else:
+            items.append({'text': g.text, 'info': g.generation_info})
+    return json.dumps(items, default=str)
+
+
+def _loads(value: str) -> list[Generation]:
+    generations: list[Generation] = []
+    for item in json.loads(value):
+        if 'message' in item:
+            message = messages_from_dict([item['message']])[0]
+            generations.append(ChatGeneration(message=message, generation_info=item['info']))
+        else:
+            generations.append(Generation(text=item['text'], generation_info=item['info']))
+    return generations
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b, strict=False))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ResponseCache(BaseCache):
+    """Exact-match response cache with optional disk and similarity tiers.
+
+    Lookups try, in order: the memory LRU, the SQLite store at ``path`` (a
+    hit is promoted to memory) and, if ``embeddings`` is given, the most
+    similar earlier prompt to the same model with the same tools and
+    parameters. Thread-safe; async lookups that hit memory do not leave the
+    event loop.
+
+    Args:
+        path: SQLite file for the disk tier (``~`` is expanded), or None to
+            keep responses in memory only.
+        max_memory_entries: Size of the memory LRU.
+        ttl_s: Lifetime of an entry in seconds, or None to keep entries
+            until they are evicted.
+        max_disk_entries: Size of the disk tier; the least recently used
+            entries are removed beyond it.
+        embeddings: Embedding model for the similarity tier.
+        similarity_threshold: Minimum cosine similarity for a similarity
+            hit. Keep it high: a near miss returns another prompt's answer.
+        max_semantic_entries: Number of prompt embeddings kept in memory.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str | None = None,
+        *,
+        max_memory_entries: int = 1024,
+        ttl_s: float | None = None,
+        max_disk_entries: int = 100_000,
+        embeddings: Embeddings | None = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 4096,
+    ) -> None:
+        if max_memory_entries <= 0 or max_disk_entries <= 0:
+            raise ValueError('Cache sizes must be positive')
+        self.path = os.path.expanduser(path) if path is not None else None
+        self.max_memory_entries = max_memory_entries
+        self.ttl_s = ttl_s
+        self.max_disk_entries = max_disk_entries
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        # key -> (created, generations)
+        self._memory: OrderedDict[str, tuple[float, list[Generation]]] = OrderedDict()
+        # key -> (llm_string, embedding)
+        self._vectors: OrderedDict[str, tuple[str, list[float]]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        if self.path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, llm_string TEXT, value TEXT, created REAL, accessed REAL)',
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def stats(self) -> CacheStats:
+        """Return a copy of the hit, miss and eviction counters."""
+        with self._lock:
+            return CacheStats(**asdict(self._stats))
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_s is not None and now - created > self.ttl_s
+
+    def _remember(self, key: str, created: float, generations: list[Generation]) -> None:
+        """Add to the memory LRU. Must hold the lock."""
+        self._memory[key] = (created, generations)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _lookup_memory(self, key: str, now: float) -> list[Generation] | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0], now):
+                del self._memory[key]
+                self._stats.expired += 1
+                return None
+            self._memory.move_to_end(key)
+            return entry[1]
+
+    def _lookup_disk(self, key: str, now: float) -> list[Generation] | None:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute('SELECT value, created FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self._expired(created, now):
+                self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._stats.expired += 1
+                return None
+            self._db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            generations = _loads(value)
+            self._remember(key, created, generations)
+            return generations
+
+    def _lookup_similar(self, prompt: str, llm_string: str, now: float) -> list[Generation] | None:
+        if self.embeddings is None:
+            return None
+        vector = self.embeddings.embed_query(prompt)
+        with self._lock:
+            candidates = [(key, v) for key, (s, v) in self._vectors.items() if s == llm_string]
+        best, best_score = None, self.similarity_threshold
+        for key, v in candidates:
+            score = _cosine(vector, v)
+            if score >= best_score:
+                best, best_score = key, score
+        if best is None:
+            return None
+        return self._lookup_memory(best, now) or self._lookup_disk(best, now)
+
+    def _count(self, tier: str | None) -> None:
+        with self._lock:
+            if tier is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+                setattr(self._stats, f'{tier}_hits', getattr(self._stats, f'{tier}_hits') + 1)
+
+    def _lookup(self, prompt: str, llm_string: str, *, memory: bool = True) -> list[Generation] | None:
+        key = _key(prompt, llm_string)
+        now = time.time()
+        for tier, find in (
+            ('memory', lambda: self._lookup_memory(key, now) if memory else None),
+            ('disk', lambda: self._lookup_disk(key, now)),
+            ('semantic', lambda: self._lookup_similar(prompt, llm_string, now)),
+        ):
+            generations = find()
+            if generations is not None:
+                self._count(tier)
+                return generations
+        self._count(None)
+        return None
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Return the cached response to a prompt, or None on a miss."""
+        return self._lookup(prompt, llm_string)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the response to a prompt."""
+        key = _key(prompt, llm_string)
+        now = time.time()
+        generations = list(return_val)
+        vector = self.embeddings.embed_query(prompt) if self.embeddings is not None else None
+        with self._lock:
+            self._remember(key, now, generations)
+            self._stats.writes += 1
+            if vector is not None:
+                self._vectors[key] = (llm_string, vector)
+                self._vectors.move_to_end(key)
+                while len(self._vectors) > self.max_semantic_entries:
+                    self._vectors.popitem(last=False)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                    (key, llm_string, _dumps(generations), now, now),
+                )
+                self._evict_disk(now)
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired and least recently used rows. Must hold the lock."""
+        assert self._db is not None
+        (count,) = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()
+        if count <= self.max_disk_entries:
+            return
+        if self.ttl_s is not None:
+            expired = self._db.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl_s,)).rowcount
+            self._stats.expired += expired
+            count -= expired
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            excess += int(self.max_disk_entries * _EVICT_FRACTION)
+            self._stats.evictions += self._db.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)',
+                (excess,),
+            ).rowcount
+
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Async :meth:`lookup`; only disk and similarity lookups use a thread."""
+        generations = self._lookup_memory(_key(prompt, llm_string), time.time())
+        if generations is not None:
+            self._count('memory')
+            return generations
+        if self._db is None and self.embeddings is None:
+            self._count(None)
+            return None
+        return await asyncio.to_thread(self._lookup, prompt, llm_string, memory=False)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Async :meth:`update`."""
+        if self._db is None and self.embeddings is None:
+            self.update(prompt, llm_string, return_val)
+        else:
+            await asyncio.to_thread(self.update, prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self._vectors.clear()
+            self._stats = CacheStats()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+
+    async def aclear(self, **kwargs: Any) -> None:
+        """Async :meth:`clear`."""
+        self.clear()
+
+    def close(self) -> None:
+        """Close the disk store."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def cache_from_env() -> ResponseCache | None:
+    """Return the cache configured by ``OPENAI_RESPONSE_CACHE``, if any.
+
+    The variable is ``memory`` for a memory-only cache or the path of the
+    SQLite file; ``OPENAI_RESPONSE_CACHE_TTL`` sets the lifetime in seconds.
+    """
+    value = os.environ.get('OPENAI_RESPONSE_CACHE', '').strip()
+    if not value:
+        return None
+    ttl = os.environ.get('OPENAI_RESPONSE_CACHE_TTL')
+    return ResponseCache(path=None if value == 'memory' else value, ttl_s=float(ttl) if ttl else None)
@@ -0,0 +1,177 @@
+"""Safe evaluation of the arithmetic expressions passed to the ``calculate`` tools.
+
+An expression is parsed once, checked against a whitelist of syntax
+(numbers, arithmetic and bitwise operators, a few ``math`` functions and
+constants, and caller-supplied variables) and compiled. Compiled
+expressions are cached, so a repeated expression costs one dictionary
+lookup plus its evaluation.
+
+Operators that can build huge integers (``**``, ``*`` and ``<<``) are
+replaced by checked versions that refuse results larger than
+:data:`MAX_INT_BITS`, so an expression like ``9**9**9`` fails at once
+instead of hanging the worker. Together with the limit on expression
+length, this bounds the time any expression can take.
+"""
+
+from __future__ import annotations
+
+import ast
+import functools
+import math
+from collections.abc import Callable
+from collections.abc import Mapping
+from types import CodeType
+from typing import Any
+
+MAX_LENGTH = 2000
+MAX_INT_BITS = 10_000
+_CACHE_SIZE = 4096
+
+Number = int | float | complex
+
+
+class ExpressionError(ValueError):
+    """An expression is not allowed or cannot be evaluated."""
+
+
+def _check_bits(bits: float) -> None:
+    if bits > MAX_INT_BITS:
+        raise ExpressionError(f'Result too large (more than {MAX_INT_BITS} bits)')
+
+
+def _pow(a: Number, b: Number) -> Number:
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        _check_bits(math.ceil(b * math.log2(abs(a))))
+    return a**b
+
+
+def _mul(a: Number, b: Number) -> Number:
+    if isinstance(a, int) and isinstance(b, int):
+        _check_bits(a.bit_length() + b.bit_length() - 1)
+    return a * b
+
+
+def _lshift(a: int, b: int) -> int:
+    if a and b > 0:
+        _check_bits(a.bit_length() + b)
+    return a << b
+
+
+_MATH = 'sqrt exp log log2 log10 sin cos tan asin acos atan atan2 sinh cosh tanh floor ceil hypot degrees radians'
+_FUNCTIONS: dict[str, Callable[..., Any]] = {'abs': abs, 'round': round, 'min': min, 'max': max, **{name: getattr(math, name) for name in _MATH.split()}}
+_CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': math.tau}
+_CHECKED = {ast.Pow: '_pow', ast.Mult: '_mul', ast.LShift: '_lshift'}
+_GLOBALS: dict[str, Any] = {'__builtins__': {}, '_pow': _pow, '_mul': _mul, '_lshift': _lshift, **_FUNCTIONS, **_CONSTANTS}
+_ALLOWED = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+    ast.Call,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.LShift,
+    ast.RShift,
+    ast.BitAnd,
+    ast.BitOr,
+    ast.BitXor,
+    ast.UAdd,
+    ast.USub,
+    ast.Invert,
+)
+
+
+class _Checked(ast.NodeTransformer):
+    """Validates the syntax tree and routes unbounded operators through checks."""
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        if not isinstance(node, _ALLOWED):
+            raise ExpressionError(f'{type(node).__name__} is not allowed')
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if type(node.value) not in (int, float, complex):
+            raise ExpressionError(f'Constant {node.value!r} is not a number')
+        return node
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id.startswith('_'):
+            raise ExpressionError(f'Name {node.id!r} is not allowed')
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords:
+            raise ExpressionError('Only calls of ' + ', '.join(sorted(_FUNCTIONS)) + ' with positional arguments are allowed')
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        checked = _CHECKED.get(type(node.op))
+        if checked is None:
+            return node
+        return ast.copy_location(ast.Call(func=ast.Name(checked, ast.Load()), args=[node.left, node.right], keywords=[]), node)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def compile_expression(expression: str) -> CodeType:
+    """Parse, check and compile an expression; cached.
+
+    Raises:
+        ExpressionError: If the expression is too long, malformed or uses
+            anything but the allowed syntax.
+    """
+    if len(expression) > MAX_LENGTH:
+        raise ExpressionError(f'Expression longer than {MAX_LENGTH} characters')
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+        tree = ast.fix_missing_locations(_Checked().visit(tree))
+        return compile(tree, '<expression>', 'eval')
+    except SyntaxError as e:
+        raise ExpressionError(f'Invalid expression: {e.msg}') from None
+    except (RecursionError, MemoryError):
+        raise ExpressionError('Expression is nested too deeply') from None
+
+
+def evaluate(expression: str, variables: Mapping[str, Number] | None = None) -> Number:
+    """Evaluate an arithmetic expression.
+
+    Args:
+        expression: E.g. ``'347 * 892'`` or ``'sqrt(x**2 + y**2)'``.
+        variables: Values of the names used in the expression.
+
+    Raises:
+        ExpressionError: If the expression is not allowed, refers to an
+            unknown name, or fails (division by zero, overflow, a result
+            beyond :data:`MAX_INT_BITS`, ...).
+    """
+    code = compile_expression(expression)
+    try:
+        result = eval(code, _GLOBALS, dict(variables or {}))
+    except ExpressionError:
+        raise
+    except NameError as e:
+        raise ExpressionError(f'Unknown name: {e.name}') from None
+    except (ArithmeticError, ValueError, TypeError) as e:
+        raise ExpressionError(f'{type(e).__name__}: {e}') from None
+    if not isinstance(result, (int, float, complex)):
+        raise ExpressionError(f'Result is not a number: {result!r}')
+    return result
+
+
+def evaluate_many(expressions: list[str], variables: Mapping[str, Number] | None = None) -> list[Number | ExpressionError]:
+    """Evaluate several expressions; a failing one yields its error in place of a result."""
+    results: list[Number | ExpressionError] = []
+    for expression in expressions:
+        try:
+            results.append(evaluate(expression, variables))
+        except ExpressionError as e:
+            results.append(e)
+    return results
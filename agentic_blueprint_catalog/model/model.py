@@ -1,35 +1,151 @@
 # Load model based on configuration set in the .env file at the project root
 from __future__ import annotations
 
+import importlib.util
 import logging
 import os
+import threading
 from collections.abc import Callable
 from collections.abc import Sequence
 from typing import Any
+from typing import TYPE_CHECKING
 
 from dotenv import find_dotenv
 from dotenv import load_dotenv
+from langchain_core.caches import BaseCache
 from langchain_core.language_models import BaseChatModel
 from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
 from langchain_core.messages import AIMessage
 from langchain_core.tools import tool
 from langchain_core.tools.base import BaseTool
-from langchain_openai import ChatOpenAI
 
-load_dotenv(find_dotenv('agents.env'))
+from agentic_blueprint_catalog.model.expression import evaluate
+from agentic_blueprint_catalog.model.expression import evaluate_many
+from agentic_blueprint_catalog.model.expression import ExpressionError
+
+# langchain_openai, httpx and the scheduler, simulated model and cache are
+# imported on the first call to get_llm rather than at import.
+if TYPE_CHECKING:
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+    from agentic_blueprint_catalog.model.scheduler import RequestScheduler
+
 logger = logging.getLogger(__name__)
 
+# Process-wide HTTP clients and request schedulers per endpoint and chat
+# models per (model, endpoint), so that agents sharing a process share one
+# connection pool and one request queue.
+_registry_lock = threading.RLock()
+_http_clients: dict[str, tuple[httpx.Client, httpx.AsyncClient]] = {}
+_schedulers: dict[str, RequestScheduler | None] = {}
+_chat_models: dict[tuple[str, str], ChatOpenAI] = {}
+_env_loaded = False
+_env_cache: BaseCache | None = None
+
+
+def _load_env() -> None:
+    """Load ``agents.env`` once, on first use rather than at import."""
+    global _env_loaded  # noqa: PLW0603
+    if not _env_loaded:
+        load_dotenv(find_dotenv('agents.env'))
+        _env_loaded = True
+
+
+def _default_cache() -> BaseCache | None:
+    """Return the cache configured by ``OPENAI_RESPONSE_CACHE``, created once."""
+    global _env_cache  # noqa: PLW0603
+    from agentic_blueprint_catalog.model.cache import cache_from_env  # noqa: PLC0415
+
+    with _registry_lock:
+        if _env_cache is None:
+            _env_cache = cache_from_env()
+        return _env_cache
+
+
+def _use_http2() -> bool:
+    if os.environ.get('OPENAI_HTTP2', '1').lower() in ('0', 'false', 'no', 'off'):
+        return False
+    if importlib.util.find_spec('h2') is None:
+        logger.info('HTTP/2 needs the h2 package (pip install httpx[http2]); using HTTP/1.1')
+        return False
+    return True
+
+
+def _new_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    import httpx  # noqa: PLC0415
+
+    from agentic_blueprint_catalog.model.transport import LoopLocalTransport  # noqa: PLC0415
+
+    limits = httpx.Limits(
+        max_connections=int(os.environ.get('OPENAI_HTTP_MAX_CONNECTIONS', '100')),
+        max_keepalive_connections=int(os.environ.get('OPENAI_HTTP_MAX_KEEPALIVE', '20')),
+        keepalive_expiry=float(os.environ.get('OPENAI_HTTP_KEEPALIVE_EXPIRY', '60')),
+    )
+    timeout = httpx.Timeout(float(os.environ.get('OPENAI_HTTP_TIMEOUT', '600')), connect=10.0)
+    http2 = _use_http2()
+    return (
+        httpx.Client(limits=limits, timeout=timeout, http2=http2),
+        # Async connections are bound to an event loop and each agent thread
+        # runs its own loop, so the async client keeps a pool per loop.
+        httpx.AsyncClient(transport=LoopLocalTransport(limits=limits, http2=http2), timeout=timeout),
+    )
+
+
+def get_http_clients(base_url: str) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the shared sync and async HTTP clients for an endpoint.
+
+    The clients are created on first use, with HTTP/2 if the ``h2`` package
+    is installed (disable with ``OPENAI_HTTP2=0``), and connection limits
+    from ``OPENAI_HTTP_MAX_CONNECTIONS`` (default 100),
+    ``OPENAI_HTTP_MAX_KEEPALIVE`` (20), ``OPENAI_HTTP_KEEPALIVE_EXPIRY``
+    (60 s) and ``OPENAI_HTTP_TIMEOUT`` (600 s). The sync client's pool is
+    shared by all threads. The async client keeps one pool per event loop
+    (see :class:`~agentic_blueprint_catalog.model.transport.LoopLocalTransport`),
+    so agents running under different loops can share it; the limits apply
+    per loop.
+    """
+    with _registry_lock:
+        clients = _http_clients.get(base_url)
+        if clients is None:
+            clients = _http_clients[base_url] = _new_http_clients()
+        return clients
+
+
+def get_scheduler(base_url: str) -> RequestScheduler | None:
+    """Return the shared request scheduler for an endpoint.
+
+    Created on first use from ``OPENAI_MAX_CONCURRENCY``,
+    ``OPENAI_RATE_LIMIT`` and ``OPENAI_RATE_BURST`` (see
+    :func:`~agentic_blueprint_catalog.model.scheduler.scheduler_from_env`);
+    None if scheduling is disabled.
+    """
+    from agentic_blueprint_catalog.model.scheduler import scheduler_from_env  # noqa: PLC0415
+
+    with _registry_lock:
+        if base_url not in _schedulers:
+            _schedulers[base_url] = scheduler_from_env()
+        return _schedulers[base_url]
+
 
 @tool
 def calculate(expression: str) -> str:
     """Evaluate a mathematical expression. Use this for any arithmetic."""
     try:
-        result = eval(expression, {'__builtins__': {}}, {})
-        return str(result)
-    except Exception as e:
+        return str(evaluate(expression))
+    except ExpressionError as e:
         return f'Error: {e}'
 
 
+@tool
+def calculate_many(expressions: list[str]) -> str:
+    """Evaluate several mathematical expressions at once. Returns one line per expression, in order."""
+    return '\n'.join(
+        f'{expression} = {result}' if not isinstance(result, ExpressionError) else f'{expression}: Error: {result}'
+        for expression, result in zip(expressions, evaluate_many(expressions), strict=True)
+    )
+
+
 class ToolEnabledFakeChatModel(GenericFakeChatModel):
     """A fake model that implements bind_tools."""
 
@@ -41,20 +157,52 @@ class ToolEnabledFakeChatModel(GenericFakeChatModel):
         return self
 
 
-def get_llm() -> BaseChatModel:
-    """Load a chat model based on OpenAI API configs, failing that load a fake model"""
+def get_llm(cache: BaseCache | None = None, agent: str = 'default', priority: int = 0) -> BaseChatModel:
+    """Load a chat model based on OpenAI API configs, failing that load a fake model
+
+    Calls with the same model and endpoint return the same ``ChatOpenAI``,
+    whose HTTP connections (see :func:`get_http_clients`) are shared by
+    every model on that endpoint.
+
+    Args:
+        cache: Response cache for the model's calls, e.g. a
+            :class:`~agentic_blueprint_catalog.model.cache.ResponseCache`.
+            Defaults to the one configured by ``OPENAI_RESPONSE_CACHE``, if
+            any. A model with a cache is a copy of the shared model that
+            uses the same HTTP connections.
+        agent: Queue of the caller in the endpoint's request scheduler
+            (see :func:`get_scheduler`), e.g. the agent's ID.
+        priority: Scheduling priority of the model's requests; lower
+            values are sent first.
+    """
+    from agentic_blueprint_catalog.model.scheduler import ScheduledChatModel  # noqa: PLC0415
+
+    _load_env()
+    if cache is None:
+        cache = _default_cache()
     if os.environ.get('OPENAI_API_BASE_URL'):
+        from langchain_openai import ChatOpenAI  # noqa: PLC0415
+
         model = os.environ['OPENAI_API_MODEL']
-        api_key = os.environ['OPENAI_API_KEY']
-        base_url = os.environ['OPENAI_BASE_URL']
-        chat_model = ChatOpenAI(
-            model=model,
-            api_key=api_key,
-            base_url=base_url,
-        )
-        logger.info(f'Loading {model=} from {base_url}')
+        base_url = os.environ.get('OPENAI_BASE_URL') or os.environ['OPENAI_API_BASE_URL']
+        with _registry_lock:
+            shared = _chat_models.get((model, base_url))
+            if shared is None:
+                http_client, http_async_client = get_http_clients(base_url)
+                shared = _chat_models[model, base_url] = ChatOpenAI(
+                    model=model,
+                    api_key=os.environ['OPENAI_API_KEY'],
+                    base_url=base_url,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                )
+                logger.info(f'Loading {model=} from {base_url}')
+        chat_model: BaseChatModel = shared
     else:
-        responses = [
+        from agentic_blueprint_catalog.model.simulated import simulated_from_env  # noqa: PLC0415
+
+        base_url = 'simulated'
+        responses: list[str | AIMessage] = [
             AIMessage(
                 content='',
                 tool_calls=[
@@ -78,7 +226,12 @@ def get_llm() -> BaseChatModel:
             ),
             AIMessage(content='You have 653 left.'),
         ]
-        chat_model = ToolEnabledFakeChatModel(messages=iter(responses))
-        logger.info('Loading a fake model for testing')
+        chat_model = simulated_from_env(responses=responses)
+        logger.info('Loading a simulated model for testing')
 
+    scheduler = get_scheduler(base_url)
+    if scheduler is not None:
+        return ScheduledChatModel(model=chat_model, scheduler=scheduler, agent=agent, priority=priority, cache=cache)
+    if cache is not None:
+        chat_model = chat_model.model_copy(update={'cache': cache})
     return chat_model
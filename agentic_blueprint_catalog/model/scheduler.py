@@ -0,0 +1,403 @@
+"""Client-side scheduling of requests to a shared model endpoint.
+
+Every model returned by :func:`.model.get_llm` for one endpoint goes
+through the same :class:`RequestScheduler`, which bounds the number of
+requests in flight, spaces them out with a token bucket and decides which
+waiting request goes next. Waiting requests are queued per agent and
+served lowest ``priority`` value first; agents with the same priority take
+turns, so one agent with many requests does not hold up the others.
+Identical requests that are in flight at the same time are sent once and
+share the response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import copy
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import AsyncIterator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import TypeVar
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.outputs import ChatResult
+from langchain_core.runnables import RunnableBinding
+from langchain_core.tools import BaseTool
+
+T = TypeVar('T')
+
+
+class _Abandoned(Exception):  # noqa: N818
+    """Set on a shared request whose owner was cancelled; the others retry it."""
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    agent: str = field(compare=False)
+    queued: float = field(compare=False)
+    future: concurrent.futures.Future[None] = field(compare=False, default_factory=concurrent.futures.Future)
+
+
+class RequestScheduler:
+    """Admission control for the requests to one model endpoint.
+
+    Thread-safe, and usable from any number of event loops and threads at
+    once: a request is admitted by completing a plain future.
+
+    Args:
+        max_concurrency: Requests in flight at once.
+        rate_per_s: Requests started per second on average, or None for no
+            rate limit.
+        burst: Requests that may start at once after an idle period
+            (the size of the token bucket); defaults to ``max_concurrency``.
+    """
+
+    def __init__(self, max_concurrency: int = 64, rate_per_s: float | None = None, burst: int | None = None) -> None:
+        if max_concurrency <= 0:
+            raise ValueError('max_concurrency must be positive')
+        if rate_per_s is not None and rate_per_s <= 0:
+            raise ValueError('rate_per_s must be positive')
+        self.max_concurrency = max_concurrency
+        self.rate_per_s = rate_per_s
+        self.burst = burst if burst is not None else max_concurrency
+        self._lock = threading.Lock()
+        self._queues: dict[str, list[_Ticket]] = {}
+        # Dispatch sequence number of each agent's last admitted request.
+        self._served: dict[str, int] = {}
+        self._seq = itertools.count()
+        self._queued = 0
+        self._in_flight = 0
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._timer: threading.Timer | None = None
+        self._shared: dict[str, concurrent.futures.Future[Any]] = {}
+        self._dispatched = 0
+        self._coalesced = 0
+        self._wait_s = 0.0
+
+    def stats(self) -> dict[str, float]:
+        """Return queue length, requests in flight and cumulative counters."""
+        with self._lock:
+            return {
+                'queued': self._queued,
+                'in_flight': self._in_flight,
+                'dispatched': self._dispatched,
+                'coalesced': self._coalesced,
+                'mean_wait_s': self._wait_s / self._dispatched if self._dispatched else 0.0,
+            }
+
+    def _enqueue(self, agent: str, priority: int) -> _Ticket:
+        ticket = _Ticket(priority, next(self._seq), agent, time.monotonic())
+        with self._lock:
+            heapq.heappush(self._queues.setdefault(agent, []), ticket)
+            self._queued += 1
+        self._dispatch()
+        return ticket
+
+    def _next_ticket(self) -> _Ticket | None:
+        """Pop the next request and mark it running, skipping cancelled ones. Must hold the lock."""
+        while self._queues:
+            agent = min(self._queues, key=lambda a: (self._queues[a][0].priority, self._served.get(a, -1)))
+            queue = self._queues[agent]
+            ticket = heapq.heappop(queue)
+            if not queue:
+                del self._queues[agent]
+            self._queued -= 1
+            # A request cancelled after this is admitted anyway and releases
+            # its slot itself (see _abandon()).
+            if ticket.future.set_running_or_notify_cancel():
+                return ticket
+        return None
+
+    def _take_token(self) -> float:
+        """Take a token from the bucket; return 0, or the wait for the next one. Must hold the lock."""
+        if self.rate_per_s is None:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled) * self.rate_per_s)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate_per_s
+
+    def _dispatch(self, timer: bool = False) -> None:
+        """Admit waiting requests while slots and tokens are available.
+
+        While the bucket is empty, only the timer that waits for the next
+        token dispatches.
+        """
+        with self._lock:
+            if self._timer is not None and not timer:
+                return
+            self._timer = None
+            while self._in_flight < self.max_concurrency and self._queued:
+                delay = self._take_token()
+                if delay:
+                    self._timer = threading.Timer(delay, self._dispatch, kwargs={'timer': True})
+                    self._timer.daemon = True
+                    self._timer.start()
+                    return
+                ticket = self._next_ticket()
+                if ticket is None:
+                    # Only cancelled requests were waiting; return the token.
+                    self._tokens += 1
+                    return
+                self._in_flight += 1
+                self._dispatched += 1
+                self._served[ticket.agent] = self._dispatched
+                self._wait_s += time.monotonic() - ticket.queued
+                ticket.future.set_result(None)
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        if not ticket.future.cancel():
+            self.release()
+
+    def release(self) -> None:
+        """Free the slot of a finished request."""
+        with self._lock:
+            self._in_flight -= 1
+        self._dispatch()
+
+    async def acquire(self, agent: str = 'default', priority: int = 0) -> None:
+        """Wait until a request may start; :meth:`release` must follow."""
+        ticket = self._enqueue(agent, priority)
+        try:
+            await asyncio.shield(asyncio.wrap_future(ticket.future))
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    def acquire_sync(self, agent: str = 'default', priority: int = 0) -> None:
+        """Blocking :meth:`acquire`."""
+        ticket = self._enqueue(agent, priority)
+        try:
+            ticket.future.result()
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    def _share(self, key: str | None) -> tuple[concurrent.futures.Future[Any], bool]:
+        """Return the future for a request, and whether this caller must send it."""
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        if key is None:
+            return future, True
+        with self._lock:
+            existing = self._shared.get(key)
+            if existing is not None:
+                self._coalesced += 1
+                return existing, False
+            self._shared[key] = future
+        return future, True
+
+    def _settle(self, key: str | None, future: concurrent.futures.Future[Any], result: Any = None, error: BaseException | None = None) -> None:
+        """Complete a request's future and stop sharing it.
+
+        An ``error`` that is not an ``Exception`` (cancellation, interrupt)
+        only affects the caller that ran the request; the callers sharing it
+        get :class:`_Abandoned` and send it again themselves.
+        """
+        if error is not None and not isinstance(error, Exception):
+            error = _Abandoned()
+        if key is not None:
+            with self._lock:
+                self._shared.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def run(self, call: Callable[[], Awaitable[T]], agent: str = 'default', priority: int = 0, key: str | None = None) -> T:
+        """Run ``call`` once admitted.
+
+        Concurrent calls with the same ``key`` share one run; the callers
+        that did not run it receive a copy of the result. If the caller
+        running it is cancelled, one of the others runs it instead.
+        """
+        while True:
+            future, owner = self._share(key)
+            if owner:
+                break
+            try:
+                return copy.deepcopy(await asyncio.shield(asyncio.wrap_future(future)))
+            except _Abandoned:
+                continue
+        try:
+            await self.acquire(agent, priority)
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        try:
+            result = await call()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        finally:
+            self.release()
+        self._settle(key, future, result)
+        return result
+
+    def run_sync(self, call: Callable[[], T], agent: str = 'default', priority: int = 0, key: str | None = None) -> T:
+        """Blocking :meth:`run`."""
+        while True:
+            future, owner = self._share(key)
+            if owner:
+                break
+            try:
+                return copy.deepcopy(future.result())
+            except _Abandoned:
+                continue
+        try:
+            self.acquire_sync(agent, priority)
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        try:
+            result = call()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        finally:
+            self.release()
+        self._settle(key, future, result)
+        return result
+
+
+def scheduler_from_env() -> RequestScheduler | None:
+    """Return a scheduler configured by the environment, or None if disabled.
+
+    ``OPENAI_MAX_CONCURRENCY`` (default 64, 0 disables scheduling),
+    ``OPENAI_RATE_LIMIT`` (requests per second, default unlimited) and
+    ``OPENAI_RATE_BURST`` (default: the concurrency limit).
+    """
+    max_concurrency = int(os.environ.get('OPENAI_MAX_CONCURRENCY', '64'))
+    if max_concurrency <= 0:
+        return None
+    rate = os.environ.get('OPENAI_RATE_LIMIT')
+    burst = os.environ.get('OPENAI_RATE_BURST')
+    return RequestScheduler(max_concurrency, float(rate) if rate else None, int(burst) if burst else None)
+
+
+class ScheduledChatModel(BaseChatModel):
+    """Chat model whose requests go through a :class:`RequestScheduler`.
+
+    Cache hits (see ``cache``) are answered without waiting for a slot.
+    Streaming requests hold their slot until the stream ends and are never
+    shared.
+
+    Attributes:
+        model: The model that sends the requests.
+        scheduler: Shared scheduler of the model's endpoint.
+        agent: Queue the requests wait in.
+        priority: Lower values are admitted first.
+        coalesce: Send identical concurrent requests once.
+    """
+
+    model: BaseChatModel
+    scheduler: RequestScheduler
+    agent: str = 'default'
+    priority: int = 0
+    coalesce: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return self.model._llm_type
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return dict(self.model._identifying_params)
+
+    def _key(self, messages: list[BaseMessage], stop: list[str] | None, kwargs: dict[str, Any]) -> str | None:
+        if not self.coalesce:
+            return None
+        payload = json.dumps(
+            [id(self.model), [m.model_dump() for m in messages], stop, kwargs],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self.scheduler.run_sync(
+            lambda: self.model._generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            self.agent,
+            self.priority,
+            self._key(messages, stop, kwargs),
+        )
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await self.scheduler.run(
+            lambda: self.model._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            self.agent,
+            self.priority,
+            self._key(messages, stop, kwargs),
+        )
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self.scheduler.acquire_sync(self.agent, self.priority)
+        try:
+            yield from self.model._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        finally:
+            self.scheduler.release()
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await self.scheduler.acquire(self.agent, self.priority)
+        try:
+            async for chunk in self.model._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+        finally:
+            self.scheduler.release()
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | Callable[..., Any] | BaseTool],
+        **kwargs: Any,
+    ) -> Any:
+        """Bind tools the way the wrapped model does, keeping the scheduling."""
+        bound = self.model.bind_tools(tools, **kwargs)
+        if isinstance(bound, RunnableBinding):
+            return self.bind(**bound.kwargs)
+        return self
@@ -0,0 +1,282 @@
+"""Simulated chat model for running and load testing agents without an LLM.
+
+Replies take as long as they would from a real server: a time to first
+token, then a fixed time per output token, both optionally jittered. Calls
+can be made to fail at random. Every call draws from its own random number
+generator, derived from the model's seed and the call's sequence number,
+so a seeded run is reproducible.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import time
+import uuid
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessageChunk
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.outputs import ChatResult
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field
+from pydantic import PrivateAttr
+
+# Whitespace-delimited words stand in for tokens.
+_TOKEN = re.compile(r'\s*\S+')
+_WORDS = ('the', 'agent', 'result', 'of', 'run', 'is', 'a', 'value', 'and', 'next', 'step', 'to', 'compute', 'data', 'model', 'job')
+
+Generator = Callable[[list[BaseMessage], list[dict[str, Any]], random.Random], AIMessage | str]
+
+
+class SimulatedModelError(RuntimeError):
+    """A failure injected by :class:`SimulatedChatModel`."""
+
+
+def _count_tokens(text: str) -> int:
+    return len(_TOKEN.findall(text))
+
+
+@dataclass
+class _Plan:
+    message: AIMessage
+    tokens: list[str]
+    tool_tokens: int
+    ttft_s: float
+    token_s: float
+    fail_at: int | None
+    input_tokens: int
+
+    @property
+    def output_tokens(self) -> int:
+        return len(self.tokens) + self.tool_tokens
+
+
+class SimulatedChatModel(BaseChatModel):
+    """Chat model that produces scripted or generated replies with realistic timing.
+
+    Replies come from, in order of preference:
+
+    1. ``responses``: a script. A conversation's reply is the script entry
+       at its number of assistant turns so far, cycling, so concurrent
+       conversations each follow the script independently and it never runs
+       out.
+    2. ``generator``: called with the messages, the bound tools (OpenAI
+       format) and the call's random number generator.
+    3. Filler text of ``output_tokens`` words.
+
+    Attributes:
+        responses: Scripted replies.
+        generator: Reply generator, used if there is no script.
+        ttft_s: Time to first token in seconds.
+        token_s: Time per output token in seconds.
+        jitter: Relative spread of both times; 0.2 scales them by a
+            uniform factor between 0.8 and 1.2 per call.
+        output_tokens: Range of generated reply lengths.
+        error_rate: Probability that a call raises
+            :class:`SimulatedModelError`, before the first token or part
+            way through the reply.
+        seed: Seed for reproducible runs; None draws fresh randomness.
+    """
+
+    responses: list[str | AIMessage] = Field(default_factory=list)
+    generator: Generator | None = None
+    ttft_s: float = 0.0
+    token_s: float = 0.0
+    jitter: float = 0.0
+    output_tokens: tuple[int, int] = (20, 200)
+    error_rate: float = 0.0
+    seed: int | None = None
+    _calls: Iterator[int] = PrivateAttr(default_factory=itertools.count)
+
+    @property
+    def _llm_type(self) -> str:
+        return 'simulated'
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {'ttft_s': self.ttft_s, 'token_s': self.token_s, 'jitter': self.jitter, 'error_rate': self.error_rate, 'seed': self.seed}
+
+    def _reply(self, messages: list[BaseMessage], tools: list[dict[str, Any]], rng: random.Random) -> AIMessage:
+        if self.responses:
+            turn = sum(1 for m in messages if isinstance(m, AIMessage))
+            reply: str | AIMessage = self.responses[turn % len(self.responses)]
+        elif self.generator is not None:
+            reply = self.generator(messages, tools, rng)
+        else:
+            low, high = self.output_tokens
+            reply = ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(low, high)))
+        if isinstance(reply, str):
+            return AIMessage(content=reply)
+        return reply.model_copy(deep=True)
+
+    def _plan(self, messages: list[BaseMessage], kwargs: dict[str, Any]) -> _Plan:
+        call = next(self._calls)
+        rng = random.Random(f'{self.seed}:{call}') if self.seed is not None else random.Random()
+        message = self._reply(messages, kwargs.get('tools', []), rng)
+        tokens = _TOKEN.findall(message.text)
+        tool_tokens = sum(_count_tokens(json.dumps(tc['args'])) + 1 for tc in message.tool_calls)
+        scale = rng.uniform(1 - self.jitter, 1 + self.jitter)
+        fail_at = rng.randrange(len(tokens) + tool_tokens + 1) if rng.random() < self.error_rate else None
+        return _Plan(
+            message=message,
+            tokens=tokens,
+            tool_tokens=tool_tokens,
+            ttft_s=self.ttft_s * scale,
+            token_s=self.token_s * scale,
+            fail_at=fail_at,
+            input_tokens=sum(_count_tokens(m.text) for m in messages),
+        )
+
+    @staticmethod
+    def _final(plan: _Plan) -> AIMessage:
+        message = plan.message
+        message.usage_metadata = {
+            'input_tokens': plan.input_tokens,
+            'output_tokens': plan.output_tokens,
+            'total_tokens': plan.input_tokens + plan.output_tokens,
+        }
+        message.response_metadata = {'model_name': 'simulated', 'finish_reason': 'tool_calls' if message.tool_calls else 'stop'}
+        return message
+
+    @staticmethod
+    def _duration(plan: _Plan) -> float:
+        tokens = plan.output_tokens if plan.fail_at is None else plan.fail_at
+        return plan.ttft_s + max(tokens - 1, 0) * plan.token_s
+
+    @staticmethod
+    def _error(plan: _Plan) -> SimulatedModelError:
+        return SimulatedModelError(f'Simulated failure after {plan.fail_at} of {plan.output_tokens} tokens')
+
+    def _events(self, plan: _Plan) -> Iterator[tuple[float, ChatGenerationChunk | None]]:
+        """Yield each chunk of the reply with the delay before it; None marks the failure."""
+        delay = plan.ttft_s
+        for i, token in enumerate(plan.tokens):
+            if plan.fail_at == i:
+                yield delay, None
+                return
+            yield delay, ChatGenerationChunk(message=AIMessageChunk(content=token, id=plan.message.id))
+            delay = plan.token_s
+        if plan.fail_at is not None:
+            yield delay + max(plan.fail_at - len(plan.tokens) - 1, 0) * plan.token_s, None
+            return
+        final = self._final(plan)
+        chunk = AIMessageChunk(
+            content='',
+            id=final.id,
+            tool_call_chunks=[{'name': tc['name'], 'args': json.dumps(tc['args']), 'id': tc['id'], 'index': i, 'type': 'tool_call_chunk'} for i, tc in enumerate(final.tool_calls)],
+            usage_metadata=final.usage_metadata,
+            response_metadata=final.response_metadata,
+            chunk_position='last',
+        )
+        if plan.tool_tokens:
+            delay += (plan.tool_tokens - 1) * plan.token_s
+        elif plan.tokens:
+            delay = 0.0
+        yield delay, ChatGenerationChunk(message=chunk)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        plan = self._plan(messages, kwargs)
+        time.sleep(self._duration(plan))
+        if plan.fail_at is not None:
+            raise self._error(plan)
+        return ChatResult(generations=[ChatGeneration(message=self._final(plan))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        plan = self._plan(messages, kwargs)
+        await asyncio.sleep(self._duration(plan))
+        if plan.fail_at is not None:
+            raise self._error(plan)
+        return ChatResult(generations=[ChatGeneration(message=self._final(plan))])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        plan = self._plan(messages, kwargs)
+        for delay, chunk in self._events(plan):
+            time.sleep(delay)
+            if chunk is None:
+                raise self._error(plan)
+            if run_manager is not None and isinstance(chunk.message.content, str) and chunk.message.content:
+                run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        plan = self._plan(messages, kwargs)
+        for delay, chunk in self._events(plan):
+            await asyncio.sleep(delay)
+            if chunk is None:
+                raise self._error(plan)
+            if run_manager is not None and isinstance(chunk.message.content, str) and chunk.message.content:
+                await run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | Callable[..., Any] | BaseTool],
+        **kwargs: Any,
+    ) -> Any:
+        """Bind tools; they are passed to ``generator`` in OpenAI format."""
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+
+def simulated_from_env(**kwargs: Any) -> SimulatedChatModel:
+    """Return a simulated model with timing and failures from the environment.
+
+    ``OPENAI_SIMULATED_TTFT`` and ``OPENAI_SIMULATED_TOKEN_LATENCY`` (seconds),
+    ``OPENAI_SIMULATED_JITTER``, ``OPENAI_SIMULATED_ERROR_RATE`` and
+    ``OPENAI_SIMULATED_SEED``; all default to 0 or no seed. ``kwargs`` are
+    passed to :class:`SimulatedChatModel`.
+    """
+    seed = os.environ.get('OPENAI_SIMULATED_SEED')
+    return SimulatedChatModel(
+        ttft_s=float(os.environ.get('OPENAI_SIMULATED_TTFT', '0')),
+        token_s=float(os.environ.get('OPENAI_SIMULATED_TOKEN_LATENCY', '0')),
+        jitter=float(os.environ.get('OPENAI_SIMULATED_JITTER', '0')),
+        error_rate=float(os.environ.get('OPENAI_SIMULATED_ERROR_RATE', '0')),
+        seed=int(seed) if seed else None,
+        **kwargs,
+    )
+
+
+def tool_call(name: str, **args: Any) -> AIMessage:
+    """Return a reply that calls a tool, for use in scripts."""
+    return AIMessage(content='', tool_calls=[{'name': name, 'args': args, 'id': f'call_{uuid.uuid4().hex[:12]}'}])
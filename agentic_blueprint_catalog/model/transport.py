@@ -0,0 +1,57 @@
+"""Async HTTP transport that keeps one connection pool per event loop.
+
+The connections of an ``httpx.AsyncClient`` belong to the event loop that
+opened them. Academy runs each agent thread under its own ``asyncio.run``,
+so a single pooled client shared by the agents of a process fails with
+``RuntimeError: Event loop is closed`` once the loop that opened a
+connection has finished. :class:`LoopLocalTransport` lets one
+``AsyncClient`` be shared anyway: each running loop gets its own pool,
+which is dropped when the loop is garbage collected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Any
+
+import httpx
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    """Async transport with a separate ``httpx.AsyncHTTPTransport`` per event loop.
+
+    Args:
+        kwargs: Passed to ``httpx.AsyncHTTPTransport`` for each loop's pool,
+            e.g. ``limits`` and ``http2``. Limits therefore apply per loop.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = weakref.WeakKeyDictionary()
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = self._pools[loop] = httpx.AsyncHTTPTransport(**self._kwargs)
+            return pool
+
+    def pools(self) -> int:
+        """Return the number of event loops with a pool."""
+        with self._lock:
+            return len(self._pools)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the running loop's pool."""
+        return await self._pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the running loop's pool; other loops' pools close with their loops."""
+        with self._lock:
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
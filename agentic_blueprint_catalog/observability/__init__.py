@@ -1,16 +1,28 @@
-"""Observability components for agentic blueprints."""
+"""Observability components for agentic blueprints.
+
+The exported names are imported on first access (PEP 562), so importing
+one submodule, e.g. on a remote worker that only needs
+:class:`MonitoredAgent`, does not import the dashboard and Flask.
+"""
 
 from __future__ import annotations
 
-from agentic_blueprint_catalog.observability.dashboard import Dashboard
-from agentic_blueprint_catalog.observability.message import Log
-from agentic_blueprint_catalog.observability.message import Message
-from agentic_blueprint_catalog.observability.message import Stats
-from agentic_blueprint_catalog.observability.message import UserPrompt
-from agentic_blueprint_catalog.observability.monitored_agent import MonitoredAgent
-from agentic_blueprint_catalog.observability.user_agent import UserAgent
+import importlib
+from typing import Any
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agentic_blueprint_catalog.observability.aggregator import AggregatorAgent
+    from agentic_blueprint_catalog.observability.dashboard import Dashboard
+    from agentic_blueprint_catalog.observability.message import Log
+    from agentic_blueprint_catalog.observability.message import Message
+    from agentic_blueprint_catalog.observability.message import Stats
+    from agentic_blueprint_catalog.observability.message import UserPrompt
+    from agentic_blueprint_catalog.observability.monitored_agent import MonitoredAgent
+    from agentic_blueprint_catalog.observability.user_agent import UserAgent
 
 __all__ = [
+    'AggregatorAgent',
     'Dashboard',
     'Log',
     'Message',
@@ -19,3 +31,27 @@ __all__ = [
     'UserAgent',
     'UserPrompt',
 ]
+
+_EXPORTS = {
+    'AggregatorAgent': 'aggregator',
+    'Dashboard': 'dashboard',
+    'Log': 'message',
+    'Message': 'message',
+    'MonitoredAgent': 'monitored_agent',
+    'Stats': 'message',
+    'UserAgent': 'user_agent',
+    'UserPrompt': 'message',
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'{__name__}.{module}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,220 @@
+"""AggregatorAgent that relays MonitoredAgent reports to a UserAgent in bulk.
+
+A single UserAgent becomes the bottleneck once a few hundred agents report
+to it directly. Aggregators form a tree between the two: each one accepts
+the same actions as a UserAgent, merges what it receives, and forwards one
+summary upstream per flush period.
+
+    +----------------+
+    | MonitoredAgent |--+
+    +----------------+  |   +------------+
+           ...          +-->| Aggregator |--+
+    +----------------+  |   +------------+  |    +-----------+
+    | MonitoredAgent |--+                   +--->| UserAgent |
+    +----------------+      +------------+  |    +-----------+
+           ...          --->| Aggregator |--+
+                            +------------+
+
+Aggregators can report to other aggregators, so dashboard load grows with
+the number of aggregators at the top of the tree rather than with the number
+of agents.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+import academy.exception
+from academy.agent import action
+from academy.agent import Agent
+from academy.agent import loop
+from academy.handle import Handle
+
+from agentic_blueprint_catalog.observability.codec import Decoder
+from agentic_blueprint_catalog.observability.codec import UnknownReferenceError
+from agentic_blueprint_catalog.observability.message import Log
+from agentic_blueprint_catalog.observability.message import Message
+from agentic_blueprint_catalog.observability.message import Registration
+from agentic_blueprint_catalog.observability.message import Stats
+from agentic_blueprint_catalog.observability.message import UserPrompt
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    """Everything received from one agent since the last flush."""
+
+    registration: Registration | None = None
+    stats: Stats | None = None
+    logs: list[Log] = field(default_factory=list)
+    # Repeat count for each entry in ``logs``.
+    repeats: list[int] = field(default_factory=list)
+    dropped: int = 0
+
+
+class AggregatorAgent(Agent):
+    """Merges reports from many agents and forwards them upstream periodically.
+
+    Per flush and per agent only the latest registration and stats are kept,
+    consecutive identical log records are collapsed into one with a repeat
+    count, and logs beyond ``max_logs_per_agent`` are replaced by a single
+    record saying how many were dropped.
+    """
+
+    def __init__(
+        self,
+        upstream: Handle[Any],
+        flush_interval_s: float = 1.0,
+        max_logs_per_agent: int = 200,
+    ) -> None:
+        """Initialize the aggregator.
+
+        Args:
+            upstream: Handle to a UserAgent or another AggregatorAgent.
+            flush_interval_s: Seconds between forwards to ``upstream``.
+            max_logs_per_agent: Log records kept per agent per flush.
+        """
+        super().__init__()
+        self.upstream = upstream
+        self.flush_interval_s = flush_interval_s
+        self.max_logs_per_agent = max_logs_per_agent
+        self._pending: dict[str, _Pending] = {}
+        self._decoder = Decoder()
+        # Whether a dashboard page was open at the last forward upstream,
+        # passed on to senders so they can stop forwarding unseen logs.
+        self._attached = True
+
+    def _add(self, sender: str, message: Message) -> None:
+        pending = self._pending.get(sender)
+        if pending is None:
+            pending = self._pending[sender] = _Pending()
+        if isinstance(message, Log):
+            last = pending.logs[-1] if pending.logs else None
+            if last is not None and last.message == message.message and last.level == message.level:
+                pending.repeats[-1] += 1
+            elif len(pending.logs) < self.max_logs_per_agent:
+                pending.logs.append(message)
+                pending.repeats.append(1)
+            else:
+                pending.dropped += 1
+        elif isinstance(message, Stats):
+            pending.stats = message
+        elif isinstance(message, Registration):
+            pending.registration = message
+        else:
+            logger.warning(
+                f'Ignoring {type(message).__name__} from {sender}',
+            )
+
+    @action
+    async def message(self, sender: str, message: Message) -> bool:
+        """Buffer a single message from a MonitoredAgent.
+
+        Like all message actions, returns whether a dashboard page was open
+        when this aggregator last forwarded upstream.
+        """
+        self._add(sender, message)
+        return self._attached
+
+    @action
+    async def message_batch(self, sender: str, messages: list[Message]) -> bool:
+        """Buffer a batch of messages from a MonitoredAgent."""
+        for message in messages:
+            self._add(sender, message)
+        return self._attached
+
+    @action
+    async def message_packed(self, sender: str, frame: bytes) -> bool | None:
+        """Buffer a batch of encoded messages from a MonitoredAgent.
+
+        Returns None if the sender should reset its encoder and resend.
+        """
+        try:
+            messages = self._decoder.decode(sender, frame)
+        except UnknownReferenceError:
+            return None
+        for message in messages:
+            self._add(sender, message)
+        return self._attached
+
+    @action
+    async def message_forward(self, batches: dict[str, list[Message]]) -> bool:
+        """Buffer batches relayed by a downstream AggregatorAgent."""
+        for sender, messages in batches.items():
+            for message in messages:
+                self._add(sender, message)
+        return self._attached
+
+    @action
+    async def prompt_user(self, sender: str, user_prompt: UserPrompt) -> str:
+        """Relay a prompt upstream; prompts are never buffered.
+
+        A registration from ``sender`` still waiting for the next flush is
+        forwarded first, so the dashboard knows the agent that is asking.
+        """
+        pending = self._pending.get(sender)
+        if pending is not None and pending.registration is not None:
+            registration, pending.registration = pending.registration, None
+            try:
+                attached = await self.upstream.message_forward({sender: [registration]})
+            except Exception:
+                logger.exception(f'Failed to forward registration of {sender} before its prompt')
+                if pending.registration is None:
+                    pending.registration = registration
+            else:
+                self._attached = attached is not False
+        return await self.upstream.prompt_user(sender, user_prompt)
+
+    def _summarize(self) -> dict[str, list[Message]]:
+        pending, self._pending = self._pending, {}
+        batches: dict[str, list[Message]] = {}
+        for sender, p in pending.items():
+            messages: list[Message] = []
+            if p.registration is not None:
+                messages.append(p.registration)
+            for log, repeats in zip(p.logs, p.repeats, strict=True):
+                if repeats > 1:
+                    log.message = f'{log.message} [repeated {repeats}x]'
+                messages.append(log)
+            if p.dropped:
+                last = p.logs[-1]
+                messages.append(
+                    Log(
+                        agent_id=last.agent_id,
+                        agent_name=last.agent_name,
+                        message=f'{p.dropped} log records dropped by aggregator',
+                        level='WARNING',
+                    ),
+                )
+            if p.stats is not None:
+                messages.append(p.stats)
+            batches[sender] = messages
+        return batches
+
+    @loop
+    async def flush(self, shutdown: asyncio.Event) -> None:
+        """Forward buffered messages upstream every ``flush_interval_s``."""
+        while not shutdown.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(shutdown.wait(), self.flush_interval_s)
+            if not self._pending:
+                continue
+            batches = self._summarize()
+            try:
+                attached = await self.upstream.message_forward(batches)
+            except academy.exception.AgentTerminatedError:
+                logger.warning('Upstream agent terminated, stopping flush loop')
+                break
+            except Exception:
+                logger.exception(
+                    f'Failed to forward messages for {len(batches)} agents',
+                )
+            else:
+                # An upstream that does not report it counts as attached.
+                self._attached = attached is not False
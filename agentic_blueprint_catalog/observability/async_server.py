@@ -0,0 +1,152 @@
+"""Event-loop based dashboard server.
+
+Serves the same routes as the Flask app in :mod:`.dashboard`, but with
+aiohttp (already required by academy) on the caller's event loop, so an
+open ``/events`` stream is a suspended coroutine rather than a blocked
+thread.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from aiohttp import web
+
+from agentic_blueprint_catalog.observability.broadcast import EVICTED
+from agentic_blueprint_catalog.observability.broadcast import parse_event_id
+from agentic_blueprint_catalog.observability.dashboard import Dashboard
+
+logger = logging.getLogger(__name__)
+
+_HEARTBEAT_S = 25
+
+
+class AsyncDashboardServer:
+    """aiohttp server for a :class:`Dashboard`."""
+
+    def __init__(self, dashboard: Dashboard) -> None:
+        self.dashboard = dashboard
+        self._runner: web.AppRunner | None = None
+        self.app = web.Application()
+        self.app.add_routes(
+            [
+                web.get('/', self.index),
+                web.get('/events', self.events),
+                web.get('/logs', self.logs),
+                web.get('/stats/{agent:.+}', self.stats),
+                web.get('/assets/{filename:.+}', self.asset),
+                web.post('/dismiss/{prompt_id:.+}', self.dismiss),
+                web.post('/respond/{prompt_id:.+}', self.respond),
+                web.post('/shutdown/{agent_id:.+}', self.shutdown),
+            ],
+        )
+
+    async def start(self, host: str, port: int) -> None:
+        """Start listening on the running loop."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info(f'Dashboard listening on http://{host}:{port}')
+
+    async def stop(self) -> None:
+        """Close open streams and stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def index(self, request: web.Request) -> web.Response:
+        """Serve the dashboard page."""
+        status, body, headers = self.dashboard._static.respond_page(
+            request.headers.get('Accept-Encoding', ''),
+            request.headers.get('If-None-Match'),
+        )
+        return web.Response(body=body, status=status, headers=headers)
+
+    async def events(self, request: web.Request) -> web.StreamResponse:
+        """Stream server-sent events until the client leaves or is evicted."""
+        last_event_id = parse_event_id(
+            request.headers.get('Last-Event-ID') or request.query.get('lastEventId'),
+        )
+        try:
+            stats_ms: int | None = int(request.query['stats_ms'])
+        except (KeyError, ValueError):
+            stats_ms = None
+
+        dashboard = self.dashboard
+        sub = dashboard._subscribe_async(last_event_id, stats_ms)
+        response = web.StreamResponse(
+            headers={
+                'Content-Type': 'text/event-stream',
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
+            },
+        )
+        try:
+            await response.prepare(request)
+            for frame in dashboard._stream_preamble(sub, request.query):
+                await response.write(frame.encode())
+            while True:
+                try:
+                    frame = await sub.get(timeout=_HEARTBEAT_S)
+                except TimeoutError:
+                    frame = ': heartbeat\n\n'
+                await response.write(frame.encode())
+                if frame is EVICTED:
+                    break
+        except ConnectionResetError:
+            pass  # client went away
+        finally:
+            dashboard._unsubscribe(sub)
+        return response
+
+    async def logs(self, request: web.Request) -> web.Response:
+        """Search retained logs, see :meth:`Dashboard.search_logs`."""
+        try:
+            return web.json_response(self.dashboard.search_logs(request.query))
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e)) from e
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """Return an agent's stats history, see :meth:`Dashboard.stats_history`."""
+        try:
+            history = self.dashboard.stats_history(request.match_info['agent'], request.query)
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e)) from e
+        if history is None:
+            raise web.HTTPNotFound(text='Unknown agent')
+        return web.json_response(history)
+
+    async def asset(self, request: web.Request) -> web.Response:
+        """Serve a file from the assets directory."""
+        result = self.dashboard._static.respond_asset(
+            request.match_info['filename'],
+            request.query.get('v'),
+            request.headers.get('Accept-Encoding', ''),
+            request.headers.get('If-None-Match'),
+        )
+        if result is None:
+            raise web.HTTPNotFound()
+        status, body, headers = result
+        return web.Response(body=body, status=status, headers=headers)
+
+    async def dismiss(self, request: web.Request) -> web.Response:
+        """Dismiss a prompt without a response."""
+        self.dashboard.dismiss_prompt(request.match_info['prompt_id'])
+        return web.Response(status=204)
+
+    async def respond(self, request: web.Request) -> web.Response:
+        """Submit the user's response to a prompt."""
+        try:
+            data = await request.json()
+        except ValueError:
+            data = {}
+        response = data.get('response', '') if isinstance(data, dict) else ''
+        self.dashboard.submit_response(request.match_info['prompt_id'], response)
+        return web.Response(status=204)
+
+    async def shutdown(self, request: web.Request) -> web.Response:
+        """Ask for an agent to be shut down."""
+        callback = self.dashboard._shutdown_callback
+        if callback is not None:
+            callback(request.match_info['agent_id'])
+        return web.Response(status=204)
@@ -0,0 +1,257 @@
+"""Fan-out of server-sent events to dashboard subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+from abc import ABC
+from abc import abstractmethod
+from collections import deque
+from typing import Any
+
+# Queued in place of pending frames when a subscriber falls too far behind.
+EVICTED = 'event: evicted\ndata: {}\n\n'
+
+
+def format_event(event: str, data: Any, event_id: int | None = None) -> str:
+    """Serialize an event as an SSE frame."""
+    head = '' if event_id is None else f'id: {event_id}\n'
+    return f'{head}event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def parse_event_id(value: str | None) -> int | None:
+    """Parse a ``Last-Event-ID`` value, returning None if absent or invalid."""
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+class Subscriber(ABC):
+    """Bounded buffer of SSE frames waiting to be sent to one client.
+
+    Subclasses decide how the consumer waits for frames: a thread blocking
+    on a queue (:class:`QueueSubscriber`) or a coroutine on an event loop
+    (:class:`AsyncSubscriber`). ``offer`` and ``evict`` may be called from
+    any thread.
+
+    Attributes:
+        start_id: ID of the last event published before this subscriber was
+            registered; every later event is delivered through the buffer.
+        replay: Frames missed since the client's ``Last-Event-ID``, or None
+            if the client needs a full snapshot instead.
+        evicted: Set once the subscriber fell behind and was dropped.
+        stats_interval_ms: Requested period between coalesced stats frames,
+            or None for the server default.
+    """
+
+    def __init__(self, maxsize: int = 250) -> None:
+        self.maxsize = maxsize
+        self.start_id = 0
+        self.replay: list[str] | None = None
+        self.evicted = False
+        self.stats_interval_ms: int | None = None
+
+    @abstractmethod
+    def offer(self, frame: str) -> bool:
+        """Enqueue a frame without blocking; return False if the buffer is full."""
+
+    @abstractmethod
+    def evict(self) -> None:
+        """Discard pending frames and queue the :data:`EVICTED` marker.
+
+        The client resumes from its ``Last-Event-ID`` when it reconnects, so
+        nothing in the discarded backlog is lost as long as it is still in
+        the broadcaster's replay window.
+        """
+
+
+class QueueSubscriber(Subscriber):
+    """Subscriber consumed by a thread (e.g. a Flask response generator)."""
+
+    def __init__(self, maxsize: int = 250) -> None:
+        super().__init__(maxsize)
+        self._queue: queue.Queue[str] = queue.Queue(maxsize=maxsize)
+
+    def offer(self, frame: str) -> bool:
+        """Enqueue a frame without blocking; return False if the queue is full."""
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            return False
+        return True
+
+    def evict(self) -> None:
+        """Discard pending frames and queue the :data:`EVICTED` marker."""
+        self.evicted = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put_nowait(EVICTED)
+
+    def get(self, timeout: float | None = None) -> str:
+        """Block for the next frame; raises ``queue.Empty`` on timeout."""
+        return self._queue.get(timeout=timeout)
+
+
+class AsyncSubscriber(Subscriber):
+    """Subscriber consumed by a coroutine; costs no thread while waiting.
+
+    Must be created on the event loop that consumes it.
+    """
+
+    def __init__(self, maxsize: int = 250) -> None:
+        super().__init__(maxsize)
+        self._frames: deque[str] = deque()
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+
+    def _wake(self) -> None:
+        if threading.get_ident() == self._loop_thread:
+            self._ready.set()
+        else:
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    def offer(self, frame: str) -> bool:
+        """Enqueue a frame without blocking; return False if the buffer is full."""
+        if len(self._frames) >= self.maxsize:
+            return False
+        self._frames.append(frame)
+        self._wake()
+        return True
+
+    def evict(self) -> None:
+        """Discard pending frames and queue the :data:`EVICTED` marker."""
+        self.evicted = True
+        self._frames.clear()
+        self._frames.append(EVICTED)
+        self._wake()
+
+    async def get(self, timeout: float | None = None) -> str:
+        """Wait for the next frame; raises ``TimeoutError`` on timeout."""
+        while not self._frames:
+            self._ready.clear()
+            if self._frames:
+                break
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        return self._frames.popleft()
+
+
+class Broadcaster:
+    """Publishes events to every subscriber, serializing each event once.
+
+    Each event gets a monotonically increasing ID and the most recent
+    ``replay_window`` frames are kept so that a reconnecting client can
+    resume from its ``Last-Event-ID`` with just the events it missed.
+
+    The subscriber list is an immutable tuple replaced on subscribe and
+    unsubscribe. All of this is guarded by a lock private to the
+    broadcaster, never the Dashboard's state lock, and the JSON encoding,
+    including that of the frames replayed to a resuming subscriber, happens
+    outside it. When nobody is subscribed nothing is serialized: the event
+    is kept as-is and only encoded if a client later resumes from before it.
+    """
+
+    def __init__(self, maxsize: int = 250, replay_window: int = 2000) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscribers: tuple[Subscriber, ...] = ()
+        self._last_id = 0
+        # (event ID, event name, data, JSON payload or None if not encoded yet)
+        self._history: deque[tuple[int, str, Any, str | None]] = deque(
+            maxlen=replay_window,
+        )
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def subscribers(self) -> tuple[Subscriber, ...]:
+        """Current subscribers."""
+        return self._subscribers
+
+    @property
+    def last_id(self) -> int:
+        """ID of the most recently published event."""
+        return self._last_id
+
+    def subscribe(
+        self,
+        last_event_id: int | None = None,
+        stats_interval_ms: int | None = None,
+        sub: Subscriber | None = None,
+    ) -> Subscriber:
+        """Register and return a subscriber.
+
+        If ``last_event_id`` is still covered by the replay window, the
+        subscriber's ``replay`` holds the frames published after it.
+
+        Args:
+            last_event_id: ID of the last event the client received.
+            stats_interval_ms: Requested stats cadence, see ``Subscriber``.
+            sub: Subscriber to register; defaults to a new
+                :class:`QueueSubscriber`.
+        """
+        if sub is None:
+            sub = QueueSubscriber(self.maxsize)
+        sub.stats_interval_ms = stats_interval_ms
+        missed = None
+        with self._lock:
+            sub.start_id = self._last_id
+            if last_event_id is not None and last_event_id <= self._last_id:
+                oldest = self._history[0][0] if self._history else self._last_id + 1
+                if last_event_id >= oldest - 1:
+                    missed = [h for h in self._history if h[0] > last_event_id]
+            self._subscribers = (*self._subscribers, sub)
+        # Events published from here on are offered to ``sub``; the ones it
+        # missed are encoded outside the lock, before the caller reads them.
+        if missed is not None:
+            sub.replay = [self._frame(*h) for h in missed]
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        """Remove a subscriber; unknown subscribers are ignored."""
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+
+    @staticmethod
+    def _frame(event_id: int, event: str, data: Any, payload: str | None = None) -> str:
+        if payload is None:
+            payload = json.dumps(data)
+        return f'id: {event_id}\nevent: {event}\ndata: {payload}\n\n'
+
+    def publish(self, event: str, data: Any) -> int:
+        """Send an event to all subscribers and return its ID.
+
+        Subscribers whose queue is full are evicted: their backlog is
+        replaced by an ``evicted`` event so that the client reconnects and
+        resumes from the replay window.
+        """
+        payload = json.dumps(data) if self._subscribers else None
+        while True:
+            with self._lock:
+                subscribers = self._subscribers
+                if payload is not None or not subscribers:
+                    self._last_id += 1
+                    event_id = self._last_id
+                    self._history.append((event_id, event, data, payload))
+                    if not subscribers:
+                        return event_id
+                    # Offer under the lock so that every queue sees events in
+                    # ID order; put_nowait never blocks.
+                    frame = self._frame(event_id, event, data, payload)
+                    dead = [sub for sub in subscribers if not sub.offer(frame)]
+                    if dead:
+                        self._subscribers = tuple(s for s in subscribers if s not in dead)
+                    break
+            # Someone subscribed while we were deciding; encode outside the
+            # lock and try again.
+            payload = json.dumps(data)
+        for sub in dead:
+            sub.evict()
+        return event_id
@@ -0,0 +1,106 @@
+"""Server-side coalescing of agent stats updates for the dashboard."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any
+
+from agentic_blueprint_catalog.observability.broadcast import Broadcaster
+from agentic_blueprint_catalog.observability.broadcast import format_event
+from agentic_blueprint_catalog.observability.broadcast import Subscriber
+
+logger = logging.getLogger(__name__)
+
+
+class _Group:
+    """Subscribers sharing a stats cadence, and what they have not seen yet."""
+
+    def __init__(self) -> None:
+        self.pending: dict[str, dict[str, Any]] = {}
+        self.last_flush = 0.0
+
+
+class StatsCoalescer:
+    """Collects the latest stats per agent and flushes them as one frame.
+
+    Instead of one ``stats`` event per agent per report, subscribers get a
+    ``stats_batch`` event holding the newest stats of every agent that
+    reported since their last frame. Subscribers choose their own cadence
+    (``Subscriber.stats_interval_ms``); those with the same cadence share a
+    group, so each combined frame is serialized once per group.
+
+    Stats frames carry no event ID and are not replayed: they are state, not
+    history, and a resuming client is sent current stats directly.
+
+    Args:
+        broadcaster: Source of the current subscribers.
+        interval_ms: Base flush period; also the smallest cadence allowed.
+    """
+
+    def __init__(self, broadcaster: Broadcaster, interval_ms: int = 1000) -> None:
+        self.broadcaster = broadcaster
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._groups: dict[int, _Group] = {}
+        self._thread: threading.Thread | None = None
+
+    def update(self, agent: str, stats: dict[str, Any]) -> None:
+        """Record the newest stats for an agent; older pending ones are replaced."""
+        with self._lock:
+            self._pending[agent] = stats
+
+    def cadence(self, sub: Subscriber) -> int:
+        """Return the flush period (ms) used for a subscriber."""
+        requested = sub.stats_interval_ms or self.interval_ms
+        # Round up to a whole number of base ticks.
+        ticks = max(1, -(-requested // self.interval_ms))
+        return ticks * self.interval_ms
+
+    def flush(self, now: float | None = None) -> None:
+        """Send due stats frames to subscribers (called every base tick)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        by_cadence: dict[int, list[Subscriber]] = {}
+        for sub in self.broadcaster.subscribers:
+            by_cadence.setdefault(self.cadence(sub), []).append(sub)
+        # Forget groups nobody listens to any more.
+        for cadence in set(self._groups) - set(by_cadence):
+            del self._groups[cadence]
+
+        for cadence, subs in by_cadence.items():
+            group = self._groups.get(cadence)
+            if group is None:
+                group = self._groups[cadence] = _Group()
+            group.pending.update(pending)
+            if not group.pending or (now - group.last_flush) * 1000 < cadence:
+                continue
+            frame = format_event('stats_batch', list(group.pending.values()))
+            group.pending = {}
+            group.last_flush = now
+            for sub in subs:
+                # A full queue is dealt with by the next regular event,
+                # which evicts the subscriber.
+                sub.offer(frame)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval_ms / 1000)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush stats')
+
+    def start(self) -> None:
+        """Start the background flush thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name='stats-coalescer',
+                daemon=True,
+            )
+            self._thread.start()
@@ -0,0 +1,381 @@
+"""Compact binary encoding of observability messages.
+
+Messages are pickled by the exchange, which repeats the class path, every
+field name and the full agent UUID in every message. A frame from this
+codec carries only the values, and strings that repeat from message to
+message (agent IDs and names, log levels, dictionary keys) are sent once per
+stream and then referred to by a small integer.
+
+Frame layout, all integers little-endian::
+
+    version: u8 | stream: u64 | count: varint | message * count
+
+Each message starts with a one-byte type tag followed by its fields in
+declaration order. Interned strings are written as ``varint(index << 1 |
+new)``, followed by the string itself the first time (``new`` = 1).
+
+``Stats`` whose GPU entries have the shape :class:`.MonitoredAgent` reports
+(``index``, ``utilization_percent``, ``memory_used_mb`` and
+``memory_total_mb``, in that order, as int, int, float and float) are sent
+as a fixed layout of structs, which takes fewer bytes and encodes and decodes
+faster than the generic value encoding used for other ``Stats``.
+
+An :class:`Encoder` belongs to one sender and a :class:`Decoder` to one
+receiver. If frames arrive out of order, or the receiver restarted and lost
+its string table, decoding fails with :class:`UnknownReferenceError`; the
+sender then calls :meth:`Encoder.reset`, which starts a new stream, and
+resends the messages.
+"""
+
+from __future__ import annotations
+
+import random
+import struct
+from typing import Any
+
+from agentic_blueprint_catalog.observability.message import Log
+from agentic_blueprint_catalog.observability.message import Message
+from agentic_blueprint_catalog.observability.message import Registration
+from agentic_blueprint_catalog.observability.message import Stats
+from agentic_blueprint_catalog.observability.message import UserPrompt
+
+VERSION = 2
+# Version 2 added the fixed-layout Stats; version 1 frames still decode.
+_VERSIONS = (1, 2)
+
+_HEADER = struct.Struct('<BQ')
+_DOUBLE = struct.Struct('<d')
+_STATS = struct.Struct('<ddd')
+# cpu, rss, vms, GPU count; then per GPU: index, utilization, used, total.
+_FIXED_STATS = struct.Struct('<dddB')
+_FIXED_GPU = struct.Struct('<HHdd')
+_GPU_KEYS = ('index', 'utilization_percent', 'memory_used_mb', 'memory_total_mb')
+
+_REGISTRATION, _LOG, _STATS_TAG, _PROMPT, _FIXED_STATS_TAG = 1, 2, 3, 4, 5
+
+# Tags of the generic values in Stats.gpu and Registration.geolocation.
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT = range(8)
+
+# Strings interned per stream; later new strings are sent inline.
+MAX_INTERNED = 4096
+# Streams remembered per sender, so that frames from before a reset that
+# are still in flight can be decoded.
+_STREAMS_PER_SENDER = 4
+
+
+class CodecError(ValueError):
+    """A frame could not be decoded."""
+
+
+class UnknownReferenceError(CodecError):
+    """A frame refers to a string the decoder has not seen."""
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:  # noqa: PLR2004
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_str(out: bytearray, s: str) -> None:
+    data = s.encode()
+    _write_varint(out, len(data))
+    out += data
+
+
+def _fixed_gpu(gpu: list[dict[str, Any]]) -> bool:
+    """Whether GPU entries round-trip exactly through the fixed layout."""
+    if len(gpu) > 0xFF:  # noqa: PLR2004
+        return False
+    for g in gpu:
+        if type(g) is not dict or tuple(g) != _GPU_KEYS:
+            return False
+        index, util, used, total = g.values()
+        if not (type(index) is int and type(util) is int and type(used) is float and type(total) is float):
+            return False
+        if not (0 <= index <= 0xFFFF and 0 <= util <= 0xFFFF):  # noqa: PLR2004
+            return False
+    return True
+
+
+class Encoder:
+    """Encodes messages from one sender into frames.
+
+    Not thread-safe. Frames must be decoded in the order they were
+    encoded, unless :meth:`reset` is called in between.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new stream, forgetting which strings were sent."""
+        self.stream = random.getrandbits(64)
+        self._strings: dict[str, int] = {}
+
+    def _intern(self, out: bytearray, s: str) -> None:
+        index = self._strings.get(s)
+        if index is not None:
+            _write_varint(out, index << 1)
+        elif len(self._strings) < MAX_INTERNED:
+            index = self._strings[s] = len(self._strings) + 1
+            _write_varint(out, index << 1 | 1)
+            _write_str(out, s)
+        else:
+            # Index 0 is never assigned; "new index 0" is an inline string.
+            _write_varint(out, 1)
+            _write_str(out, s)
+
+    def _value(self, out: bytearray, v: Any) -> None:
+        if v is None:
+            out.append(_NONE)
+        elif v is True or v is False:
+            out.append(_TRUE if v else _FALSE)
+        elif isinstance(v, int):
+            out.append(_INT)
+            _write_varint(out, v << 1 if v >= 0 else (-v << 1) - 1)
+        elif isinstance(v, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(v)
+        elif isinstance(v, str):
+            out.append(_STR)
+            _write_str(out, v)
+        elif isinstance(v, (list, tuple)):
+            out.append(_LIST)
+            _write_varint(out, len(v))
+            for item in v:
+                self._value(out, item)
+        elif isinstance(v, dict):
+            out.append(_DICT)
+            _write_varint(out, len(v))
+            for key, item in v.items():
+                self._intern(out, str(key))
+                self._value(out, item)
+        else:
+            raise TypeError(f'Cannot encode {type(v).__name__}')
+
+    def encode(self, messages: list[Message]) -> bytes:
+        """Return one frame holding ``messages``."""
+        out = bytearray(_HEADER.pack(VERSION, self.stream))
+        _write_varint(out, len(messages))
+        intern = self._intern
+        for m in messages:
+            if isinstance(m, Log):
+                out.append(_LOG)
+                intern(out, m.agent_id)
+                intern(out, m.agent_name)
+                intern(out, m.level)
+                _write_str(out, m.message)
+            elif isinstance(m, Stats) and _fixed_gpu(m.gpu):
+                out.append(_FIXED_STATS_TAG)
+                intern(out, m.agent_id)
+                out += _FIXED_STATS.pack(m.cpu_percent, m.memory_rss_mb, m.memory_vms_mb, len(m.gpu))
+                for g in m.gpu:
+                    out += _FIXED_GPU.pack(*g.values())
+            elif isinstance(m, Stats):
+                out.append(_STATS_TAG)
+                intern(out, m.agent_id)
+                out += _STATS.pack(m.cpu_percent, m.memory_rss_mb, m.memory_vms_mb)
+                self._value(out, m.gpu)
+            elif isinstance(m, Registration):
+                out.append(_REGISTRATION)
+                for s in (m.agent_id, m.agent_name, m.fqdn, m.cpu, m.gpu, m.os, m.arch, m.python_version):
+                    intern(out, s)
+                self._value(out, m.geolocation)
+            elif isinstance(m, UserPrompt):
+                out.append(_PROMPT)
+                intern(out, m.agent_id)
+                _write_str(out, m.prompt)
+                self._value(out, m.responses)
+                self._value(out, m.timeout_s)
+                _write_str(out, m.default)
+            else:
+                raise TypeError(f'Cannot encode {type(m).__name__}')
+        return bytes(out)
+
+
+class _Reader:
+    """Cursor over one frame, resolving interned strings against a table.
+
+    Strings the frame defines are added to the table as they are read and
+    listed in ``new``, so that they can be removed again if the frame turns
+    out to be invalid. The common one-byte cases are handled inline.
+    """
+
+    def __init__(self, data: bytes, offset: int, strings: dict[int, str]) -> None:
+        self.data = data
+        self.pos = offset
+        self.strings = strings
+        self.new: list[int] = []
+
+    def varint(self) -> int:
+        data, pos = self.data, self.pos
+        n = shift = 0
+        while True:
+            b = data[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:  # noqa: PLR2004
+                self.pos = pos
+                return n
+            shift += 7
+
+    def raw_str(self) -> str:
+        data, pos = self.data, self.pos
+        n = data[pos]
+        if n < 0x80:  # noqa: PLR2004
+            pos += 1
+        else:
+            n = self.varint()
+            pos = self.pos
+        end = pos + n
+        if end > len(data):
+            raise CodecError('Truncated frame')
+        self.pos = end
+        return data[pos:end].decode()
+
+    def interned(self) -> str:
+        token = self.data[self.pos]
+        if token < 0x80 and not token & 1:  # noqa: PLR2004
+            self.pos += 1
+        else:
+            token = self.varint()
+            if token == 1:
+                return self.raw_str()
+            if token & 1:
+                index = token >> 1
+                s = self.strings[index] = self.raw_str()
+                self.new.append(index)
+                return s
+        try:
+            return self.strings[token >> 1]
+        except KeyError:
+            raise UnknownReferenceError(f'Unknown string reference {token >> 1}') from None
+
+    def unpack(self, s: struct.Struct) -> tuple[Any, ...]:
+        values = s.unpack_from(self.data, self.pos)
+        self.pos += s.size
+        return values
+
+    def value(self) -> Any:  # noqa: PLR0911
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _NONE:
+            return None
+        if tag in (_FALSE, _TRUE):
+            return tag == _TRUE
+        if tag == _INT:
+            n = self.varint()
+            return n >> 1 if not n & 1 else -((n + 1) >> 1)
+        if tag == _FLOAT:
+            return self.unpack(_DOUBLE)[0]
+        if tag == _STR:
+            return self.raw_str()
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _DICT:
+            return {self.interned(): self.value() for _ in range(self.varint())}
+        raise CodecError(f'Unknown value tag {tag}')
+
+
+class Decoder:
+    """Decodes frames from any number of senders.
+
+    Keeps the string table of the last few streams of each sender.
+    Not thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._streams: dict[str, dict[int, dict[int, str]]] = {}
+
+    def forget(self, sender: str) -> None:
+        """Drop the string tables of a sender."""
+        self._streams.pop(sender, None)
+
+    def _table(self, sender: str, stream: int) -> dict[int, str]:
+        streams = self._streams.get(sender)
+        if streams is None:
+            streams = self._streams[sender] = {}
+        table = streams.get(stream)
+        if table is None:
+            table = streams[stream] = {}
+            if len(streams) > _STREAMS_PER_SENDER:
+                del streams[next(iter(streams))]
+        return table
+
+    def decode(self, sender: str, frame: bytes) -> list[Message]:
+        """Return the messages in a frame from ``sender``.
+
+        Raises:
+            UnknownReferenceError: If the frame refers to a string from an
+                earlier frame that was not decoded here; the sender should
+                reset its encoder and send the messages again.
+            CodecError: If the frame is malformed or from an unsupported
+                version of the codec.
+        """
+        if len(frame) < _HEADER.size:
+            raise CodecError('Truncated frame')
+        version, stream = _HEADER.unpack_from(frame)
+        if version not in _VERSIONS:
+            raise CodecError(f'Unsupported codec version {version}')
+        table = self._table(sender, stream)
+        r = _Reader(frame, _HEADER.size, table)
+        try:
+            messages = self._messages(r)
+        except Exception as e:
+            for index in r.new:
+                table.pop(index, None)
+            if isinstance(e, (IndexError, struct.error, UnicodeDecodeError)):
+                raise CodecError(f'Malformed frame: {e}') from e
+            raise
+        return messages
+
+    @classmethod
+    def _messages(cls, r: _Reader) -> list[Message]:
+        data, strings = r.data, r.strings
+        messages: list[Message] = []
+        for _ in range(r.varint()):
+            pos = r.pos
+            # Fast path for the bulk of the traffic: a log record whose
+            # strings are all known and whose text is shorter than 16 KiB.
+            if data[pos] == _LOG:
+                a, b, c, n = data[pos + 1], data[pos + 2], data[pos + 3], data[pos + 4]
+                if not (a | b | c) & 0x81:
+                    start = pos + 5
+                    if n >= 0x80:  # noqa: PLR2004
+                        n = (n & 0x7F) | data[start] << 7
+                        start += 1
+                    end = start + n
+                    if n < 0x4000 and end <= len(data) and (a >> 1) in strings and (b >> 1) in strings and (c >> 1) in strings:  # noqa: PLR2004
+                        messages.append(Log(strings[a >> 1], strings[b >> 1], data[start:end].decode(), strings[c >> 1]))
+                        r.pos = end
+                        continue
+            messages.append(cls._message(r))
+        return messages
+
+    @staticmethod
+    def _message(r: _Reader) -> Message:
+        tag = r.data[r.pos]
+        r.pos += 1
+        if tag == _LOG:
+            agent_id, agent_name, level = r.interned(), r.interned(), r.interned()
+            return Log(agent_id, agent_name, r.raw_str(), level)
+        if tag == _FIXED_STATS_TAG:
+            agent_id = r.interned()
+            cpu, rss, vms, count = r.unpack(_FIXED_STATS)
+            gpus = []
+            for _ in range(count):
+                index, util, used, total = r.unpack(_FIXED_GPU)
+                gpus.append({'index': index, 'utilization_percent': util, 'memory_used_mb': used, 'memory_total_mb': total})
+            return Stats(agent_id, cpu, rss, vms, gpus)
+        if tag == _STATS_TAG:
+            agent_id = r.interned()
+            cpu, rss, vms = r.unpack(_STATS)
+            return Stats(agent_id, cpu, rss, vms, r.value())
+        if tag == _REGISTRATION:
+            agent_id, agent_name, fqdn, cpu, gpu, os, arch, python_version = (r.interned() for _ in range(8))
+            return Registration(agent_id, agent_name, fqdn, cpu, gpu, os, arch, python_version, r.value())
+        if tag == _PROMPT:
+            return UserPrompt(r.interned(), r.raw_str(), r.value(), r.value(), r.raw_str())
+        raise CodecError(f'Unknown message tag {tag}')
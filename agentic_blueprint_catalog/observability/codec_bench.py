@@ -0,0 +1,93 @@
+"""Compare the size and speed of :mod:`.codec` frames with pickled messages.
+
+    python -m agentic_blueprint_catalog.observability.codec_bench
+
+Pickle is what the exchange uses for ``message`` and ``message_batch``
+arguments. Both sides are measured on a warm stream, i.e. after the agent's
+IDs and names have been sent once, which is the steady state of a running
+agent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import timeit
+import uuid
+from collections.abc import Callable
+
+from agentic_blueprint_catalog.observability.codec import Decoder
+from agentic_blueprint_catalog.observability.codec import Encoder
+from agentic_blueprint_catalog.observability.message import Log
+from agentic_blueprint_catalog.observability.message import Message
+from agentic_blueprint_catalog.observability.message import Registration
+from agentic_blueprint_catalog.observability.message import Stats
+
+
+def _workloads() -> dict[str, list[Message]]:
+    agent_id = str(uuid.uuid4())
+    logs: list[Message] = [Log(agent_id, 'Spinner', f'2026-01-01 12:00:{i % 60:02d},000 INFO root: Finished iteration {i}', 'INFO') for i in range(100)]
+    stats = Stats(
+        agent_id,
+        cpu_percent=12.5,
+        memory_rss_mb=345.6,
+        memory_vms_mb=1234.5,
+        gpu=[{'index': 0, 'utilization_percent': 40, 'memory_used_mb': 1024.0, 'memory_total_mb': 40960.0}],
+    )
+    registration = Registration(
+        agent_id,
+        'Spinner',
+        fqdn='login1.cluster.example.edu',
+        cpu='AMD EPYC 7763 64-Core Processor',
+        gpu='NVIDIA A100-SXM4-40GB',
+        os='Linux',
+        arch='x86_64',
+        python_version='3.12.4',
+        geolocation={'ip': '192.0.2.1', 'city': 'Chicago', 'loc': '41.8500,-87.6500', 'org': 'AS160 The University of Chicago'},
+    )
+    return {
+        'log': logs[:1],
+        'log batch (100)': logs,
+        'stats': [stats],
+        'registration': [registration],
+    }
+
+
+def _per_call(fn: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    """Print bytes and microseconds per message for each workload."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000, help='Calls per timing run')
+    number = parser.parse_args().number
+
+    print(f'{"workload":<18}{"format":<8}{"bytes/msg":>10}{"encode us":>11}{"decode us":>11}')
+    for name, messages in _workloads().items():
+        encoder, decoder = Encoder(), Decoder()
+        # Warm the stream so that IDs and names are already interned.
+        decoder.decode('bench', encoder.encode(messages))
+        frame = encoder.encode(messages)
+        pickled = pickle.dumps(messages, protocol=pickle.HIGHEST_PROTOCOL)
+        n = len(messages)
+        rows = (
+            (
+                'pickle',
+                len(pickled),
+                _per_call(lambda: pickle.dumps(messages, protocol=pickle.HIGHEST_PROTOCOL), number),  # noqa: B023
+                _per_call(lambda: pickle.loads(pickled), number),  # noqa: B023
+            ),
+            (
+                'codec',
+                len(frame),
+                _per_call(lambda: encoder.encode(messages), number),  # noqa: B023
+                _per_call(lambda: decoder.decode('bench', frame), number),  # noqa: B023
+            ),
+        )
+        for fmt, size, encode_s, decode_s in rows:
+            print(f'{name:<18}{fmt:<8}{size / n:>10.1f}{encode_s / n * 1e6:>11.2f}{decode_s / n * 1e6:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
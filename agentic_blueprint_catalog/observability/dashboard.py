@@ -2,25 +2,60 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import dataclasses
 import json
 import logging
 import os as _os
 import queue
 import threading
 import time
+import uuid
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
 from typing import Any
-
-from flask import Flask
-from flask import request
-from flask import Response
-from flask import send_from_directory
-
+from typing import TYPE_CHECKING
+
+from agentic_blueprint_catalog.observability.broadcast import AsyncSubscriber
+from agentic_blueprint_catalog.observability.broadcast import Broadcaster
+from agentic_blueprint_catalog.observability.broadcast import EVICTED
+from agentic_blueprint_catalog.observability.broadcast import format_event
+from agentic_blueprint_catalog.observability.broadcast import parse_event_id
+from agentic_blueprint_catalog.observability.broadcast import QueueSubscriber
+from agentic_blueprint_catalog.observability.broadcast import Subscriber
+from agentic_blueprint_catalog.observability.coalesce import StatsCoalescer
+from agentic_blueprint_catalog.observability.liveness import EVICTED as AGENT_EVICTED
+from agentic_blueprint_catalog.observability.liveness import LIVE
+from agentic_blueprint_catalog.observability.liveness import LivenessTracker
+from agentic_blueprint_catalog.observability.logos import LogoIndex
+from agentic_blueprint_catalog.observability.logstore import LogFilter
+from agentic_blueprint_catalog.observability.logstore import LogStore
 from agentic_blueprint_catalog.observability.message import Log
+from agentic_blueprint_catalog.observability.message import Message
 from agentic_blueprint_catalog.observability.message import Registration
 from agentic_blueprint_catalog.observability.message import Stats
 from agentic_blueprint_catalog.observability.message import UserPrompt
+from agentic_blueprint_catalog.observability.prompts import policies_from_env
+from agentic_blueprint_catalog.observability.prompts import PromptGroups
+from agentic_blueprint_catalog.observability.prompts import PromptPolicy
+from agentic_blueprint_catalog.observability.static import StaticBundle
+from agentic_blueprint_catalog.observability.timeseries import TimeSeriesStore
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from flask import Response
+
+    from agentic_blueprint_catalog.observability.async_server import AsyncDashboardServer
 
 _ASSETS_DIR = _os.path.join(_os.path.dirname(__file__), 'assets')
+# How long the browser waits before reconnecting a dropped event stream.
+_SSE_RETRY_MS = 2000
+# Most log entries returned by one /logs request.
+_MAX_LOG_PAGE = 1000
+# Evicted agents remembered so that reconnecting pages can drop them.
+_MAX_TOMBSTONES = 1000
 
 logger = logging.getLogger(__name__)
 
@@ -250,6 +285,7 @@ _HTML = r"""<!DOCTYPE html>
       border-color:rgba(0,229,255,.44);
       box-shadow:0 0 26px rgba(0,229,255,.06), inset 0 0 26px rgba(0,229,255,.025);
     }
+    .agent-card.dead { opacity:.5; }
     @keyframes cardIn { from{opacity:0;transform:translateY(10px)} to{opacity:1;transform:translateY(0)} }
 
     /* Corner brackets */
@@ -296,6 +332,8 @@ _HTML = r"""<!DOCTYPE html>
     }
     .stat-val { color:var(--cyan); }
     .track { height:3px; background:rgba(0,229,255,.08); border-radius:2px; overflow:hidden; }
+    .spark { display:block; width:100%; height:22px; margin:2px 0 10px; }
+    .spark polyline { fill:none; stroke:var(--cyan); stroke-width:1; vector-effect:non-scaling-stroke; opacity:.7; }
     .fill { height:100%; border-radius:2px; transition:width .6s ease,background .5s ease,box-shadow .5s ease; }
     .fill.lo { background:var(--green);  box-shadow:0 0 6px var(--green); }
     .fill.md { background:var(--yellow); box-shadow:0 0 6px var(--yellow); }
@@ -319,6 +357,14 @@ _HTML = r"""<!DOCTYPE html>
     }
     .btn:hover          { border-color:var(--cyan); color:var(--cyan); background:rgba(0,229,255,.05); }
     .btn.is-active      { border-color:var(--cyan); color:var(--cyan); background:rgba(0,229,255,.09); }
+    .log-search {
+      background:transparent;
+      border:1px solid rgba(0,229,255,.28);
+      color:var(--cyan);
+      font-family:inherit; font-size:.63rem; letter-spacing:.15em;
+      padding:4px 9px; width:190px; outline:none;
+    }
+    .log-search:focus { border-color:var(--cyan); }
 
     #log-stream {
       height:calc(100vh - 215px);
@@ -381,6 +427,7 @@ _HTML = r"""<!DOCTYPE html>
     .modal-tag  { font-size:.63rem; letter-spacing:.4em; color:var(--yellow); text-shadow:0 0 12px var(--yellow); margin-bottom:6px; }
     .modal-from { font-size:.7rem; color:var(--dim); letter-spacing:.2em; margin-bottom:18px; }
     .modal-from strong { color:var(--cyan); }
+    #modal-expires:empty { display:none; }
     .modal-body {
       font-size:.86rem; line-height:1.65;
       color:rgba(200,228,255,.9);
@@ -547,6 +594,8 @@ _HTML = r"""<!DOCTYPE html>
       <div class="log-toolbar">
         <div class="log-info">BUFFER&nbsp;<span id="log-buf-n" style="color:var(--cyan)">0</span>&nbsp;ENTRIES</div>
         <div class="log-actions">
+          <input class="log-search" id="log-search" placeholder="SEARCH (ENTER)" onkeydown="if (event.key === 'Enter') searchLogs()">
+          <button class="btn" onclick="loadOlderLogs()">OLDER</button>
           <button class="btn is-active" id="scroll-btn" onclick="toggleScroll()">AUTO-SCROLL ON</button>
           <button class="btn" onclick="clearLogs()">CLEAR</button>
         </div>
@@ -575,6 +624,7 @@ _HTML = r"""<!DOCTYPE html>
     <div class="modal-tag">⚡&nbsp;&nbsp;USER INPUT REQUIRED</div>
     <div class="modal-from">FROM:&nbsp;<strong id="modal-agent"></strong></div>
     <div id="modal-body" class="modal-body"></div>
+    <div id="modal-expires" class="modal-from"></div>
     <div id="modal-responses" class="modal-responses"></div>
     <div id="modal-actions" class="modal-actions">
       <button class="btn btn-primary" onclick="dismissPrompt()">ACKNOWLEDGE</button>
@@ -604,36 +654,98 @@ let logBufN   = 0;
 let eventN    = 0;
 let pendingPrompts  = [];
 let currentPromptId = null;
+let lastLogSeq      = -1;
 const t0 = Date.now();
 
 // ── SSE ──────────────────────────────────────────────────────────────────
-const es = new EventSource('/events');
+// Query parameters (e.g. ?stats_ms=5000 for a slower stats cadence) are
+// passed through to the event stream. When the stream is reopened after an
+// eviction or error, the page also says which event and which state version
+// it has, so the server can replay or send only what changed.
+let es = null;
+let lastEventId  = null;
+let stateEpoch   = null;
+let stateVersion = null;
+const sseHandlers = [];
+
+function on(event, fn) {
+  const handler = e => {
+    if (e.lastEventId) lastEventId = e.lastEventId;
+    fn(e);
+  };
+  sseHandlers.push([event, handler]);
+  if (es) es.addEventListener(event, handler);
+}
+
+function connect() {
+  const params = new URLSearchParams(location.search);
+  if (lastEventId !== null) params.set('lastEventId', lastEventId);
+  if (stateEpoch !== null) {
+    params.set('since', `${stateEpoch}:${stateVersion}`);
+    params.set('log_seq', lastLogSeq);
+  }
+  es = new EventSource('/events?' + params);
+  sseHandlers.forEach(([event, handler]) => es.addEventListener(event, handler));
+  es.onopen  = onOpen;
+  es.onerror = onError;
+}
+
+function reconnect() {
+  es.close();
+  setTimeout(connect, 1000);
+}
 
-es.addEventListener('init', e => {
+connect();
+
+// Sent when the server cannot replay what this page missed: either a delta
+// of what changed since the page's state version, or a full snapshot, in
+// which case start over rather than merge into stale logs and prompts.
+on('init', e => {
   const s = JSON.parse(e.data);
+  stateEpoch   = s.epoch;
+  stateVersion = s.version;
+  if (!s.delta || !s.logs_complete) {
+    clearLogs();
+    lastLogSeq = -1;
+  }
+  pendingPrompts = [];
+  currentPromptId = null;
   s.logs.forEach(appendLog);
+  if (!s.delta || !s.logs_complete) logCursor = s.logs.length ? s.logs[0].seq : null;
+  (s.removed || []).forEach(removeAgent);
+  if (!s.delta) Object.keys(agents).filter(n => !(n in s.agents)).forEach(removeAgent);
   Object.entries(s.agents).forEach(([n, d]) => {
     Object.assign(agents[n] || (agents[n] = {}), d, { agent: n });
     upsertCard(n, agents[n]);
     if (d.geo?.lat) _upsertMapMarker({ ...agents[n], agent: n });
   });
   s.prompts.forEach(p => pendingPrompts.push(p));
-  if (pendingPrompts.length && !currentPromptId) showNextPrompt();
+  showNextPrompt();
   updateHud();
 });
 
-es.addEventListener('log', e => {
+on('log', e => {
   appendLog(JSON.parse(e.data)); eventN++; updateHud();
 });
 
-es.addEventListener('stats', e => {
-  const d = JSON.parse(e.data);
+function onStats(d) {
+  recordCpu(d.agent, d);
   Object.assign(agents[d.agent] || (agents[d.agent] = {}), d);
   upsertCard(d.agent, agents[d.agent]);
+}
+
+on('stats', e => {
+  onStats(JSON.parse(e.data));
+  eventN++; updateHud();
+});
+
+// Latest stats of every agent that reported since the previous frame.
+on('stats_batch', e => {
+  JSON.parse(e.data).forEach(onStats);
   eventN++; updateHud();
 });
 
-es.addEventListener('agent_connected', e => {
+on('agent_connected', e => {
   const d = JSON.parse(e.data);
   if (!agents[d.agent]) {
     agents[d.agent] = { last_seen: Date.now() / 1000 };
@@ -642,27 +754,47 @@ es.addEventListener('agent_connected', e => {
   eventN++; updateHud();
 });
 
-es.addEventListener('prompt', e => {
+// A new prompt, or a group of identical prompts whose count changed.
+on('prompt', e => {
   const d = JSON.parse(e.data);
-  pendingPrompts.push(d);
-  if (!currentPromptId) showNextPrompt();
+  const i = pendingPrompts.findIndex(p => p.id === d.id);
+  if (i < 0) pendingPrompts.push(d);
+  else pendingPrompts[i] = d;
+  if (!currentPromptId || currentPromptId === d.id) showNextPrompt();
   eventN++;
 });
 
-es.onopen = () => {
+// Answered on another page, timed out or cancelled by the agent.
+on('prompt_closed', e => {
+  const d = JSON.parse(e.data);
+  pendingPrompts = pendingPrompts.filter(p => p.id !== d.id);
+  if (currentPromptId === d.id) showNextPrompt();
+  eventN++;
+});
+
+function onOpen() {
   const dot = document.getElementById('conn-dot');
   const lbl = document.getElementById('conn-lbl');
   dot.className = 'live';
   lbl.textContent = 'LIVE';
   lbl.style.color = 'var(--green)';
-};
-es.onerror = () => {
+}
+
+// Sent when this page fell too far behind; the server closes the stream and
+// the page reconnects, resuming from the last event it received.
+on('evicted', () => {
+  document.getElementById('conn-lbl').textContent = 'RESYNCING';
+  reconnect();
+});
+
+function onError() {
   const dot = document.getElementById('conn-dot');
   const lbl = document.getElementById('conn-lbl');
   dot.className = 'dead';
   lbl.textContent = 'RECONNECTING';
   lbl.style.color = 'var(--red)';
-};
+  reconnect();
+}
 
 // ── Tab switching ─────────────────────────────────────────────────────────
 function switchTab(btn) {
@@ -673,21 +805,60 @@ function switchTab(btn) {
 }
 
 // ── Agent cards ───────────────────────────────────────────────────────────
+// Liveness state (from the server's silence timeouts) → badge label, colour.
+const STATE_BADGES = {
+  live:  ['ONLINE',  'var(--green)'],
+  stale: ['STALE',   'var(--yellow)'],
+  dead:  ['OFFLINE', 'var(--red)'],
+};
+
+function cardId(name) {
+  return 'card-' + name.replace(/[^a-zA-Z0-9_-]/g, '_');
+}
+
+// Forget an agent the server evicted after a long silence.
+function removeAgent(name) {
+  delete agents[name];
+  delete cpuHistory[name];
+  document.getElementById(cardId(name))?.remove();
+  if (_markers[name]) {
+    _markers[name].marker.remove();
+    delete _markers[name];
+  }
+  Object.keys(_lines).forEach(key => {
+    if (key.split('||').includes(name)) {
+      _lines[key].line.remove();
+      delete _lines[key];
+    }
+  });
+}
+
+on('agent_state', e => {
+  const d = JSON.parse(e.data);
+  if (d.state === 'evicted') removeAgent(d.agent);
+  else if (agents[d.agent]) upsertCard(d.agent, { state: d.state });
+  eventN++; updateHud();
+});
+
 function upsertCard(name, data) {
   document.getElementById('empty-agents')?.remove();
 
-  const safeId = 'card-' + name.replace(/[^a-zA-Z0-9_-]/g, '_');
+  const safeId = cardId(name);
   let card = document.getElementById(safeId);
   if (!card) {
     card = document.createElement('div');
     card.id = safeId;
     card.className = 'agent-card live';
     document.getElementById('agents-grid').appendChild(card);
+    loadHistory(name);
   }
 
   Object.assign(agents[name] || (agents[name] = {}), data);
   const d = agents[name];
   const hasStats = d.cpu_percent !== undefined;
+  const [stateLbl, stateColor] = STATE_BADGES[d.state] || STATE_BADGES.live;
+  card.classList.toggle('live', !d.state || d.state === 'live');
+  card.classList.toggle('dead', d.state === 'dead');
 
   card.innerHTML = `
     <div class="card-hdr">
@@ -696,14 +867,53 @@ function upsertCard(name, data) {
         <div class="agent-sub">${x(String(name).slice(0, 22))}</div>
       </div>
       <div style="display:flex;align-items:center">
-        <div class="badge"><div class="sdot"></div><span style="color:var(--green);font-size:.62rem;letter-spacing:.15em">ONLINE</span></div>
+        <div class="badge">
+          <div class="sdot" style="background:${stateColor};box-shadow:0 0 8px ${stateColor}"></div>
+          <span style="color:${stateColor};font-size:.62rem;letter-spacing:.15em">${stateLbl}</span>
+        </div>
         <button class="power-btn" onclick="shutdownAgent('${x(name)}')" title="Shutdown agent">⏻</button>
       </div>
     </div>
-    ${hasStats ? buildStats(d) : '<div class="no-stats">AWAITING STATS...</div>'}
+    ${hasStats ? buildStats(d) + sparkline(cpuHistory[name] || []) : '<div class="no-stats">AWAITING STATS...</div>'}
   `;
 }
 
+// ── Stats history ─────────────────────────────────────────────────────────
+// CPU history for the card sparklines: loaded from /stats/<agent> when a
+// card is created, then extended by live stats.
+const HISTORY_S  = 3600;
+const cpuHistory = {};
+
+function loadHistory(name) {
+  cpuHistory[name] = [];
+  const since = Date.now() / 1000 - HISTORY_S;
+  fetch(`/stats/${encodeURIComponent(name)}?metrics=cpu_percent&since=${since}`)
+    .then(r => r.ok ? r.json() : null)
+    .then(h => {
+      if (!h) return;
+      const pts  = h.t.map((t, i) => [t, h.series.cpu_percent[i]]).filter(p => p[1] !== null);
+      const last = pts.length ? pts[pts.length - 1][0] : 0;
+      cpuHistory[name] = pts.concat(cpuHistory[name].filter(p => p[0] > last));
+      upsertCard(name, {});
+    });
+}
+
+function recordCpu(name, d) {
+  const h = cpuHistory[name];
+  if (!h || d.cpu_percent === undefined || d.last_seen === undefined) return;
+  h.push([d.last_seen, d.cpu_percent]);
+  while (h.length && h[0][0] < d.last_seen - HISTORY_S) h.shift();
+}
+
+function sparkline(points) {
+  if (points.length < 2) return '';
+  const t0   = points[0][0];
+  const span = Math.max(points[points.length - 1][0] - t0, 1);
+  const xy   = points.map(([t, v]) =>
+    `${((t - t0) / span * 100).toFixed(1)},${(20 - Math.min(v, 100) / 5).toFixed(1)}`).join(' ');
+  return `<svg class="spark" viewBox="0 0 100 20" preserveAspectRatio="none"><title>CPU, last hour</title><polyline points="${xy}"/></svg>`;
+}
+
 function buildStats(d) {
   const cpu    = d.cpu_percent    ?? 0;
   const memRss = d.memory_rss_mb  ?? 0;
@@ -738,7 +948,24 @@ function statBar(label, val, unit, pct) {
 
 // ── Log stream ────────────────────────────────────────────────────────────
 function appendLog(entry) {
+  // Live logs are not shown with search results, and wait while the
+  // newest logs are being refetched.
+  if (logQuery) return;
+  if (logLoading) { heldLogs.push(entry); return; }
+  // A log can arrive both in a snapshot and as an event; show it once.
+  if (entry.seq !== undefined) {
+    if (entry.seq <= lastLogSeq) return;
+    lastLogSeq = entry.seq;
+  }
   const stream = document.getElementById('log-stream');
+  stream.appendChild(logRow(entry));
+  logBufN++;
+  document.getElementById('log-buf-n').textContent = logBufN;
+  while (stream.children.length > 600) stream.removeChild(stream.firstChild);
+  if (autoScroll) stream.scrollTop = stream.scrollHeight;
+}
+
+function logRow(entry) {
   const row    = document.createElement('div');
   row.className = 'log-row';
   const lvl = (entry.level || 'INFO').split(':').pop().trim().toUpperCase();
@@ -748,11 +975,61 @@ function appendLog(entry) {
     <span class="log-src">${x((entry.agent_name || 'unknown').substring(0, 20))}${entry.agent_id ? '[' + x(String(entry.agent_id).substring(0, 4)) + ']' : ''}</span>
     <span class="log-msg">${x(entry.message || '')}</span>
   `;
-  stream.appendChild(row);
-  logBufN++;
-  document.getElementById('log-buf-n').textContent = logBufN;
-  while (stream.children.length > 600) stream.removeChild(stream.firstChild);
-  if (autoScroll) stream.scrollTop = stream.scrollHeight;
+  return row;
+}
+
+// ── Log history ───────────────────────────────────────────────────────────
+// The page only holds recent logs; searches and older pages come from
+// /logs. logCursor is the seq to page back from, null when there is none.
+let logQuery   = '';
+let logCursor  = null;
+let logLoading = false;
+let heldLogs   = [];
+
+function fetchLogs(params) {
+  if (logQuery) params.q = logQuery;
+  return fetch('/logs?' + new URLSearchParams(params)).then(r => {
+    if (!r.ok) throw new Error(`/logs returned ${r.status}`);
+    return r.json();
+  });
+}
+
+// Show the newest logs matching the search box, or return to the live
+// stream when it is empty.
+function searchLogs() {
+  logQuery = document.getElementById('log-search').value.trim();
+  clearLogs();
+  lastLogSeq = -1;
+  logLoading = !logQuery;
+  fetchLogs({}).then(page => {
+    logCursor = page.cursor;
+    if (logQuery) {
+      const stream = document.getElementById('log-stream');
+      page.logs.forEach(e => stream.appendChild(logRow(e)));
+      logBufN = page.logs.length;
+      document.getElementById('log-buf-n').textContent = logBufN;
+      return;
+    }
+    logLoading = false;
+    page.logs.forEach(appendLog);
+  }).catch(err => console.warn('Failed to load logs:', err)).finally(() => {
+    // Live logs held during the fetch are shown even if it failed, so the
+    // stream does not stall.
+    logLoading = false;
+    heldLogs.splice(0).forEach(appendLog);
+  });
+}
+
+function loadOlderLogs() {
+  if (logCursor === null) return;
+  fetchLogs({ cursor: logCursor }).then(page => {
+    const stream = document.getElementById('log-stream');
+    const first  = stream.firstChild;
+    page.logs.forEach(e => stream.insertBefore(logRow(e), first));
+    logBufN += page.logs.length;
+    document.getElementById('log-buf-n').textContent = logBufN;
+    logCursor = page.cursor;
+  }).catch(err => console.warn('Failed to load older logs:', err));
 }
 
 function toggleScroll() {
@@ -778,8 +1055,12 @@ function showNextPrompt() {
   }
   const p = pendingPrompts[0];
   currentPromptId = p.id;
-  document.getElementById('modal-agent').textContent = p.agent;
+  document.getElementById('modal-agent').textContent =
+    p.count > 1 ? `${p.agent} +${p.count - 1} MORE` : p.agent;
   document.getElementById('modal-body').textContent  = p.prompt;
+  document.getElementById('modal-expires').textContent = p.expires
+    ? `DEFAULT "${p.default}" AT ${new Date(p.expires * 1000).toLocaleTimeString()}`
+    : '';
 
   const responsesEl = document.getElementById('modal-responses');
   const actionsEl   = document.getElementById('modal-actions');
@@ -1035,12 +1316,28 @@ function showConnection(nameA, nameB, durationMs = 2500) {
 }
 
 // Handle registration event (full agent data, geo may be null initially)
-es.addEventListener('registration', e => {
-  const d = JSON.parse(e.data);
+function onRegistration(d) {
   Object.assign(agents[d.agent] || (agents[d.agent] = {}), d);
   upsertCard(d.agent, agents[d.agent]);
   _upsertMapMarker(d);
   _drawAllConnections();
+}
+
+on('registration', e => {
+  onRegistration(JSON.parse(e.data));
+  eventN++; updateHud();
+});
+
+// A batch holds, per agent, an optional registration, the latest stats and
+// any logs received since the previous batch.
+on('batch', e => {
+  JSON.parse(e.data).forEach(d => {
+    if (!agents[d.agent]) agents[d.agent] = { last_seen: Date.now() / 1000 };
+    if (d.registration) onRegistration(d.registration);
+    if (d.stats) onStats(d.stats);
+    d.logs.forEach(appendLog);
+    if (!d.registration && !d.stats) upsertCard(d.agent, agents[d.agent]);
+  });
   eventN++; updateHud();
 });
 
@@ -1080,53 +1377,187 @@ switchTab = function (btn) {
 class Dashboard:
     """Thread-safe state store that drives the Flask SSE dashboard."""
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 8000) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str = '0.0.0.0',
+        port: int = 8000,
+        log_capacity: int = 20000,
+        replay_window: int = 2000,
+        stats_interval_ms: int = 1000,
+        *,
+        stale_after_s: float | None = None,
+        dead_after_s: float | None = None,
+        evict_after_s: float | None = None,
+    ) -> None:
         self.host = host
         self.port = port
         self._agents: dict[str, dict[str, Any]] = {}
-        self._logs: list[dict[str, Any]] = []
-        self._prompts: list[dict[str, Any]] = []
-        self._subscribers: list[queue.Queue[str]] = []
+        self._logs = LogStore(log_capacity)
+        self._prompts = PromptGroups()
+        self._prompt_policies = policies_from_env()
+        self._broadcaster = Broadcaster(replay_window=replay_window)
+        self._stats = StatsCoalescer(self._broadcaster, stats_interval_ms)
+        self._latest_stats: dict[str, dict[str, Any]] = {}
+        self._history = TimeSeriesStore()
         self._lock = threading.Lock()
+        # State version, bumped on every change, and the version at which
+        # each agent last changed. The epoch tells a page's version from one
+        # it got from an earlier run of this dashboard.
+        self._epoch = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._agent_versions: dict[str, int] = {}
+        # Each agent's JSON-encoded init entry with the agent version it was
+        # encoded at, and how many times an encoded entry was reused.
+        self._init_cache: dict[str, tuple[int, str]] = {}
+        self._init_cache_hits = 0
+        self._liveness = LivenessTracker.from_env(
+            stale_after_s=stale_after_s,
+            dead_after_s=dead_after_s,
+            evict_after_s=evict_after_s,
+        )
+        # Version at which each evicted agent was removed; pages older than
+        # the oldest forgotten tombstone get a full snapshot.
+        self._removed: dict[str, int] = {}
+        self._removed_floor = 0
+        self._liveness_thread: threading.Thread | None = None
         self._shutdown_callback: Any = None
-        self._prompt_events: dict[str, threading.Event] = {}
-        self._prompt_results: dict[str, str] = {}
-        self._app = self._build_app()
+        self._static = StaticBundle(_HTML, _ASSETS_DIR)
+        self._logos = LogoIndex(_ASSETS_DIR)
+        # Flask is only imported when the threaded server is started.
+        self._app: Flask | None = None
+        self._async_server: AsyncDashboardServer | None = None
 
     # ── public API ────────────────────────────────────────────────────────
 
     def start(self) -> None:
-        """Start Flask in a background daemon thread."""
+        """Start Flask in a background daemon thread.
+
+        Every open event stream occupies one server thread; see
+        :meth:`start_async` for a server that runs on an event loop instead.
+        """
         import logging
 
         log = logging.getLogger('werkzeug')
         log.setLevel(logging.ERROR)
+        self._app = self._build_app()
         t = threading.Thread(
             target=self._app.run,
             kwargs={'host': self.host, 'port': self.port, 'threaded': True},
             daemon=True,
         )
         t.start()
+        self._stats.start()
+        self._start_liveness()
+
+    async def start_async(self) -> None:
+        """Serve the dashboard from the running event loop.
+
+        Serves the same routes as :meth:`start` with aiohttp, so each open
+        event stream is a coroutine rather than a thread. Call
+        :meth:`stop_async` from the same loop to shut the server down.
+        """
+        from agentic_blueprint_catalog.observability.async_server import AsyncDashboardServer  # noqa: PLC0415
+
+        self._async_server = AsyncDashboardServer(self)
+        await self._async_server.start(self.host, self.port)
+        self._stats.start()
+        self._start_liveness()
+
+    async def stop_async(self) -> None:
+        """Stop the server started by :meth:`start_async`."""
+        if self._async_server is not None:
+            await self._async_server.stop()
+            self._async_server = None
 
     def agent_heartbeat(self, sender: str) -> None:
+        """Record that an agent was heard from."""
+        now = time.time()
         with self._lock:
-            if sender not in self._agents:
-                self._agents[sender] = {'last_seen': time.time()}
+            self._agents.setdefault(sender, {})['last_seen'] = now
+            revived = self._seen(sender, now)
+            self._touch(sender)
         self._broadcast('agent_connected', {'agent': sender})
+        self._broadcast_states([(sender, LIVE)] if revived else [])
 
-    def _find_facility_logo(self, org: str, fqdn: str) -> str | None:
-        """Return /assets/<filename> if any logo file keyword matches org.
-        We ignore fqdn for now.
+    def _seen(self, agent: str, now: float) -> bool:
+        # Caller holds self._lock. Returns True if the agent came back.
+        self._removed.pop(agent, None)
+        self._agents.setdefault(agent, {})['state'] = LIVE
+        return self._liveness.seen(agent, now)
+
+    def _broadcast_states(self, changes: list[tuple[str, str]]) -> None:
+        for agent, state in changes:
+            self._broadcast('agent_state', {'agent': agent, 'state': state})
+
+    def expire_agents(self, now: float | None = None) -> list[tuple[str, str]]:
+        """Mark silent agents stale or dead and forget long-dead ones.
+
+        Called periodically once the server is started. Every change is
+        broadcast as an ``agent_state`` event and returned as
+        ``(agent, state)``.
         """
-        if not _os.path.isdir(_ASSETS_DIR):
-            return None
-        for fname in sorted(_os.listdir(_ASSETS_DIR)):
-            fname_no_suffix = fname.split('.')[0]
-            if fname_no_suffix == org:
-                return f'/assets/{fname}'
-        return '/assets/logo-Academy-2025-200x200-dark-bg.png'
+        now = time.time() if now is None else now
+        with self._lock:
+            changes = self._liveness.expire(now)
+            for agent, state in changes:
+                if state == AGENT_EVICTED:
+                    self._evict(agent)
+                elif agent in self._agents:
+                    self._agents[agent]['state'] = state
+                    self._touch(agent)
+        self._broadcast_states(changes)
+        return changes
+
+    def _evict(self, agent: str) -> None:
+        # Caller holds self._lock.
+        self._agents.pop(agent, None)
+        self._agent_versions.pop(agent, None)
+        self._init_cache.pop(agent, None)
+        self._latest_stats.pop(agent, None)
+        self._history.remove(agent)
+        self._touch()
+        self._removed[agent] = self._version
+        if len(self._removed) > _MAX_TOMBSTONES:
+            oldest = next(iter(self._removed))
+            self._removed_floor = self._removed.pop(oldest)
+
+    def _run_liveness(self) -> None:
+        while True:
+            time.sleep(1)
+            try:
+                self.expire_agents()
+            except Exception:
+                logger.exception('Failed to expire agents')
+
+    def _start_liveness(self) -> None:
+        if self._liveness_thread is None:
+            self._liveness_thread = threading.Thread(
+                target=self._run_liveness,
+                name='agent-liveness',
+                daemon=True,
+            )
+            self._liveness_thread.start()
 
-    def register_agent(self, sender: str, reg: Registration) -> None:
+    def _find_facility_logo(self, org: str, fqdn: str) -> str | None:
+        """Return the versioned asset URL of the logo matching org or fqdn.
+
+        See :class:`LogoIndex` for the matching rules. If logo files were
+        added or changed since the last check, just those files are reloaded
+        into the static bundle so that they can be served.
+        """
+        previous = self._logos.names()
+        if self._logos.refresh():
+            self._static.reload({*previous, *self._logos.names()})
+        name = self._logos.resolve(org, fqdn)
+        return self._static.url(name) if name is not None else None
+
+    def _touch(self, agent: str | None = None) -> None:
+        # Caller holds self._lock.
+        self._version += 1
+        if agent is not None:
+            self._agent_versions[agent] = self._version
+
+    def _registration_entry(self, sender: str, reg: Registration, now: float | None = None) -> dict[str, Any]:
         raw = dict(reg.geolocation)  # copy so we can mutate
         # ipinfo.io returns location as "lat,lon" in a single 'loc' field.
         # Normalise to separate float keys so the JS can use d.geo.lat directly.
@@ -1142,7 +1573,7 @@ class Dashboard:
         # Include ipinfo hostname alongside fqdn so logo matching has more signal.
         search_fqdn = f'{reg.fqdn} {raw.get("hostname", "")}'
         logo_url = self._find_facility_logo(org, search_fqdn)
-        data: dict[str, Any] = {
+        return {
             'agent': sender,
             'agent_name': reg.agent_name,
             'agent_id': reg.agent_id,
@@ -1151,83 +1582,376 @@ class Dashboard:
             'os': reg.os,
             'arch': reg.arch,
             'python_version': reg.python_version,
-            'last_seen': time.time(),
+            'last_seen': time.time() if now is None else now,
             'geo': geo,
             'org': org,
             'logo_url': logo_url,
         }
-        logger.info(f'Registering {sender}: {data}')
-        with self._lock:
-            self._agents.setdefault(sender, {}).update(data)
-        self._broadcast('registration', data)
 
-    def push_log(self, sender: str, msg: Log) -> None:
-        logger.warning(f'Pushing log {msg.agent_name=}  {msg.agent_id=}')
-        entry: dict[str, Any] = {
-            'ts': time.strftime('%H:%M:%S'),
+    def _log_entry(self, msg: Log, now: float | None = None) -> dict[str, Any]:
+        now = time.time() if now is None else now
+        return {
+            'time': now,
+            'ts': time.strftime('%H:%M:%S', time.localtime(now)),
             'agent_name': msg.agent_name,
             'agent_id': str(msg.agent_id),
             'level': msg.level,
             'message': msg.message,
         }
-        with self._lock:
-            self._logs.append(entry)
-            if len(self._logs) > 2000:
-                self._logs = self._logs[-2000:]
-        self._broadcast('log', entry)
 
-    def push_stats(self, sender: str, stats: Stats) -> None:
-        data: dict[str, Any] = {
+    def _stats_entry(self, sender: str, stats: Stats, now: float | None = None) -> dict[str, Any]:
+        return {
             'agent': sender,
             'cpu_percent': stats.cpu_percent,
             'memory_rss_mb': round(stats.memory_rss_mb, 1),
             'memory_vms_mb': round(stats.memory_vms_mb, 1),
             'gpu_stats': stats.gpu,
-            'last_seen': time.time(),
+            'last_seen': time.time() if now is None else now,
+        }
+
+    @staticmethod
+    def _stats_metrics(entry: dict[str, Any]) -> dict[str, float]:
+        """Flatten a stats entry into the metrics kept in the history."""
+        metrics = {
+            'cpu_percent': float(entry['cpu_percent']),
+            'memory_rss_mb': float(entry['memory_rss_mb']),
+            'memory_vms_mb': float(entry['memory_vms_mb']),
         }
+        for i, gpu in enumerate(entry['gpu_stats']):
+            for key in ('utilization_percent', 'memory_used_mb'):
+                if key in gpu:
+                    metrics[f'gpu{gpu.get("index", i)}_{key}'] = float(gpu[key])
+        return metrics
+
+    def _record_stats(self, sender: str, entry: dict[str, Any]) -> None:
+        # Caller holds self._lock.
+        self._agents.setdefault(sender, {}).update(entry)
+        self._latest_stats[sender] = entry
+        self._history.record(sender, entry['last_seen'], self._stats_metrics(entry))
+        self._touch(sender)
+
+    def register_agent(self, sender: str, reg: Registration) -> None:
+        """Record an agent's registration details."""
+        data = self._registration_entry(sender, reg)
+        logger.info(f'Registering {sender}: {data}')
         with self._lock:
             self._agents.setdefault(sender, {}).update(data)
-        self._broadcast('stats', data)
+            revived = self._seen(sender, data['last_seen'])
+            self._touch(sender)
+        self._broadcast('registration', data)
+        self._broadcast_states([(sender, LIVE)] if revived else [])
 
-    def push_prompt(
+    def push_log(self, sender: str, msg: Log) -> None:
+        """Append a log record to the stream."""
+        logger.debug('Pushing log msg.agent_name=%r  msg.agent_id=%r', msg.agent_name, msg.agent_id)
+        entry = self._log_entry(msg)
+        with self._lock:
+            self._logs.append(entry)
+            self._touch()
+        self._broadcast('log', entry)
+
+    def push_stats(self, sender: str, stats: Stats) -> None:
+        """Update an agent's latest resource usage.
+
+        Stats are not broadcast immediately; they are coalesced and sent to
+        each subscriber at its stats cadence.
+        """
+        data = self._stats_entry(sender, stats)
+        with self._lock:
+            self._record_stats(sender, data)
+            revived = self._seen(sender, data['last_seen'])
+        self._stats.update(sender, data)
+        self._broadcast_states([(sender, LIVE)] if revived else [])
+
+    def push_batch(self, sender: str, messages: list[Message]) -> None:
+        """Apply a batch of messages from one sender.
+
+        State is updated under a single lock acquisition and the browser gets
+        one combined ``batch`` event. Only the newest ``Stats`` in the batch
+        is kept since each one supersedes the last.
+        """
+        self.push_batches({sender: messages})
+
+    def _batch_update(
         self,
         sender: str,
-        prompt: UserPrompt,
-    ) -> str:
-        agent_name = self._agents[sender]['agent_name']
-        entry: dict[str, Any] = {
-            'id': f'{time.time():.6f}',
-            'agent': agent_name,
-            'agent_id': sender,
-            'prompt': prompt.prompt,
-            'responses': prompt.responses,
+        messages: list[Message],
+        now: float | None = None,
+    ) -> dict[str, Any]:
+        registration: dict[str, Any] | None = None
+        stats: dict[str, Any] | None = None
+        logs: list[dict[str, Any]] = []
+        for message in messages:
+            if isinstance(message, Log):
+                logs.append(self._log_entry(message, now))
+            elif isinstance(message, Stats):
+                stats = self._stats_entry(sender, message, now)
+            elif isinstance(message, Registration):
+                registration = self._registration_entry(sender, message, now)
+            else:
+                logger.warning(
+                    f'Ignoring {type(message).__name__} in batch from {sender}',
+                )
+        return {
+            'agent': sender,
+            'registration': registration,
+            'stats': stats,
+            'logs': logs,
         }
-        event = threading.Event()
+
+    def push_batches(self, batches: dict[str, list[Message]]) -> None:
+        """Apply batches from many senders (e.g. from an aggregator) at once.
+
+        Every sender in ``batches`` counts as seen, so no separate heartbeat
+        is needed. Stats go through the coalescer rather than the ``batch``
+        event.
+        """
+        updates = [self._batch_update(sender, messages) for sender, messages in batches.items()]
         with self._lock:
-            self._prompts.append(entry)
-            self._prompt_events[entry['id']] = event
-        self._broadcast('prompt', entry)
-        return entry['id']
+            revived = self._apply_updates(updates, time.time())
+        self._broadcast_states([(agent, LIVE) for agent in revived])
+        for update in updates:
+            stats = update.pop('stats')
+            if stats is not None:
+                self._stats.update(update['agent'], stats)
+        self._broadcast('batch', updates)
+
+    def _apply_updates(self, updates: list[dict[str, Any]], now: float) -> list[str]:
+        # Caller holds self._lock. Returns the agents that came back.
+        revived = []
+        for update in updates:
+            agent = self._agents.setdefault(update['agent'], {})
+            agent['last_seen'] = now
+            if self._seen(update['agent'], now):
+                revived.append(update['agent'])
+            self._touch(update['agent'])
+            if update['registration'] is not None:
+                agent.update(update['registration'])
+            if update['stats'] is not None:
+                self._record_stats(update['agent'], update['stats'])
+            self._logs.extend(update['logs'])
+        return revived
+
+    def restore(self, records: Iterable[tuple[float, dict[str, list[Message]]]]) -> int:
+        """Rebuild state from journaled ``(receive time, batches)`` records.
+
+        Records are applied as if they had just been received at their
+        original time, but nothing is broadcast. Prompts are skipped since
+        nobody is waiting for their answers any more. Returns the number of
+        records applied.
+        """
+        count = 0
+        for now, batches in records:
+            updates = [
+                self._batch_update(
+                    sender,
+                    [m for m in messages if not isinstance(m, UserPrompt)],
+                    now,
+                )
+                for sender, messages in batches.items()
+            ]
+            with self._lock:
+                self._apply_updates(updates, now)
+            count += 1
+        return count
+
+    def query_logs(
+        self,
+        where: LogFilter | None = None,
+        limit: int = 200,
+        before: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return retained log entries, see :meth:`LogStore.query`."""
+        with self._lock:
+            return self._logs.query(where, limit, before)
 
-    def submit_response(self, prompt_id: str, response: str) -> None:
+    def search_logs(self, params: Mapping[str, str]) -> dict[str, Any]:
+        """Answer a ``/logs`` request.
+
+        Recognised parameters are ``agent``, ``level``, ``q`` (words the
+        message must contain), ``since`` and ``until`` (epoch seconds),
+        ``limit`` and ``cursor``. Results are the newest matches, oldest
+        first; ``cursor`` in the reply is passed back to get the page
+        before, and is None once there are no older entries.
+
+        Raises:
+            ValueError: If a numeric parameter is malformed.
+        """
+        where = LogFilter(
+            agent=params.get('agent') or None,
+            level=params.get('level') or None,
+            since=float(params['since']) if params.get('since') else None,
+            until=float(params['until']) if params.get('until') else None,
+            text=params.get('q') or None,
+        )
+        limit = min(max(int(params.get('limit') or 200), 1), _MAX_LOG_PAGE)
+        before = int(params['cursor']) if params.get('cursor') else None
+        logs = self.query_logs(where, limit, before)
+        return {
+            'logs': logs,
+            'cursor': logs[0]['seq'] if len(logs) == limit else None,
+        }
+
+    def stats_history(self, agent: str, params: Mapping[str, str]) -> dict[str, Any] | None:
+        """Answer a ``/stats/<agent>`` request.
+
+        Recognised parameters are ``since`` and ``until`` (epoch seconds;
+        the last hour by default), ``resolution`` (``raw``, ``1m`` or
+        ``10m``; by default the finest that covers ``since``) and
+        ``metrics`` (comma-separated). See :meth:`TimeSeriesStore.query`
+        for the reply. Returns None for an unknown agent.
+
+        Raises:
+            ValueError: If a parameter is malformed.
+        """
+        until = float(params['until']) if params.get('until') else time.time()
+        since = float(params['since']) if params.get('since') else until - 3600
+        metrics = params['metrics'].split(',') if params.get('metrics') else None
         with self._lock:
-            self._prompts = [p for p in self._prompts if p['id'] != prompt_id]
-            self._prompt_results[prompt_id] = response
-            event = self._prompt_events.pop(prompt_id, None)
-        if event is not None:
-            event.set()
+            return self._history.query(
+                agent,
+                since,
+                until,
+                params.get('resolution') or None,
+                metrics,
+            )
+
+    def _open_prompt(
+        self,
+        sender: str,
+        prompt: UserPrompt,
+    ) -> tuple[str, concurrent.futures.Future[str]]:
+        with self._lock:
+            # The sender may not be registered yet, or was evicted as dead.
+            agent_name = self._agents.get(sender, {}).get('agent_name', sender)
+            prompt_id, future, entry = self._prompts.add(agent_name, sender, prompt, time.time())
+            self._touch()
+        # A group the page already shows is sent again with its new count.
+        self._broadcast('prompt', entry)
+        return prompt_id, future
+
+    def _close_prompt(self, prompt_id: str, response: str | None, reason: str) -> bool:
+        """Withdraw a prompt group or a single prompt and complete the futures.
 
-    def wait_for_response(self, prompt_id: str) -> str:
+        Safe to call from any thread; only the first call for a prompt has
+        an effect. ``response`` None cancels the futures instead.
+        """
         with self._lock:
-            event = self._prompt_events.get(prompt_id)
-        if event is not None:
-            event.wait()
-        logger.warning('YADU:::: Event fired!!!!')
+            futures, entry, closed = self._prompts.close(prompt_id)
+            if entry is None:
+                return False
+            self._touch()
+        for future in futures:
+            if response is None:
+                future.cancel()
+            else:
+                future.set_result(response)
+        if closed:
+            self._broadcast('prompt_closed', {'id': entry['id'], 'reason': reason, 'response': response})
+        else:
+            self._broadcast('prompt', entry)
+        return True
+
+    def push_prompt(
+        self,
+        sender: str,
+        prompt: UserPrompt,
+    ) -> str:
+        """Show a prompt on the dashboard and return its ID.
+
+        See :meth:`ask` to also wait for the response.
+        """
+        return self._open_prompt(sender, prompt)[0]
+
+    def add_prompt_policy(self, policy: PromptPolicy) -> None:
+        """Answer prompts matching ``policy`` automatically.
+
+        Policies are tried in the order they were added, after those from
+        ``OBSERVABILITY_PROMPT_POLICIES``; the first match applies.
+        """
+        self._prompt_policies.append(policy)
+
+    def _apply_policy(self, sender: str, prompt: UserPrompt) -> tuple[UserPrompt, str | None]:
+        """Return the prompt to show, or the answer if a policy gives one now."""
+        policy = next((p for p in self._prompt_policies if p.matches(prompt)), None)
+        if policy is None:
+            return prompt, None
+        if policy.delay_s <= 0:
+            with self._lock:
+                agent_name = self._agents.get(sender, {}).get('agent_name', sender)
+            self.push_log(
+                sender,
+                Log(sender, agent_name, f'Auto-answered "{prompt.prompt}": {policy.response}'),
+            )
+            return prompt, policy.response
+        if prompt.timeout_s is None or policy.delay_s < prompt.timeout_s:
+            prompt = dataclasses.replace(prompt, timeout_s=policy.delay_s, default=policy.response)
+        return prompt, None
+
+    async def ask(self, sender: str, prompt: UserPrompt) -> str:
+        """Show a prompt and wait for the user's response.
+
+        Waiting costs no thread: the response completes a future from the
+        HTTP handler's thread. After ``prompt.timeout_s`` the prompt is
+        withdrawn and ``prompt.default`` is returned. If the caller is
+        cancelled, so is the prompt.
+
+        Identical prompts from different agents are shown once and answered
+        together. A matching :class:`PromptPolicy` answers the prompt
+        without the user, or after its delay.
+        """
+        prompt, answer = self._apply_policy(sender, prompt)
+        if answer is not None:
+            return answer
+        prompt_id, future = self._open_prompt(sender, prompt)
+        waiter = asyncio.wrap_future(future)
+        try:
+            # Shielded so that a timeout or cancellation does not cancel the
+            # future under a concurrent response; _close_prompt decides.
+            return await asyncio.wait_for(asyncio.shield(waiter), prompt.timeout_s)
+        except TimeoutError:
+            self._close_prompt(prompt_id, prompt.default, 'timeout')
+            return await waiter
+        except asyncio.CancelledError:
+            self._close_prompt(prompt_id, None, 'cancelled')
+            raise
+
+    def submit_response(self, prompt_id: str, response: str) -> None:
+        """Answer a prompt, or every prompt in a group given the group's ID.
+
+        Ignored if the prompt was already answered or withdrawn.
+        """
+        self._close_prompt(prompt_id, response, 'answered')
+
+    def cancel_prompt(self, prompt_id: str) -> bool:
+        """Withdraw a prompt without a response, cancelling its waiter.
+
+        Returns False if the prompt was no longer pending.
+        """
+        return self._close_prompt(prompt_id, None, 'cancelled')
+
+    def wait_for_response(self, prompt_id: str, timeout: float | None = None) -> str:
+        """Block until a prompt is answered; prefer :meth:`ask` from async code.
+
+        Returns an empty string if the prompt is unknown or already closed.
+
+        Raises:
+            TimeoutError: If no response arrived within ``timeout`` seconds.
+            concurrent.futures.CancelledError: If the prompt was cancelled.
+        """
         with self._lock:
-            return self._prompt_results.pop(prompt_id, '')
+            future = self._prompts.future(prompt_id)
+        if future is None:
+            return ''
+        return future.result(timeout)
 
     def dismiss_prompt(self, prompt_id: str) -> None:
-        self.submit_response(prompt_id, '')
+        """Close a prompt with an empty response."""
+        self._close_prompt(prompt_id, '', 'dismissed')
+
+    def has_subscribers(self) -> bool:
+        """Return whether any dashboard page is connected."""
+        return len(self._broadcaster) > 0
 
     def set_shutdown_callback(self, callback: Any) -> None:
         """Set a callable(agent_id: str) invoked when the power button is clicked."""
@@ -1235,65 +1959,178 @@ class Dashboard:
 
     # ── SSE internals ─────────────────────────────────────────────────────
 
-    def _subscribe(self) -> queue.Queue[str]:
-        q: queue.Queue[str] = queue.Queue(maxsize=250)
-        with self._lock:
-            self._subscribers.append(q)
-        return q
+    def _subscribe(
+        self,
+        last_event_id: int | None = None,
+        stats_interval_ms: int | None = None,
+    ) -> QueueSubscriber:
+        sub = QueueSubscriber(self._broadcaster.maxsize)
+        self._broadcaster.subscribe(last_event_id, stats_interval_ms, sub)
+        return sub
+
+    def _subscribe_async(
+        self,
+        last_event_id: int | None = None,
+        stats_interval_ms: int | None = None,
+    ) -> AsyncSubscriber:
+        sub = AsyncSubscriber(self._broadcaster.maxsize)
+        self._broadcaster.subscribe(last_event_id, stats_interval_ms, sub)
+        return sub
 
-    def _unsubscribe(self, q: queue.Queue[str]) -> None:
-        with self._lock:
-            try:
-                self._subscribers.remove(q)
-            except ValueError:
-                pass
+    def _unsubscribe(self, sub: Subscriber) -> None:
+        self._broadcaster.unsubscribe(sub)
 
     def _broadcast(self, event: str, data: Any) -> None:
-        msg = f'event: {event}\ndata: {json.dumps(data)}\n\n'
+        self._broadcaster.publish(event, data)
+
+    def _stream_preamble(self, sub: Subscriber, params: Mapping[str, str]) -> list[str]:
+        """Return the frames that open a new event stream.
+
+        A client resuming from an event still in the replay window only gets
+        the events it missed. Otherwise it gets an ``init`` event: a delta
+        if it says which state it has (``since=<epoch>:<version>`` and
+        ``log_seq``, see :meth:`_init_payload`), else a full snapshot.
+        """
+        frames = [f'retry: {_SSE_RETRY_MS}\n\n']
+        if sub.replay is None:
+            payload = self._init_payload(*self._resume_point(params))
+            frames.append(f'id: {sub.start_id}\nevent: init\ndata: {payload}\n\n')
+            return frames
+        frames.extend(sub.replay)
+        # Stats are coalesced rather than replayed; send current ones.
         with self._lock:
-            dead = []
-            for q in self._subscribers:
+            stats = list(self._latest_stats.values())
+        if stats:
+            frames.append(format_event('stats_batch', stats))
+        return frames
+
+    def _event_stream(self, sub: QueueSubscriber, params: Mapping[str, str]) -> Iterator[str]:
+        """Yield SSE frames for one client until it disconnects or is evicted."""
+        try:
+            yield from self._stream_preamble(sub, params)
+            while True:
                 try:
-                    q.put_nowait(msg)
-                except queue.Full:
-                    dead.append(q)
-            for q in dead:
-                self._subscribers.remove(q)
+                    frame = sub.get(timeout=25)
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+                    continue
+                yield frame
+                if frame is EVICTED:
+                    # Closing the stream makes the browser reconnect with
+                    # its Last-Event-ID and resume from the replay window.
+                    return
+        finally:
+            self._unsubscribe(sub)
 
     def _snapshot(self) -> dict[str, Any]:
         with self._lock:
-            return {
-                'agents': {k: dict(v) for k, v in self._agents.items()},
-                'logs': list(self._logs[-200:]),
-                'prompts': list(self._prompts),
-            }
+            return self._state(None, None)
+
+    def _resume_point(self, params: Mapping[str, str]) -> tuple[int | None, int | None]:
+        """Parse the ``since`` and ``log_seq`` a reconnecting page sent.
+
+        Returns ``(None, None)``, i.e. a full snapshot, unless both are
+        valid and the version comes from this dashboard.
+        """
+        epoch, _, version = params.get('since', '').partition(':')
+        try:
+            since, log_seq = int(version), int(params.get('log_seq', ''))
+        except ValueError:
+            return None, None
+        if epoch != self._epoch or not self._removed_floor <= since <= self._version:
+            return None, None
+        return since, log_seq
+
+    def _state(self, since: int | None, log_seq: int | None) -> dict[str, Any]:
+        # Caller holds self._lock.
+        state = self._state_without_agents(since, log_seq)
+        state['agents'] = {k: dict(self._agents[k]) for k in self._state_agents(since, log_seq)}
+        return state
+
+    def _state_agents(self, since: int | None, log_seq: int | None) -> list[str]:
+        # Caller holds self._lock. The agents a page at (since, log_seq) needs.
+        if since is None or log_seq is None:
+            return list(self._agents)
+        return [k for k, v in self._agent_versions.items() if v > since]
+
+    def _state_without_agents(self, since: int | None, log_seq: int | None) -> dict[str, Any]:
+        # Caller holds self._lock.
+        logs = self._logs.tail(200)
+        state: dict[str, Any] = {
+            'epoch': self._epoch,
+            'version': self._version,
+            'delta': since is not None,
+            'prompts': self._prompts.entries(),
+        }
+        if since is None or log_seq is None:
+            state['logs'] = logs
+            return state
+        state['removed'] = [k for k, v in self._removed.items() if v > since]
+        state['logs'] = [e for e in logs if e['seq'] > log_seq]
+        # Whether the logs continue on from the page's, or it missed some
+        # and should start its log view over.
+        state['logs_complete'] = state['logs'][0]['seq'] <= log_seq + 1 if state['logs'] else True
+        return state
+
+    def _init_payload(self, since: int | None, log_seq: int | None) -> str:
+        """Return the JSON ``init`` payload for a page at ``(since, log_seq)``.
+
+        Agent entries, the bulk of a snapshot, are encoded once per change
+        to the agent (see ``_agent_versions``) and cached. Heartbeats and
+        stats only change their own agent, so a burst of reconnecting pages
+        re-encodes just the agents that changed in between. Only those are
+        copied under the lock; the logs and prompts are small and copied
+        every time.
+        """
+        agents: dict[str, str] = {}
+        changed: dict[str, tuple[int, dict[str, Any]]] = {}
+        with self._lock:
+            state = self._state_without_agents(since, log_seq)
+            for agent in self._state_agents(since, log_seq):
+                version = self._agent_versions.get(agent, -1)
+                cached = self._init_cache.get(agent)
+                if cached is not None and cached[0] == version:
+                    agents[agent] = cached[1]
+                    self._init_cache_hits += 1
+                else:
+                    agents[agent] = ''  # keeps the agent's place in the order
+                    changed[agent] = (version, dict(self._agents[agent]))
+        encoded = {agent: (version, json.dumps(entry)) for agent, (version, entry) in changed.items()}
+        with self._lock:
+            for agent, (version, text) in encoded.items():
+                agents[agent] = text
+                cached = self._init_cache.get(agent)
+                if version >= 0 and agent in self._agents and (cached is None or cached[0] < version):
+                    self._init_cache[agent] = (version, text)
+        body = ', '.join(f'{json.dumps(agent)}: {text}' for agent, text in agents.items())
+        return f'{{"agents": {{{body}}}, {json.dumps(state)[1:]}'
 
     # ── Flask app ─────────────────────────────────────────────────────────
 
     def _build_app(self) -> Flask:
+        from flask import Flask  # noqa: PLC0415
+        from flask import request  # noqa: PLC0415
+        from flask import Response  # noqa: PLC0415
+
         app = Flask(__name__)
 
         @app.route('/')
         def index() -> Response:
-            return Response(_HTML, mimetype='text/html')
+            status, body, headers = self._static.respond_page(
+                request.headers.get('Accept-Encoding', ''),
+                request.headers.get('If-None-Match'),
+            )
+            return Response(body, status=status, headers=headers)
 
         @app.route('/events')
         def events() -> Response:
-            q = self._subscribe()
-
-            def stream() -> Any:
-                try:
-                    yield f'event: init\ndata: {json.dumps(self._snapshot())}\n\n'
-                    while True:
-                        try:
-                            yield q.get(timeout=25)
-                        except queue.Empty:
-                            yield ': heartbeat\n\n'
-                finally:
-                    self._unsubscribe(q)
-
+            last_event_id = parse_event_id(
+                request.headers.get('Last-Event-ID') or request.args.get('lastEventId'),
+            )
+            stats_ms = request.args.get('stats_ms', type=int)
+            sub = self._subscribe(last_event_id, stats_ms)
             return Response(
-                stream(),
+                self._event_stream(sub, request.args.to_dict()),
                 mimetype='text/event-stream',
                 headers={
                     'Cache-Control': 'no-cache',
@@ -1304,7 +2141,16 @@ class Dashboard:
 
         @app.route('/assets/<path:filename>')
         def serve_asset(filename: str) -> Response:
-            return send_from_directory(_ASSETS_DIR, filename)
+            result = self._static.respond_asset(
+                filename,
+                request.args.get('v'),
+                request.headers.get('Accept-Encoding', ''),
+                request.headers.get('If-None-Match'),
+            )
+            if result is None:
+                return Response('Not Found', status=404)
+            status, body, headers = result
+            return Response(body, status=status, headers=headers)
 
         @app.route('/dismiss/<path:prompt_id>', methods=['POST'])
         def dismiss(prompt_id: str) -> tuple[str, int]:
@@ -1323,4 +2169,27 @@ class Dashboard:
                 self._shutdown_callback(agent_id)
             return ('', 204)
 
+        self._add_history_routes(app)
         return app
+
+    def _add_history_routes(self, app: Flask) -> None:
+        """Add the JSON endpoints for retained history."""
+        from flask import jsonify  # noqa: PLC0415
+        from flask import request  # noqa: PLC0415
+
+        @app.route('/logs')
+        def logs() -> Response | tuple[str, int]:
+            try:
+                return jsonify(self.search_logs(request.args))
+            except ValueError as e:
+                return (str(e), 400)
+
+        @app.route('/stats/<path:agent>')
+        def stats(agent: str) -> Response | tuple[str, int]:
+            try:
+                history = self.stats_history(agent, request.args)
+            except ValueError as e:
+                return (str(e), 400)
+            if history is None:
+                return ('Unknown agent', 404)
+            return jsonify(history)
@@ -0,0 +1,251 @@
+"""Host facts reported by MonitoredAgents on registration.
+
+Resolving the fqdn and geolocation can take seconds (reverse DNS, an
+``ipinfo.io`` round trip), and every agent on a host used to repeat both.
+The facts are gathered concurrently, once per host, and cached on local disk
+with a TTL so that later agents on the same host start without touching the
+network.
+
+Environment variables:
+
+* ``OBSERVABILITY_GEOLOCATION``: JSON object, or path to a JSON file, used as
+  the geolocation instead of querying ``ipinfo.io``. Set it to ``off`` to skip
+  the lookup and report no location.
+* ``OBSERVABILITY_CACHE_DIR``: directory for the host cache
+  (default ``$XDG_CACHE_HOME/agentic_blueprint_catalog``).
+* ``OBSERVABILITY_HOST_INFO_TTL``: cache lifetime in seconds (default 86400).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import socket
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+GEOLOCATION_URL = 'https://ipinfo.io/json'
+DEFAULT_TTL_S = 24 * 60 * 60
+# Failed lookups are cached too (so offline nodes stop retrying on every
+# agent start), but for a shorter time in case the network comes back.
+FAILED_LOOKUP_TTL_S = 10 * 60
+
+
+@dataclass
+class HostInfo:
+    """Facts about the host an agent runs on."""
+
+    fqdn: str
+    cpu: str
+    gpu: str
+    geolocation: dict[str, Any] = field(default_factory=dict)
+    gathered_at: float = field(default_factory=time.time)
+    # 'ipinfo', 'override' or 'failed'.
+    geolocation_source: str = 'ipinfo'
+
+    @property
+    def os(self) -> str:
+        """Operating system name (not cached, it is cheap)."""
+        return platform.system()
+
+    @property
+    def arch(self) -> str:
+        """Machine architecture."""
+        return platform.machine()
+
+    @property
+    def python_version(self) -> str:
+        """Python version of the current interpreter."""
+        return platform.python_version()
+
+
+def default_cache_dir() -> str:
+    """Return the directory used to cache host facts."""
+    if os.environ.get('OBSERVABILITY_CACHE_DIR'):
+        return os.environ['OBSERVABILITY_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'),
+        '.cache',
+    )
+    return os.path.join(base, 'agentic_blueprint_catalog')
+
+
+def geolocation_override() -> dict[str, Any] | None:
+    """Return the locally configured geolocation, if any.
+
+    Returns ``{}`` when the lookup is disabled with ``off`` and ``None`` when
+    nothing is configured.
+    """
+    value = os.environ.get('OBSERVABILITY_GEOLOCATION', '').strip()
+    if not value:
+        return None
+    if value.lower() in ('off', 'none', '0', 'false'):
+        return {}
+    try:
+        if value.startswith('{'):
+            return dict(json.loads(value))
+        with open(value) as f:
+            return dict(json.load(f))
+    except (OSError, ValueError) as e:
+        logger.warning(f'Ignoring invalid OBSERVABILITY_GEOLOCATION: {e}')
+        return None
+
+
+def fetch_geolocation(timeout_s: float = 6) -> dict[str, Any]:
+    """Fetch geolocation for this machine from ipinfo.io (blocking)."""
+    import requests  # noqa: PLC0415
+
+    resp = requests.get(GEOLOCATION_URL, timeout=timeout_s)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def detect_gpu() -> str:
+    """Return a comma separated list of GPU model names, or ``'?'``."""
+    try:
+        import pynvml  # noqa: PLC0415
+
+        pynvml.nvmlInit()
+        names = []
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            name = pynvml.nvmlDeviceGetName(pynvml.nvmlDeviceGetHandleByIndex(i))
+            names.append(name.decode() if isinstance(name, bytes) else name)
+        return ', '.join(names) or '?'
+    except Exception:
+        return '?'
+
+
+def _cache_path(cache_dir: str) -> str:
+    # gethostname() is a local syscall, unlike getfqdn() which may hit DNS.
+    return os.path.join(cache_dir, f'host-info-{socket.gethostname()}.json')
+
+
+def _read_cache(path: str, ttl_s: float, override: bool) -> HostInfo | None:
+    try:
+        with open(path) as f:
+            info = HostInfo(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+    age = time.time() - info.gathered_at
+    if age > ttl_s or (info.geolocation_source == 'failed' and age > FAILED_LOOKUP_TTL_S):
+        return None
+    # An override says nothing about the real location; an agent started
+    # without one looks it up.
+    if info.geolocation_source == 'override' and not override:
+        return None
+    return info
+
+
+def _write_cache(path: str, info: HostInfo) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(asdict(info), f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f'Could not cache host info at {path}: {e}')
+
+
+@contextlib.contextmanager
+def _host_lock(path: str) -> Iterator[None]:
+    """Serialize cache refreshes between agents starting on the same host."""
+    try:
+        import fcntl  # noqa: PLC0415
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(f'{path}.lock', os.O_CREAT | os.O_RDWR, 0o644)
+    except (ImportError, OSError):
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # closing the descriptor releases the lock
+
+
+async def _gather(
+    geolocation: dict[str, Any] | None,
+    timeout_s: float,
+) -> HostInfo:
+    loop = asyncio.get_running_loop()
+
+    async def _geo() -> tuple[dict[str, Any], str]:
+        if geolocation is not None:
+            return geolocation, 'override'
+        try:
+            return await loop.run_in_executor(None, fetch_geolocation, timeout_s), 'ipinfo'
+        except Exception as e:
+            logger.info(f'Geolocation lookup failed: {e}')
+            return {}, 'failed'
+
+    fqdn, cpu, gpu, (geo, geo_source) = await asyncio.gather(
+        loop.run_in_executor(None, socket.getfqdn),
+        loop.run_in_executor(None, platform.processor),
+        loop.run_in_executor(None, detect_gpu),
+        _geo(),
+    )
+    return HostInfo(
+        fqdn=fqdn,
+        cpu=cpu,
+        gpu=gpu,
+        geolocation=geo,
+        geolocation_source=geo_source,
+    )
+
+
+async def gather_host_info(
+    geolocation: dict[str, Any] | None = None,
+    cache_dir: str | None = None,
+    ttl_s: float | None = None,
+    timeout_s: float = 6,
+) -> HostInfo:
+    """Return facts about this host, from the on-disk cache when fresh.
+
+    Args:
+        geolocation: Geolocation to report instead of querying ``ipinfo.io``.
+            Defaults to the ``OBSERVABILITY_GEOLOCATION`` override.
+        cache_dir: Directory for the per-host cache file.
+        ttl_s: Cache lifetime in seconds; ``0`` disables the cache.
+        timeout_s: Timeout for the geolocation request.
+    """
+    if geolocation is None:
+        geolocation = geolocation_override()
+    if ttl_s is None:
+        ttl_s = float(os.environ.get('OBSERVABILITY_HOST_INFO_TTL', DEFAULT_TTL_S))
+    if ttl_s <= 0:
+        return await _gather(geolocation, timeout_s)
+
+    path = _cache_path(cache_dir or default_cache_dir())
+    loop = asyncio.get_running_loop()
+    cached = await loop.run_in_executor(None, _read_cache, path, ttl_s, geolocation is not None)
+    if cached is not None:
+        if geolocation is not None:
+            cached.geolocation = geolocation
+        return cached
+
+    lock = _host_lock(path)
+    await loop.run_in_executor(None, lock.__enter__)
+    try:
+        # Another agent may have refreshed the cache while we waited.
+        cached = _read_cache(path, ttl_s, geolocation is not None)
+        info = cached or await _gather(geolocation, timeout_s)
+        if cached is None:
+            await loop.run_in_executor(None, _write_cache, path, info)
+    finally:
+        lock.__exit__(None, None, None)
+    if geolocation is not None:
+        info.geolocation = geolocation
+    return info
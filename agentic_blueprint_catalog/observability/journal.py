@@ -0,0 +1,228 @@
+"""Append-only on-disk journal of the messages received by the dashboard."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import pickle
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from agentic_blueprint_catalog.observability.message import Message
+
+logger = logging.getLogger(__name__)
+
+# Record header: payload length, CRC32 of the payload, receive time.
+_HEADER = struct.Struct('<IId')
+_SUFFIX = '.journal'
+
+Batches = dict[str, list[Message]]
+
+
+def _segment_name(start: float) -> str:
+    return f'{int(start * 1000):015d}{_SUFFIX}'
+
+
+def _read_segment(
+    path: str,
+    since: float | None,
+    until: float | None,
+) -> Iterator[tuple[float, Batches]]:
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            length, crc, ts = _HEADER.unpack(header)
+            if until is not None and ts > until:
+                return
+            if since is not None and ts < since:
+                # The header carries the time, so older records are
+                # skipped without reading their payload.
+                f.seek(length, os.SEEK_CUR)
+                continue
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                # A torn write at the end of a segment, e.g. after a crash.
+                logger.warning(f'Stopping at corrupt record in {path}')
+                return
+            yield ts, pickle.loads(payload)
+
+
+class Journal:
+    """Segment-rotated, append-only journal of dashboard messages.
+
+    Each record holds the batches received in one call (``{sender:
+    [messages]}``) and the time they arrived. Records are written by a
+    background thread so that appending never waits on the disk; the file
+    is fsynced at most once per ``fsync_interval_s`` however many records
+    arrive in between.
+
+    Segments are named after the time of their first record, which makes
+    them a coarse time index: :meth:`read` opens only the segments that
+    overlap the requested range, and skips older records within a segment
+    by their header alone.
+
+    Args:
+        directory: Directory holding the segment files.
+        segment_bytes: Start a new segment once the current one reaches
+            this size.
+        segment_s: Start a new segment once the current one is this old.
+        fsync_interval_s: Longest time written records may stay unsynced.
+        retention_s: Delete segments whose records are all older than this;
+            None keeps everything.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        segment_s: float = 3600.0,
+        fsync_interval_s: float = 1.0,
+        retention_s: float | None = None,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_s = segment_s
+        self.fsync_interval_s = fsync_interval_s
+        self.retention_s = retention_s
+        os.makedirs(directory, exist_ok=True)
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._file: BinaryIO | None = None
+        self._segment_start = 0.0
+
+    def segments(self) -> list[tuple[float, str]]:
+        """Return ``(start time, path)`` of every segment, oldest first."""
+        found = []
+        for fname in os.listdir(self.directory):
+            if fname.endswith(_SUFFIX):
+                try:
+                    start = int(fname[: -len(_SUFFIX)]) / 1000
+                except ValueError:
+                    continue
+                found.append((start, os.path.join(self.directory, fname)))
+        return sorted(found)
+
+    def read(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> Iterator[tuple[float, Batches]]:
+        """Yield ``(receive time, batches)`` records in order.
+
+        Records still queued for writing are not included.
+
+        Args:
+            since: Skip records received before this time.
+            until: Stop at records received after this time.
+        """
+        segments = self.segments()
+        for i, (start, path) in enumerate(segments):
+            if until is not None and start > until:
+                break
+            next_start = segments[i + 1][0] if i + 1 < len(segments) else None
+            if since is not None and next_start is not None and next_start < since:
+                continue
+            yield from _read_segment(path, since, until)
+
+    # ── writing ───────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the background writer (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name='journal-writer',
+                daemon=True,
+            )
+            self._thread.start()
+
+    def append(self, batches: Batches, ts: float | None = None) -> None:
+        """Queue a record for writing; never blocks on the disk."""
+        ts = time.time() if ts is None else ts
+        payload = pickle.dumps(batches, protocol=pickle.HIGHEST_PROTOCOL)
+        self._queue.put(_HEADER.pack(len(payload), zlib.crc32(payload), ts) + payload)
+
+    def close(self) -> None:
+        """Write out queued records, sync and stop the writer."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _open_segment(self, start: float) -> BinaryIO:
+        while os.path.exists(os.path.join(self.directory, _segment_name(start))):
+            start += 0.001
+        self._segment_start = start
+        self._file = open(os.path.join(self.directory, _segment_name(start)), 'ab')  # noqa: SIM115
+        self._expire()
+        return self._file
+
+    def _expire(self) -> None:
+        if self.retention_s is None:
+            return
+        cutoff = time.time() - self.retention_s
+        segments = self.segments()
+        # A segment can go once the segment after it started before the
+        # cutoff; the newest segment is never removed.
+        for (_, path), (next_start, _) in itertools.pairwise(segments):
+            if next_start > cutoff:
+                break
+            os.remove(path)
+            logger.info(f'Removed expired journal segment {path}')
+
+    def _sync(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _run(self) -> None:
+        dirty = False
+        last_sync = time.monotonic()
+        while True:
+            timeout = max(0.0, last_sync + self.fsync_interval_s - time.monotonic()) if dirty else None
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = b''
+            records = [record]
+            while records[-1] is not None:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = records[-1] is None
+            data = b''.join(r for r in records if r)
+            try:
+                if data:
+                    self._write(data)
+                    dirty = True
+                if dirty and (closing or time.monotonic() - last_sync >= self.fsync_interval_s):
+                    self._sync()
+                    dirty = False
+                    last_sync = time.monotonic()
+            except OSError:
+                logger.exception('Failed to write journal')
+            if closing:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, data: bytes) -> None:
+        f = self._file
+        if f is None or f.tell() >= self.segment_bytes or time.time() - self._segment_start >= self.segment_s:
+            if f is not None:
+                self._sync()
+                f.close()
+            # Named after the receive time of the first record rather than
+            # the current time, which can be later for a queued record.
+            f = self._open_segment(_HEADER.unpack_from(data)[2])
+        f.write(data)
@@ -0,0 +1,141 @@
+"""Timeout-based liveness states for the agents reporting to the dashboard."""
+
+from __future__ import annotations
+
+import heapq
+import os
+
+LIVE = 'live'
+STALE = 'stale'
+DEAD = 'dead'
+EVICTED = 'evicted'
+
+# Agents report stats every 30 s by default, so stale means three missed
+# reports.
+DEFAULT_STALE_AFTER_S = 90.0
+DEFAULT_DEAD_AFTER_S = 300.0
+DEFAULT_EVICT_AFTER_S = 3600.0
+
+
+class LivenessTracker:
+    """Tracks when each agent was last heard from and expires silent ones.
+
+    An agent is ``live`` while it keeps reporting, ``stale`` after
+    ``stale_after_s`` of silence, ``dead`` after ``dead_after_s`` and
+    ``evicted`` (forgotten) after ``evict_after_s``. Hearing from a stale or
+    dead agent makes it live again.
+
+    Deadlines are kept in a min-heap with one entry per agent. A heartbeat
+    only updates the agent's last-seen time; when the entry comes due it is
+    checked against that time and either moved on to the next state or
+    pushed back to the new deadline. Heartbeats are therefore O(1) and
+    :meth:`expire` only touches agents that are actually due.
+
+    Not thread-safe; the Dashboard guards it with its own lock.
+
+    Args:
+        stale_after_s: Silence before an agent is marked stale.
+        dead_after_s: Silence before an agent is marked dead.
+        evict_after_s: Silence before an agent is evicted.
+    """
+
+    def __init__(
+        self,
+        stale_after_s: float = DEFAULT_STALE_AFTER_S,
+        dead_after_s: float = DEFAULT_DEAD_AFTER_S,
+        evict_after_s: float = DEFAULT_EVICT_AFTER_S,
+    ) -> None:
+        if not 0 < stale_after_s <= dead_after_s <= evict_after_s:
+            raise ValueError('Expected 0 < stale_after_s <= dead_after_s <= evict_after_s')
+        self._thresholds = ((stale_after_s, STALE), (dead_after_s, DEAD), (evict_after_s, EVICTED))
+        self._last_seen: dict[str, float] = {}
+        self._states: dict[str, str] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._scheduled: set[str] = set()
+
+    @classmethod
+    def from_env(
+        cls,
+        *,
+        stale_after_s: float | None = None,
+        dead_after_s: float | None = None,
+        evict_after_s: float | None = None,
+    ) -> LivenessTracker:
+        """Create a tracker with timeouts from the arguments or the environment.
+
+        A timeout that is not given is read from ``OBSERVABILITY_STALE_AFTER``,
+        ``OBSERVABILITY_DEAD_AFTER`` or ``OBSERVABILITY_EVICT_AFTER``
+        (seconds), and otherwise takes the default.
+        """
+        return cls(
+            stale_after_s=stale_after_s if stale_after_s is not None else float(os.environ.get('OBSERVABILITY_STALE_AFTER', DEFAULT_STALE_AFTER_S)),
+            dead_after_s=dead_after_s if dead_after_s is not None else float(os.environ.get('OBSERVABILITY_DEAD_AFTER', DEFAULT_DEAD_AFTER_S)),
+            evict_after_s=evict_after_s if evict_after_s is not None else float(os.environ.get('OBSERVABILITY_EVICT_AFTER', DEFAULT_EVICT_AFTER_S)),
+        )
+
+    def __contains__(self, agent: str) -> bool:
+        return agent in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def state(self, agent: str) -> str | None:
+        """Return an agent's state, or None if it is not tracked."""
+        return self._states.get(agent)
+
+    def next_deadline(self) -> float | None:
+        """Return the earliest time :meth:`expire` may have work to do."""
+        return self._heap[0][0] if self._heap else None
+
+    def _state_for(self, silence: float) -> tuple[str, float | None]:
+        """Return the state for a silence and when (as silence) it next changes."""
+        state = LIVE
+        for after, next_state in self._thresholds:
+            if silence < after:
+                return state, after
+            state = next_state
+        return state, None
+
+    def seen(self, agent: str, now: float) -> bool:
+        """Record that an agent was heard from at ``now``.
+
+        Returns True if the agent was stale or dead and is live again.
+        """
+        if now < self._last_seen.get(agent, now):
+            return False  # an older record, e.g. while replaying history
+        self._last_seen[agent] = now
+        revived = self._states.get(agent, LIVE) != LIVE
+        self._states[agent] = LIVE
+        if agent not in self._scheduled:
+            self._scheduled.add(agent)
+            heapq.heappush(self._heap, (now + self._thresholds[0][0], agent))
+        return revived
+
+    def remove(self, agent: str) -> None:
+        """Stop tracking an agent; its heap entry is dropped when it comes due."""
+        self._last_seen.pop(agent, None)
+        self._states.pop(agent, None)
+
+    def expire(self, now: float) -> list[tuple[str, str]]:
+        """Advance agents whose deadlines have passed.
+
+        Returns ``(agent, new state)`` for every agent whose state changed,
+        in deadline order. Evicted agents are no longer tracked.
+        """
+        changes: list[tuple[str, str]] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, agent = heapq.heappop(self._heap)
+            last_seen = self._last_seen.get(agent)
+            if last_seen is None:
+                self._scheduled.discard(agent)
+                continue
+            state, next_change = self._state_for(now - last_seen)
+            if state != self._states[agent]:
+                changes.append((agent, state))
+            if next_change is None:
+                self._scheduled.discard(agent)
+                self.remove(agent)
+                continue
+            self._states[agent] = state
+            heapq.heappush(self._heap, (last_seen + next_change, agent))
+        return changes
@@ -0,0 +1,201 @@
+"""Matching of agent hosts to the facility logos in the assets directory.
+
+Logo files are named after the organisation, optionally prefixed with its
+autonomous system number as reported by ipinfo.io, e.g.
+``AS160 The University of Chicago.svg``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+_IMAGE_SUFFIXES = ('.png', '.svg', '.jpg', '.jpeg', '.gif', '.webp')
+_ASN = re.compile(r'\bAS(\d+)\b', re.IGNORECASE)
+_SPLIT = re.compile(r'[^a-z0-9]+')
+# Words too common in facility names to identify one.
+_GENERIC = frozenset(
+    {
+        'a',
+        'and',
+        'at',
+        'center',
+        'centre',
+        'college',
+        'for',
+        'inc',
+        'institute',
+        'lab',
+        'laboratory',
+        'llc',
+        'national',
+        'of',
+        'the',
+        'university',
+    },
+)
+# Shorter tokens and acronyms match too many unrelated hosts.
+_MIN_AFFIX = 4
+_MIN_ACRONYM = 4
+_MIN_TOKEN = 3
+_MAX_MEMO = 10000
+# Fraction of a logo's distinctive words that must match.
+_MIN_SCORE = 0.5
+
+
+def _words(text: str) -> list[str]:
+    return [w for w in _SPLIT.split(text.lower()) if w]
+
+
+@dataclass(frozen=True)
+class _Logo:
+    name: str
+    asn: str | None
+    label: tuple[str, ...]
+    tokens: frozenset[str]
+    acronyms: frozenset[str]
+
+    @classmethod
+    def parse(cls, name: str) -> _Logo:
+        stem = os.path.splitext(name)[0]
+        asn = _ASN.search(stem)
+        words = _words(_ASN.sub(' ', stem))
+        # e.g. National Energy Research Scientific Computing (Center) -> nersc(c)
+        initials = ''.join(w[0] for w in words if w not in {'a', 'and', 'at', 'for', 'of', 'the'})
+        acronyms = {a for a in (initials, initials[:-1]) if len(a) >= _MIN_ACRONYM}
+        return cls(
+            name=name,
+            asn=asn.group(1) if asn else None,
+            label=tuple(words),
+            tokens=frozenset(w for w in words if w not in _GENERIC and len(w) >= _MIN_TOKEN),
+            acronyms=frozenset(acronyms),
+        )
+
+    def score_org(self, words: list[str]) -> float:
+        """Fraction of this logo's distinctive words in an organisation name."""
+        if tuple(words) == self.label:
+            return 1.0
+        if not self.tokens:
+            return 0.0
+        return len(self.tokens.intersection(words)) / len(self.tokens)
+
+    def score_host(self, labels: list[str]) -> float:
+        """Fraction of this logo's distinctive words found in host name labels.
+
+        A word matches a label equal to it or, if long enough, one it starts
+        or ends (``chicago`` in ``uchicago``, ``ames`` in ``ameslab``). A
+        label equal to the logo's acronym is a full match.
+        """
+        if self.acronyms.intersection(labels):
+            return 1.0
+        if not self.tokens:
+            return 0.0
+        found = sum(1 for token in self.tokens if any(label == token or (len(token) >= _MIN_AFFIX and (label.startswith(token) or label.endswith(token))) for label in labels))
+        return found / len(self.tokens)
+
+
+class LogoIndex:
+    """Resolves an agent's organisation and host name to a logo file.
+
+    The directory is indexed once, and checked for changes at most every
+    ``check_interval_s`` (see :meth:`refresh`). Lookups are memoized per
+    ``(org, fqdn)``, so a burst of registrations from the same site does no
+    filesystem access and no matching.
+
+    Matching, in order of preference:
+
+    1. The AS number in ``org`` (as reported by ipinfo.io).
+    2. The words of the organisation name.
+    3. The labels of ``fqdn`` (which may hold several space-separated host
+       names), against the logo's words and acronym.
+
+    A word-based match needs at least half of the logo's distinctive words.
+
+    Args:
+        directory: Directory holding the logo files.
+        default: File used when nothing matches (None for no logo).
+        check_interval_s: Minimum time between checks for changed files.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        default: str | None = 'logo-Academy-2025-200x200-dark-bg.png',
+        check_interval_s: float = 5.0,
+    ) -> None:
+        self.directory = directory
+        self.default = default
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._logos: list[_Logo] = []
+        self._by_asn: dict[str, _Logo] = {}
+        self._memo: dict[tuple[str, str], str | None] = {}
+        self._signature: tuple[tuple[str, int, int], ...] | None = None
+        self._checked = 0.0
+        self.refresh(force=True)
+
+    def _scan(self) -> tuple[tuple[str, int, int], ...]:
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return ()
+        return tuple(sorted((e.name, e.stat().st_mtime_ns, e.stat().st_size) for e in entries if e.is_file() and e.name.lower().endswith(_IMAGE_SUFFIXES)))
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-index the directory if its logo files changed.
+
+        Checks at most once per ``check_interval_s`` unless ``force``.
+        Returns True if the index was rebuilt.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked < self.check_interval_s:
+            return False
+        signature = self._scan()
+        with self._lock:
+            self._checked = now
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            self._logos = [_Logo.parse(name) for name, _, _ in signature if name != self.default]
+            self._by_asn = {logo.asn: logo for logo in self._logos if logo.asn}
+            self._memo = {}
+        return True
+
+    def names(self) -> list[str]:
+        """Return the indexed logo file names."""
+        return [name for name, _, _ in self._signature or ()]
+
+    def resolve(self, org: str, fqdn: str) -> str | None:
+        """Return the logo file name for an organisation and host name."""
+        key = (org, fqdn)
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+            logos, by_asn = self._logos, self._by_asn
+        name = self._match(logos, by_asn, org, fqdn)
+        if name is None and self._signature:
+            name = self.default
+        with self._lock:
+            if len(self._memo) >= _MAX_MEMO:
+                self._memo = {}
+            self._memo[key] = name
+        return name
+
+    @staticmethod
+    def _match(logos: list[_Logo], by_asn: dict[str, _Logo], org: str, fqdn: str) -> str | None:
+        asn = _ASN.search(org)
+        if asn and asn.group(1) in by_asn:
+            return by_asn[asn.group(1)].name
+        for words, score in (
+            (_words(_ASN.sub(' ', org)), _Logo.score_org),
+            (_words(fqdn), _Logo.score_host),
+        ):
+            if not words:
+                continue
+            best = max(logos, key=lambda logo: (score(logo, words), len(logo.tokens)), default=None)
+            if best is not None and score(best, words) >= _MIN_SCORE:
+                return best.name
+        return None
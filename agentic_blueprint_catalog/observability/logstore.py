@@ -0,0 +1,204 @@
+"""Bounded in-memory log retention for the Dashboard."""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> frozenset[str]:
+    """Return the distinct lowercase words of ``text``."""
+    return frozenset(_WORD.findall(text.lower()))
+
+
+@dataclass(frozen=True)
+class LogFilter:
+    """Criteria for :meth:`LogStore.query`; unset fields match everything.
+
+    Attributes:
+        agent: Only entries with this ``agent_id``.
+        level: Only entries with this level.
+        since: Only entries with ``time`` at or after this.
+        until: Only entries with ``time`` before this.
+        text: Only entries whose message contains every word of this
+            (case-insensitive, whole words).
+    """
+
+    agent: str | None = None
+    level: str | None = None
+    since: float | None = None
+    until: float | None = None
+    text: str | None = None
+
+
+class LogStore:
+    """Fixed-capacity ring buffer of log entries with secondary indexes.
+
+    Every appended entry gets a monotonically increasing ``seq`` number.
+    Entries are indexed by agent, by level and by each word of their
+    message (an inverted index for text search). Appends cost O(words):
+    once full, the oldest entry is overwritten and removed from the
+    indexes. Because sequence numbers only grow, the evicted entry is
+    always at the head of each index it appears in, so eviction is a
+    ``popleft``.
+
+    Entries are expected to carry a ``time`` (epoch seconds) that does not
+    decrease with ``seq``, which lets time ranges be found by bisection.
+
+    Not thread-safe; the Dashboard guards it with its own lock.
+
+    Args:
+        capacity: Maximum number of entries retained.
+    """
+
+    def __init__(self, capacity: int = 2000) -> None:
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self._ring: list[dict[str, Any] | None] = [None] * capacity
+        self._words: list[frozenset[str]] = [frozenset()] * capacity
+        self._next_seq = 0
+        self._by_agent: dict[str, deque[int]] = {}
+        self._by_level: dict[str, deque[int]] = {}
+        self._by_word: dict[str, deque[int]] = {}
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained entry."""
+        return max(0, self._next_seq - self.capacity)
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next appended entry will get."""
+        return self._next_seq
+
+    @staticmethod
+    def _unindex(index: dict[str, deque[int]], key: str) -> None:
+        seqs = index[key]
+        seqs.popleft()
+        if not seqs:
+            del index[key]
+
+    def append(self, entry: dict[str, Any]) -> int:
+        """Store an entry (adding a ``seq`` key to it) and return its seq."""
+        seq = self._next_seq
+        slot = seq % self.capacity
+        old = self._ring[slot]
+        if old is not None:
+            self._unindex(self._by_agent, old['agent_id'])
+            self._unindex(self._by_level, old['level'])
+            for word in self._words[slot]:
+                self._unindex(self._by_word, word)
+        entry['seq'] = seq
+        words = tokenize(entry['message'])
+        self._ring[slot] = entry
+        self._words[slot] = words
+        self._by_agent.setdefault(entry['agent_id'], deque()).append(seq)
+        self._by_level.setdefault(entry['level'], deque()).append(seq)
+        for word in words:
+            self._by_word.setdefault(word, deque()).append(seq)
+        self._next_seq = seq + 1
+        return seq
+
+    def extend(self, entries: Iterable[dict[str, Any]]) -> None:
+        """Append several entries."""
+        for entry in entries:
+            self.append(entry)
+
+    def get(self, seq: int) -> dict[str, Any] | None:
+        """Return the entry with ``seq`` if it is still retained."""
+        if not self.first_seq <= seq < self._next_seq:
+            return None
+        return self._ring[seq % self.capacity]
+
+    def tail(self, n: int) -> list[dict[str, Any]]:
+        """Return up to ``n`` newest entries, oldest first."""
+        start = max(self.first_seq, self._next_seq - n)
+        return [self._ring[seq % self.capacity] for seq in range(start, self._next_seq)]  # type: ignore[misc]
+
+    def agents(self) -> list[str]:
+        """Return the agent IDs that have retained entries."""
+        return list(self._by_agent)
+
+    def levels(self) -> list[str]:
+        """Return the levels that have retained entries."""
+        return list(self._by_level)
+
+    def _seq_at(self, t: float) -> int:
+        """Return the first retained seq whose entry time is at least ``t``."""
+        lo, hi = self.first_seq, self._next_seq
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ring[mid % self.capacity]['time'] < t:  # type: ignore[index]
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _candidates(
+        self,
+        agent: str | None,
+        level: str | None,
+        words: frozenset[str],
+        stop: int,
+    ) -> Iterator[int]:
+        """Yield candidate seqs below ``stop`` newest first, using the smallest index."""
+        indexes = []
+        if agent is not None:
+            indexes.append(self._by_agent.get(agent, deque()))
+        if level is not None:
+            indexes.append(self._by_level.get(level, deque()))
+        indexes.extend(self._by_word.get(word, deque()) for word in words)
+        if not indexes:
+            return iter(range(stop - 1, self.first_seq - 1, -1))
+        return (seq for seq in reversed(min(indexes, key=len)) if seq < stop)
+
+    def query(
+        self,
+        where: LogFilter | None = None,
+        limit: int = 200,
+        before: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` newest matching entries, oldest first.
+
+        Args:
+            where: Which entries to return; None returns all of them.
+            limit: Maximum number of entries returned.
+            before: Only entries with ``seq`` below this value, for paging
+                backwards through history.
+        """
+        where = where or LogFilter()
+        stop = self._next_seq if before is None else min(before, self._next_seq)
+        if where.until is not None:
+            stop = min(stop, self._seq_at(where.until))
+        start = self.first_seq if where.since is None else self._seq_at(where.since)
+        words = tokenize(where.text) if where.text else frozenset()
+        out: list[dict[str, Any]] = []
+        for seq in self._candidates(where.agent, where.level, words, stop):
+            if seq < start:
+                break
+            slot = seq % self.capacity
+            entry = self._ring[slot]
+            if entry is None:
+                # Slots of retained seqs are always filled.
+                continue
+            if where.agent is not None and entry['agent_id'] != where.agent:
+                continue
+            if where.level is not None and entry['level'] != where.level:
+                continue
+            if not words <= self._words[slot]:
+                continue
+            out.append(entry)
+            if len(out) >= limit:
+                break
+        out.reverse()
+        return out
@@ -10,7 +10,7 @@ from dataclasses import field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Registration:
     """Agent info to be presented to the UserAgent on registration."""
 
@@ -25,7 +25,7 @@ class Registration:
     geolocation: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class Log:
     """Arbitrary log message."""
 
@@ -35,7 +35,7 @@ class Log:
     level: str = 'INFO'
 
 
-@dataclass
+@dataclass(slots=True)
 class Stats:
     """Agent stats."""
 
@@ -46,13 +46,19 @@ class Stats:
     gpu: list[dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserPrompt:
-    """Prompt and response choices to be presented to the user."""
+    """Prompt and response choices to be presented to the user.
+
+    If ``timeout_s`` is set and the user has not answered in time, the
+    prompt is withdrawn and ``default`` is returned as the response.
+    """
 
     agent_id: str
     prompt: str
     responses: list[str]
+    timeout_s: float | None = None
+    default: str = ''
 
 
 Message = Registration | Log | Stats | UserPrompt
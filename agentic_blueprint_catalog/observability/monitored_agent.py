@@ -5,41 +5,77 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-import platform
 import queue as _queue
-import socket
 from typing import Any
+from typing import TYPE_CHECKING
 
 import academy.exception
-import psutil
-import requests
 from academy.agent import action
 from academy.agent import Agent
 from academy.handle import Handle
 
+from agentic_blueprint_catalog.observability.codec import Encoder
+from agentic_blueprint_catalog.observability.host_info import fetch_geolocation
+from agentic_blueprint_catalog.observability.host_info import gather_host_info
 from agentic_blueprint_catalog.observability.message import Log
 from agentic_blueprint_catalog.observability.message import Message
 from agentic_blueprint_catalog.observability.message import Registration
 from agentic_blueprint_catalog.observability.message import Stats
 from agentic_blueprint_catalog.observability.message import UserPrompt
-from agentic_blueprint_catalog.observability.user_agent import UserAgent
+
+if TYPE_CHECKING:
+    from agentic_blueprint_catalog.observability.user_agent import UserAgent
+
+logger = logging.getLogger(__name__)
+
+FORWARD_ALWAYS = 'always'
+FORWARD_ATTACHED = 'attached'
+FORWARD_NEVER = 'never'
 
 
 class _UserAgentLogHandler(logging.Handler):
-    """Puts formatted log records onto a SimpleQueue; no asyncio touched here."""
+    """Puts log records onto a SimpleQueue; no asyncio touched here.
 
-    def __init__(self, buf: _queue.SimpleQueue[tuple[str, str]]) -> None:
+    Records are formatted by the drain task when they are sent, not here.
+    """
+
+    def __init__(self, buf: _queue.SimpleQueue[logging.LogRecord]) -> None:
         super().__init__()
         self._buf = buf
 
     def emit(self, record: logging.LogRecord) -> None:
         """Push log records in a queue for async processing."""
-        # Skip academy and asyncio internals to prevent feedback loops.
-        if record.name.startswith(('academy', 'asyncio')):
+        # Skip academy and asyncio internals, and the observability agents
+        # themselves (which may share the process), to prevent feedback
+        # loops.
+        if record.name.startswith(('academy', 'asyncio', 'agentic_blueprint_catalog.observability')):
             return
-        self._buf.put(
-            (record.levelname, self.format(record)),
-        )  # SimpleQueue.put() never blocks
+        self._buf.put(record)  # SimpleQueue.put() never blocks
+
+
+# Handlers currently installed on the root logger, and the root level from
+# before the first was installed; restored once none are left so that
+# disabled log calls are cheap again.
+_installed: set[_UserAgentLogHandler] = set()
+_saved_root_level: int | None = None
+
+
+def _install(handler: _UserAgentLogHandler, on: bool) -> None:
+    global _saved_root_level  # noqa: PLW0603
+    root = logging.getLogger()
+    if on and handler not in _installed:
+        if not _installed:
+            _saved_root_level = root.level
+            if root.level > logging.INFO:
+                root.setLevel(logging.INFO)
+        _installed.add(handler)
+        root.addHandler(handler)
+    elif not on and handler in _installed:
+        _installed.discard(handler)
+        root.removeHandler(handler)
+        if not _installed and _saved_root_level is not None:
+            root.setLevel(_saved_root_level)
+            _saved_root_level = None
 
 
 class MonitoredAgent(Agent):
@@ -49,19 +85,42 @@ class MonitoredAgent(Agent):
         self,
         user_agent_handle: Handle[UserAgent],
         agent_name: str | None = None,
+        geolocation: dict[str, Any] | None = None,
+        packed: bool = True,
+        forward_logs: str = FORWARD_ALWAYS,
     ) -> None:
-        """Initialize with a handle to the UserAgent."""
+        """Initialize with a handle to the UserAgent.
+
+        Args:
+            user_agent_handle: Handle of the UserAgent to report to.
+            agent_name: Display name, defaults to the class name.
+            geolocation: Location to report instead of looking it up over the
+                network (see :mod:`.host_info` for the environment override).
+            packed: Send messages in the compact encoding of :mod:`.codec`.
+                Disable for a UserAgent without the ``message_packed``
+                action.
+            forward_logs: Which Python log records to send to the UserAgent:
+                ``'always'``, ``'never'``, or ``'attached'`` to send them
+                only while a dashboard page is open. While nothing is
+                forwarded the log handler is removed, so log calls cost no
+                more than without monitoring.
+        """
+        if forward_logs not in (FORWARD_ALWAYS, FORWARD_ATTACHED, FORWARD_NEVER):
+            raise ValueError(f'Unknown forward_logs mode {forward_logs!r}')
         super().__init__()
         self.agent_name = agent_name or type(self).__name__
         self.user_agent = user_agent_handle
+        self.geolocation = geolocation
+        self.packed = packed
+        self.forward_logs = forward_logs
+        self._encoder = Encoder()
 
     async def agent_on_startup(self) -> None:
         """Initiate log handlers for communication with UserAgent."""
-        self._log_buf: _queue.SimpleQueue[tuple[str, str]] = _queue.SimpleQueue()
+        self._log_buf: _queue.SimpleQueue[logging.LogRecord] = _queue.SimpleQueue()
         self._agent_uid_str = str(self.agent_id.uid)
         self._log_handler = _UserAgentLogHandler(self._log_buf)
-        logging.getLogger().addHandler(self._log_handler)
-        logging.getLogger().setLevel(logging.INFO)
+        _install(self._log_handler, self.forward_logs != FORWARD_NEVER)
         self._drain_task: asyncio.Task[None] = asyncio.create_task(
             self._drain_logs(),
         )
@@ -70,17 +129,32 @@ class MonitoredAgent(Agent):
         )
         await self.agent_registration()
 
-    async def _drain_logs(self) -> None:
-        """Single long-lived task: drains the log queue and forwards messages."""
+    async def _drain_logs(self, max_batch: int = 500) -> None:
+        """Single long-lived task: drains the log queue and forwards messages.
+
+        Everything queued since the last pass is sent as one batch.
+        """
         try:
             while True:
-                try:
-                    loglevel, msg = self._log_buf.get(block=False)
-                except _queue.Empty:
+                batch: list[Message] = []
+                while len(batch) < max_batch:
+                    try:
+                        record = self._log_buf.get(block=False)
+                    except _queue.Empty:
+                        break
+                    batch.append(
+                        Log(
+                            agent_id=self._agent_uid_str,
+                            agent_name=self.agent_name,
+                            message=self._log_handler.format(record),
+                            level=record.levelname,
+                        ),
+                    )
+                if not batch:
                     await asyncio.sleep(0.05)
                     continue
                 try:
-                    await self.log(msg, level=loglevel)
+                    await self._send_batch(batch)
                 except academy.exception.AgentTerminatedError:
                     break
                 except Exception:
@@ -93,21 +167,49 @@ class MonitoredAgent(Agent):
 
     async def agent_on_shutdown(self) -> None:
         """Cancel the drainer and remove the log handler."""
-        print('Agent on shutdown... closing log handler hooks')
+        logger.debug('Agent on shutdown... closing log handler hooks')
         self._drain_task.cancel()
         self._stats_task.cancel()
-        logging.getLogger().removeHandler(self._log_handler)
+        _install(self._log_handler, False)
+
+    def _set_attached(self, attached: bool | None) -> None:
+        """Start or stop forwarding logs as dashboard pages open and close.
+
+        ``attached`` is the UserAgent's reply to a message; None (from a
+        UserAgent that does not report it) counts as attached.
+        """
+        if self.forward_logs == FORWARD_ATTACHED:
+            _install(self._log_handler, attached is not False)
 
     async def _send_message(self, message: Message) -> None:
         """Send a message to the UserAgent."""
-        print(f'Sending message to UserAgent {message}')
-        await self.user_agent.message(self._agent_uid_str, message)
+        logger.debug('Sending message to UserAgent %s', message)
+        if self.packed:
+            await self._send_batch([message])
+        else:
+            self._set_attached(await self.user_agent.message(self._agent_uid_str, message))
+
+    async def _send_batch(self, messages: list[Message]) -> None:
+        """Send messages to the UserAgent in one call."""
+        if not self.packed:
+            self._set_attached(await self.user_agent.message_batch(self._agent_uid_str, messages))
+            return
+        frame = self._encoder.encode(messages)
+        attached = await self.user_agent.message_packed(self._agent_uid_str, frame)
+        if attached is None:
+            # The receiver restarted or got frames out of order; start a
+            # stream it can decode without earlier frames.
+            self._encoder.reset()
+            attached = await self.user_agent.message_packed(
+                self._agent_uid_str,
+                self._encoder.encode(messages),
+            )
+        self._set_attached(attached)
 
     @action
     async def log(self, message: str, level: str = 'INFO') -> None:
         """Action to report a log message to the UserAgent."""
-        print(f'Monitored Agent : message={message} level={level}')
-        print(f'Agent id : {self._agent_uid_str}')
+        logger.debug('Monitored Agent %s: message=%s level=%s', self._agent_uid_str, message, level)
         await self._send_message(
             Log(
                 agent_id=self._agent_uid_str,
@@ -122,10 +224,14 @@ class MonitoredAgent(Agent):
         self,
         prompt: str,
         responses: list[str],
+        timeout_s: float | None = None,
+        default: str = '',
     ) -> str:
         """Send user prompt to UserAgent.
 
-        Note: This call will block until the user has supplied a response.
+        Note: This call will block until the user has supplied a response,
+        or until ``timeout_s`` has passed, in which case ``default`` is
+        returned.
         """
         return await self.user_agent.prompt_user(
             self._agent_uid_str,
@@ -133,6 +239,8 @@ class MonitoredAgent(Agent):
                 agent_id=str(self.agent_id.uid),
                 prompt=prompt,
                 responses=responses,
+                timeout_s=timeout_s,
+                default=default,
             ),
         )
 
@@ -156,33 +264,34 @@ class MonitoredAgent(Agent):
         """Fetch geolocation for this machine from ipinfo.io."""
         loop = asyncio.get_event_loop()
         try:
-            resp = await loop.run_in_executor(
-                None,
-                lambda: requests.get('https://ipinfo.io/json', timeout=6),
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data
+            return await loop.run_in_executor(None, fetch_geolocation)
         except Exception:
             return {}
 
     async def agent_registration(self) -> None:
-        """Send registration message with hardware info and geolocation."""
+        """Send registration message with hardware info and geolocation.
+
+        Host facts are gathered concurrently and cached per host, so only the
+        first agent on a node pays for the DNS and geolocation lookups.
+        """
+        info = await gather_host_info(geolocation=self.geolocation)
         intro = Registration(
             agent_name=self.agent_name,
             agent_id=self._agent_uid_str,
-            fqdn=socket.getfqdn(),
-            cpu=platform.processor(),
-            gpu='?',
-            arch=platform.machine(),
-            python_version=platform.python_version(),
-            os=platform.system(),
-            geolocation=await self.get_geolocation(),
+            fqdn=info.fqdn,
+            cpu=info.cpu,
+            gpu=info.gpu,
+            arch=info.arch,
+            python_version=info.python_version,
+            os=info.os,
+            geolocation=info.geolocation,
         )
         await self._send_message(intro)
 
     async def gather_stats(self) -> Stats:
         """Gather CPU, memory, and GPU utilization for the current process."""
+        import psutil  # noqa: PLC0415
+
         proc = psutil.Process(os.getpid())
         mem = proc.memory_info()
         gpu: list[dict[str, Any]] = []
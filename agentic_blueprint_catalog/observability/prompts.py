@@ -0,0 +1,183 @@
+"""Grouping of identical user prompts and policy-based automatic answers."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import logging
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from agentic_blueprint_catalog.observability.message import UserPrompt
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PromptPolicy:
+    """Answers matching prompts without waiting for the user.
+
+    Attributes:
+        pattern: Regular expression searched for in the prompt text.
+        response: Answer to give. A prompt whose response choices do not
+            include it is left to the user.
+        delay_s: Show the prompt for this long first, so that the user can
+            still answer differently; 0 answers immediately.
+    """
+
+    pattern: str
+    response: str
+    delay_s: float = 0.0
+
+    def matches(self, prompt: UserPrompt) -> bool:
+        """Return whether this policy answers ``prompt``."""
+        if prompt.responses and self.response not in prompt.responses:
+            return False
+        return re.search(self.pattern, prompt.prompt) is not None
+
+
+def policies_from_env() -> list[PromptPolicy]:
+    """Return the policies configured in ``OBSERVABILITY_PROMPT_POLICIES``.
+
+    The variable holds a JSON list of ``{"pattern", "response", "delay_s"}``
+    objects, or the path to a file containing one.
+    """
+    value = os.environ.get('OBSERVABILITY_PROMPT_POLICIES', '').strip()
+    if not value:
+        return []
+    try:
+        if value.startswith('['):
+            items = json.loads(value)
+        else:
+            with open(value) as f:
+                items = json.load(f)
+        policies = [PromptPolicy(**item) for item in items]
+        for policy in policies:
+            re.compile(policy.pattern)
+    except (OSError, ValueError, TypeError, re.error) as e:
+        logger.warning(f'Ignoring invalid OBSERVABILITY_PROMPT_POLICIES: {e}')
+        return []
+    return policies
+
+
+@dataclass
+class _Member:
+    agent: str
+    agent_id: str
+    default: str
+    expires: float | None
+    future: concurrent.futures.Future[str]
+
+
+@dataclass
+class _Group:
+    key: tuple[str, tuple[str, ...]]
+    entry: dict[str, Any]
+    members: dict[str, _Member] = field(default_factory=dict)
+
+    def update_entry(self) -> None:
+        """Refresh the summary shown on the page after members changed."""
+        first = next(iter(self.members.values()))
+        expiring = [m for m in self.members.values() if m.expires is not None]
+        soonest = min(expiring, key=lambda m: m.expires or 0.0) if expiring else None
+        self.entry.update(
+            agent=first.agent,
+            agent_id=first.agent_id,
+            count=len(self.members),
+            default=soonest.default if soonest is not None else first.default,
+            expires=soonest.expires if soonest is not None else None,
+        )
+
+
+class PromptGroups:
+    """Pending prompts, grouped by question and response choices.
+
+    Every prompt is a member with its own ID and future, but the page shows
+    one entry per group: answering the group answers all of its members.
+    A member can also leave on its own (on timeout or cancellation); the
+    group is closed when its last member leaves.
+
+    Not thread-safe; the Dashboard guards it with its own lock. Futures are
+    returned to the caller to complete once the lock is released.
+    """
+
+    def __init__(self) -> None:
+        self._groups: dict[str, _Group] = {}
+        self._by_key: dict[tuple[str, tuple[str, ...]], str] = {}
+        self._member_group: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._member_group)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Return the page entry of every group, oldest first."""
+        return [dict(group.entry) for group in self._groups.values()]
+
+    def add(
+        self,
+        agent: str,
+        agent_id: str,
+        prompt: UserPrompt,
+        now: float,
+    ) -> tuple[str, concurrent.futures.Future[str], dict[str, Any]]:
+        """Add a prompt to the group for its question, creating it if needed.
+
+        Returns the prompt's ID, its future and the updated group entry.
+        """
+        key = (prompt.prompt, tuple(prompt.responses))
+        group_id = self._by_key.get(key)
+        if group_id is None:
+            group_id = uuid.uuid4().hex
+            entry = {'id': group_id, 'time': now, 'prompt': prompt.prompt, 'responses': prompt.responses}
+            self._groups[group_id] = _Group(key, entry)
+            self._by_key[key] = group_id
+        group = self._groups[group_id]
+        prompt_id = uuid.uuid4().hex
+        future: concurrent.futures.Future[str] = concurrent.futures.Future()
+        expires = now + prompt.timeout_s if prompt.timeout_s is not None else None
+        group.members[prompt_id] = _Member(agent, agent_id, prompt.default, expires, future)
+        self._member_group[prompt_id] = group_id
+        if len(group.members) == 1:
+            group.update_entry()
+        else:
+            # Cheaper than update_entry() for a group with many members.
+            group.entry['count'] = len(group.members)
+            if expires is not None and (group.entry['expires'] is None or expires < group.entry['expires']):
+                group.entry.update(default=prompt.default, expires=expires)
+        return prompt_id, future, dict(group.entry)
+
+    def future(self, prompt_id: str) -> concurrent.futures.Future[str] | None:
+        """Return the future of a pending prompt."""
+        group_id = self._member_group.get(prompt_id)
+        if group_id is None:
+            return None
+        return self._groups[group_id].members[prompt_id].future
+
+    def close(
+        self,
+        prompt_id: str,
+    ) -> tuple[list[concurrent.futures.Future[str]], dict[str, Any] | None, bool]:
+        """Remove a group (by group ID) or a single prompt (by prompt ID).
+
+        Returns the futures to complete, the affected group's entry (None if
+        the ID is unknown) and whether the group was closed, as opposed to
+        merely losing a member.
+        """
+        group_id = self._member_group.get(prompt_id, prompt_id)
+        group = self._groups.get(group_id)
+        if group is None:
+            return [], None, False
+        if group_id == prompt_id or len(group.members) == 1:
+            del self._groups[group_id]
+            del self._by_key[group.key]
+            for member_id in group.members:
+                del self._member_group[member_id]
+            return [m.future for m in group.members.values()], group.entry, True
+        member = group.members.pop(prompt_id)
+        del self._member_group[prompt_id]
+        group.update_entry()
+        return [member.future], dict(group.entry), False
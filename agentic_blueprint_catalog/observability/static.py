@@ -0,0 +1,215 @@
+"""Pre-compressed, cacheable delivery of the dashboard page and its assets.
+
+Everything is read and compressed once when the bundle is built, so a request
+is a dictionary lookup. Responses carry strong ETags; asset URLs produced by
+:meth:`StaticBundle.url` include a content hash and are served with immutable
+cache headers, so a browser fetches each asset once per content change.
+
+Leaflet and the dashboard font are loaded from public CDNs unless they have
+been vendored into ``assets/vendor`` (see :mod:`.vendor`), in which case the
+page references the local copies and works without internet access.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Types that are already compressed and gain nothing from gzip/brotli.
+_INCOMPRESSIBLE = ('image/png', 'image/jpeg', 'image/gif', 'image/webp', 'font/woff', 'font/woff2')
+_MIN_COMPRESS_BYTES = 512
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+UNVERSIONED = 'public, max-age=3600'
+
+# CDN references in the page and their vendored replacements (relative to
+# the assets directory).
+_VENDORED = (
+    ('<link rel="preconnect" href="https://fonts.googleapis.com">', None),
+    ('https://fonts.googleapis.com/css2?family=Share+Tech+Mono&display=swap', 'vendor/fonts/share-tech-mono.css'),
+    ('https://unpkg.com/leaflet@1.9.4/dist/leaflet.css', 'vendor/leaflet/leaflet.css'),
+    ('https://unpkg.com/leaflet@1.9.4/dist/leaflet.js', 'vendor/leaflet/leaflet.js'),
+)
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+@dataclass(frozen=True)
+class StaticFile:
+    """One servable file with its precomputed encodings."""
+
+    body: bytes
+    content_type: str
+    etag: str
+    gzip: bytes | None = None
+    br: bytes | None = None
+
+    def encode(self, accept_encoding: str) -> tuple[bytes, str | None]:
+        """Return the best body for an ``Accept-Encoding`` header and its encoding."""
+        accepted = {token.split(';')[0].strip() for token in accept_encoding.lower().split(',')}
+        if self.br is not None and 'br' in accepted:
+            return self.br, 'br'
+        if self.gzip is not None and 'gzip' in accepted:
+            return self.gzip, 'gzip'
+        return self.body, None
+
+
+def _compress(body: bytes, content_type: str) -> StaticFile:
+    etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+    if content_type.startswith(_INCOMPRESSIBLE) or len(body) < _MIN_COMPRESS_BYTES:
+        return StaticFile(body, content_type, etag)
+    return StaticFile(
+        body,
+        content_type,
+        etag,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body) if brotli is not None else None,
+    )
+
+
+class StaticBundle:
+    """The dashboard page plus every file under the assets directory.
+
+    Args:
+        html: Page source.
+        assets_dir: Directory served under ``/assets/``.
+    """
+
+    def __init__(self, html: str, assets_dir: str) -> None:
+        self.assets_dir = assets_dir
+        self._assets: dict[str, StaticFile] = {}
+        # (mtime, size) of each asset when it was read.
+        self._stamps: dict[str, tuple[int, int]] = {}
+        if os.path.isdir(assets_dir):
+            for root, _, files in os.walk(assets_dir):
+                for fname in files:
+                    path = os.path.join(root, fname)
+                    name = os.path.relpath(path, assets_dir).replace(os.sep, '/')
+                    self._stamps[name], self._assets[name] = self._load(path)
+        self.page = _compress(
+            self._localize(html).encode(),
+            'text/html; charset=utf-8',
+        )
+
+    @staticmethod
+    def _load(path: str) -> tuple[tuple[int, int], StaticFile]:
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            body = f.read()
+        return (st.st_mtime_ns, st.st_size), _compress(body, content_type)
+
+    def reload(self, names: Iterable[str]) -> list[str]:
+        """Re-read the named assets that changed on disk and return their names.
+
+        Only changed files are read and compressed, and assets whose file
+        is gone are dropped. The page is kept as is, so this is only for
+        assets the page does not refer to, such as facility logos.
+        """
+        assets, stamps = dict(self._assets), dict(self._stamps)
+        changed = []
+        for name in names:
+            path = os.path.join(self.assets_dir, *name.split('/'))
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                if assets.pop(name, None) is not None:
+                    stamps.pop(name, None)
+                    changed.append(name)
+                continue
+            if stamps.get(name) != (st.st_mtime_ns, st.st_size):
+                stamps[name], assets[name] = self._load(path)
+                changed.append(name)
+        # Swapped in whole, so that concurrent requests see either version.
+        self._assets, self._stamps = assets, stamps
+        return changed
+
+    @property
+    def vendored(self) -> bool:
+        """Whether Leaflet and the font are served locally."""
+        return all(local is None or local in self._assets for _, local in _VENDORED)
+
+    def _localize(self, html: str) -> str:
+        if not self.vendored:
+            return html
+        for remote, local in _VENDORED:
+            html = html.replace(remote, self.url(local) if local else '')
+        return html
+
+    def names(self) -> list[str]:
+        """Return the asset names (paths relative to the assets directory)."""
+        return sorted(self._assets)
+
+    def asset(self, name: str) -> StaticFile | None:
+        """Return an asset by name, or None if it does not exist."""
+        return self._assets.get(name)
+
+    def url(self, name: str) -> str:
+        """Return the content-versioned URL of an asset."""
+        asset = self._assets.get(name)
+        version = f'?v={asset.etag.strip(chr(34))[:12]}' if asset is not None else ''
+        return f'/assets/{name}{version}'
+
+    @staticmethod
+    def respond(
+        file: StaticFile,
+        accept_encoding: str,
+        if_none_match: str | None,
+        cache_control: str,
+    ) -> tuple[int, bytes, dict[str, str]]:
+        """Build a response as ``(status, body, headers)``.
+
+        Returns 304 with an empty body if the client's ``If-None-Match``
+        matches.
+        """
+        headers = {
+            'ETag': file.etag,
+            'Cache-Control': cache_control,
+            'Vary': 'Accept-Encoding',
+        }
+        if if_none_match and file.etag in {tag.strip() for tag in if_none_match.split(',')}:
+            return 304, b'', headers
+        body, encoding = file.encode(accept_encoding)
+        headers['Content-Type'] = file.content_type
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        return 200, body, headers
+
+    def respond_page(
+        self,
+        accept_encoding: str,
+        if_none_match: str | None,
+    ) -> tuple[int, bytes, dict[str, str]]:
+        """Build the response for the dashboard page (always revalidated)."""
+        return self.respond(self.page, accept_encoding, if_none_match, REVALIDATE)
+
+    def respond_asset(
+        self,
+        name: str,
+        version: str | None,
+        accept_encoding: str,
+        if_none_match: str | None,
+    ) -> tuple[int, bytes, dict[str, str]] | None:
+        """Build the response for an asset, or None if it does not exist.
+
+        Requests carrying the current content version (from :meth:`url`)
+        are cacheable forever; other requests are cached briefly.
+        """
+        file = self._assets.get(name)
+        if file is None:
+            return None
+        current = version is not None and version != '' and file.etag.strip('"').startswith(version)
+        return self.respond(
+            file,
+            accept_encoding,
+            if_none_match,
+            IMMUTABLE if current else UNVERSIONED,
+        )
@@ -0,0 +1,242 @@
+"""Fixed-memory, multi-resolution history of agent stats."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """One tier of a :class:`TimeSeriesStore`.
+
+    Attributes:
+        name: Name used to request this tier (e.g. ``'1m'``).
+        step_s: Bucket width in seconds; 0 keeps every sample as received.
+        capacity: Number of points (samples or buckets) retained.
+    """
+
+    name: str
+    step_s: float
+    capacity: int
+
+
+# Agents report every 30 s by default: raw samples cover 2 hours, minute
+# buckets a day and ten-minute buckets a week.
+DEFAULT_RESOLUTIONS = (
+    Resolution('raw', 0, 240),
+    Resolution('1m', 60, 1440),
+    Resolution('10m', 600, 1008),
+)
+
+
+class _Ring:
+    """Fixed-capacity columns of float samples sharing one time column.
+
+    Times are doubles; values are stored as 32-bit floats, with NaN for a
+    metric that was absent at that time. Columns are added when a metric
+    first appears.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.columns: dict[str, array[float]] = {}
+        self.count = 0
+        self._next = 0
+
+    def _slot(self, i: int) -> int:
+        """Physical slot of the ``i``-th oldest point."""
+        return (self._next - self.count + i) % self.capacity
+
+    @property
+    def oldest(self) -> float | None:
+        """Time of the oldest retained point."""
+        return self.times[self._slot(0)] if self.count else None
+
+    def append(self, t: float, values: dict[str, float]) -> None:
+        slot = self._next
+        self.times[slot] = t
+        for name, column in self.columns.items():
+            column[slot] = values.get(name, math.nan)
+        for name in values.keys() - self.columns.keys():
+            column = array('f', [math.nan]) * self.capacity
+            column[slot] = values[name]
+            self.columns[name] = column
+        self._next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _bisect(self, t: float) -> int:
+        """Return the logical index of the first point at or after ``t``."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.times[self._slot(mid)] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, since: float, until: float, names: list[str]) -> tuple[list[float], dict[str, list[float | None]]]:
+        """Return the times and the named columns for ``since <= t < until``."""
+        slots = [self._slot(i) for i in range(self._bisect(since), self._bisect(until))]
+        series: dict[str, list[float | None]] = {}
+        for name in names:
+            column = self.columns.get(name)
+            if column is None:
+                series[name] = [None] * len(slots)
+            else:
+                series[name] = [None if math.isnan(v) else v for v in (column[s] for s in slots)]
+        return [self.times[s] for s in slots], series
+
+
+class _Bucket:
+    """Running mean and max of each metric within one rollup bucket."""
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.sums: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.maxes: dict[str, float] = {}
+
+    def add(self, values: dict[str, float]) -> None:
+        for name, v in values.items():
+            self.sums[name] = self.sums.get(name, 0.0) + v
+            self.counts[name] = self.counts.get(name, 0) + 1
+            self.maxes[name] = max(self.maxes.get(name, v), v)
+
+    def summary(self) -> dict[str, float]:
+        out = {name: total / self.counts[name] for name, total in self.sums.items()}
+        out.update((f'{name}:max', v) for name, v in self.maxes.items())
+        return out
+
+
+class _AgentSeries:
+    def __init__(self, resolutions: tuple[Resolution, ...]) -> None:
+        self.resolutions = resolutions
+        self.rings = [_Ring(r.capacity) for r in resolutions]
+        self.buckets: list[_Bucket | None] = [None] * len(resolutions)
+        self.metrics: set[str] = set()
+
+    def record(self, t: float, values: dict[str, float]) -> None:
+        self.metrics.update(values)
+        for i, res in enumerate(self.resolutions):
+            if res.step_s <= 0:
+                self.rings[i].append(t, values)
+                continue
+            start = t - t % res.step_s
+            bucket = self.buckets[i]
+            if bucket is not None and bucket.start != start:
+                self.rings[i].append(bucket.start, bucket.summary())
+                bucket = None
+            if bucket is None:
+                bucket = self.buckets[i] = _Bucket(start)
+            bucket.add(values)
+
+
+class TimeSeriesStore:
+    """History of numeric metrics per agent at several resolutions.
+
+    Every sample is kept in the finest tier and folded into the coarser
+    ones (mean and max per bucket, the max under ``<metric>:max``). Each
+    tier is a ring of preallocated arrays, so memory per agent is fixed
+    regardless of how long it runs: with the default tiers, the five
+    metrics of an agent with one GPU take about 120 KB.
+
+    Not thread-safe; the Dashboard guards it with its own lock.
+
+    Args:
+        resolutions: Tiers from finest to coarsest.
+    """
+
+    def __init__(self, resolutions: tuple[Resolution, ...] = DEFAULT_RESOLUTIONS) -> None:
+        self.resolutions = resolutions
+        self._agents: dict[str, _AgentSeries] = {}
+
+    def __contains__(self, agent: str) -> bool:
+        return agent in self._agents
+
+    def agents(self) -> list[str]:
+        """Return the agents with recorded history."""
+        return list(self._agents)
+
+    def record(self, agent: str, t: float, values: dict[str, float]) -> None:
+        """Add a sample of metric values taken at time ``t``.
+
+        Samples for one agent are expected in time order.
+        """
+        series = self._agents.get(agent)
+        if series is None:
+            series = self._agents[agent] = _AgentSeries(self.resolutions)
+        series.record(t, values)
+
+    def remove(self, agent: str) -> None:
+        """Forget an agent's history."""
+        self._agents.pop(agent, None)
+
+    def _pick(self, series: _AgentSeries, since: float) -> int:
+        """Index of the finest tier whose retained points reach back to ``since``."""
+        for i, ring in enumerate(series.rings):
+            if ring.count < ring.capacity or (ring.oldest is not None and ring.oldest <= since):
+                return i
+        return len(series.rings) - 1
+
+    def query(
+        self,
+        agent: str,
+        since: float,
+        until: float,
+        resolution: str | None = None,
+        metrics: list[str] | None = None,
+    ) -> dict[str, Any] | None:
+        """Return an agent's metrics between ``since`` and ``until``.
+
+        Args:
+            agent: Agent to query.
+            since: Start of the range (epoch seconds).
+            until: End of the range (epoch seconds, exclusive).
+            resolution: Tier name; by default the finest tier that still
+                covers ``since``.
+            metrics: Metrics to include; by default all of them. Rollup
+                tiers also have ``<metric>:max``.
+
+        Returns:
+            ``{'agent', 'resolution', 'step_s', 't', 'series'}`` where
+            ``series`` maps each metric to values aligned with ``t`` (None
+            where missing), or None if the agent is unknown.
+
+        Raises:
+            ValueError: If ``resolution`` is not a tier name.
+        """
+        series = self._agents.get(agent)
+        if series is None:
+            return None
+        if resolution is None:
+            index = self._pick(series, since)
+        else:
+            names = [r.name for r in self.resolutions]
+            if resolution not in names:
+                raise ValueError(f'Unknown resolution {resolution!r}; expected one of {names}')
+            index = names.index(resolution)
+        res = self.resolutions[index]
+        if metrics is None:
+            metrics = sorted(series.metrics)
+            if res.step_s > 0:
+                metrics += [f'{m}:max' for m in metrics]
+        times, values = series.rings[index].range(since, until, metrics)
+        bucket = series.buckets[index]
+        if bucket is not None and since <= bucket.start < until:
+            # Include the bucket still being filled.
+            partial = bucket.summary()
+            times.append(bucket.start)
+            for name in metrics:
+                values[name].append(partial.get(name))
+        return {
+            'agent': agent,
+            'resolution': res.name,
+            'step_s': res.step_s,
+            't': times,
+            'series': values,
+        }
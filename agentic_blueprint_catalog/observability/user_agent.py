@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 import uuid
 from typing import Any
 
@@ -11,7 +12,10 @@ from academy.agent import action
 from academy.agent import Agent
 from academy.identifier import AgentId
 
+from agentic_blueprint_catalog.observability.codec import Decoder
+from agentic_blueprint_catalog.observability.codec import UnknownReferenceError
 from agentic_blueprint_catalog.observability.dashboard import Dashboard
+from agentic_blueprint_catalog.observability.journal import Journal
 from agentic_blueprint_catalog.observability.message import Log
 from agentic_blueprint_catalog.observability.message import Message
 from agentic_blueprint_catalog.observability.message import Registration
@@ -24,14 +28,38 @@ logger = logging.getLogger(__name__)
 class UserAgent(Agent):
     """Receives messages from MonitoredAgents and serves a live web dashboard."""
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 8000) -> None:
-
+    def __init__(
+        self,
+        host: str = '0.0.0.0',
+        port: int = 8000,
+        async_server: bool = False,
+        journal_dir: str | None = None,
+        journal_replay_s: float = 86400.0,
+    ) -> None:
+        """Initialize the dashboard.
+
+        Args:
+            host: Interface the dashboard listens on.
+            port: Port the dashboard listens on.
+            async_server: Serve the dashboard from this agent's event loop
+                instead of a threaded Flask server, so that open browser
+                streams cost coroutines rather than threads.
+            journal_dir: Directory for a persistent journal of every received
+                message. On startup the dashboard state is rebuilt from it,
+                so a restarted UserAgent keeps its agents and logs.
+            journal_replay_s: How far back (seconds) to replay the journal
+                on startup.
+        """
         super().__init__()
         print(f'Starting user agent on Port: {port}')
         self._dashboard = Dashboard(host=host, port=port)
+        self._async_server = async_server
+        self._journal = Journal(journal_dir) if journal_dir is not None else None
+        self._journal_replay_s = journal_replay_s
+        self._decoder = Decoder()
 
     async def agent_on_startup(self) -> None:
-        """Start the Flask dashboard on startup."""
+        """Start the dashboard server on startup."""
         loop = asyncio.get_event_loop()
 
         def _shutdown_callback(agent_id: str) -> None:
@@ -43,19 +71,46 @@ class UserAgent(Agent):
             )
 
         self._dashboard.set_shutdown_callback(_shutdown_callback)
-        self._dashboard.start()
+        journal = self._journal
+        if journal is not None:
+            since = time.time() - self._journal_replay_s
+            start = time.perf_counter()
+            count = await loop.run_in_executor(
+                None,
+                lambda: self._dashboard.restore(journal.read(since=since)),
+            )
+            logger.info(
+                f'Replayed {count} journal records in {time.perf_counter() - start:.2f}s',
+            )
+            journal.start()
+        if self._async_server:
+            await self._dashboard.start_async()
+        else:
+            self._dashboard.start()
         print('Starting dashboard')
 
+    async def agent_on_shutdown(self) -> None:
+        """Stop the event-loop dashboard server and close the journal."""
+        await self._dashboard.stop_async()
+        if self._journal is not None:
+            self._journal.close()
+
+    def _record(self, batches: dict[str, list[Message]]) -> None:
+        if self._journal is not None:
+            self._journal.append(batches)
+
     @action
-    async def message(self, sender: str, message: Message) -> None:
+    async def message(self, sender: str, message: Message) -> bool:
         """Route an incoming message to the appropriate dashboard handler.
 
         sender: Agent ID UUID string
         message: Message object
+
+        Returns whether a dashboard page is open (see :meth:`Dashboard.has_subscribers`),
+        so that senders can stop forwarding logs nobody sees.
         """
-        logger.info(
-            f'Received message from {sender}: {message} ======================',
-        )
+        logger.debug('Received message from %s: %s', sender, message)
+        self._record({sender: [message]})
         self._dashboard.agent_heartbeat(sender)
         if isinstance(message, Log):
             self._dashboard.push_log(sender, message)
@@ -63,6 +118,61 @@ class UserAgent(Agent):
             self._dashboard.push_stats(sender, message)
         elif isinstance(message, Registration):
             self._dashboard.register_agent(sender, message)
+        return self._dashboard.has_subscribers()
+
+    @action
+    async def message_batch(self, sender: str, messages: list[Message]) -> bool:
+        """Apply a batch of Log/Stats/Registration messages from one sender.
+
+        The batch is applied to the dashboard under a single lock acquisition
+        and pushed to the browser as one event, which keeps per-message
+        overhead low when many agents report at once.
+
+        sender: Agent ID UUID string
+        messages: Message objects, oldest first
+
+        Returns whether a dashboard page is open.
+        """
+        logger.debug('Received %d messages from %s', len(messages), sender)
+        self._record({sender: messages})
+        self._dashboard.agent_heartbeat(sender)
+        self._dashboard.push_batch(sender, messages)
+        return self._dashboard.has_subscribers()
+
+    @action
+    async def message_packed(self, sender: str, frame: bytes) -> bool | None:
+        """Apply a batch of messages encoded by :class:`.codec.Encoder`.
+
+        sender: Agent ID UUID string
+        frame: Encoded messages, oldest first
+
+        Returns whether a dashboard page is open, or None, without applying
+        anything, if the frame refers to strings from a frame this agent has
+        not seen (for example after a restart); the sender should then reset
+        its encoder and send it again.
+        """
+        try:
+            messages = self._decoder.decode(sender, frame)
+        except UnknownReferenceError:
+            logger.debug('Asking %s to resend a frame', sender)
+            return None
+        self._record({sender: messages})
+        self._dashboard.agent_heartbeat(sender)
+        self._dashboard.push_batch(sender, messages)
+        return self._dashboard.has_subscribers()
+
+    @action
+    async def message_forward(self, batches: dict[str, list[Message]]) -> bool:
+        """Apply message batches relayed by an AggregatorAgent.
+
+        batches: Messages keyed by the Agent ID UUID string of their sender
+
+        Returns whether a dashboard page is open.
+        """
+        logger.debug('Received batches for %d agents', len(batches))
+        self._record(batches)
+        self._dashboard.push_batches(batches)
+        return self._dashboard.has_subscribers()
 
     @action
     async def prompt_user(
@@ -70,14 +180,14 @@ class UserAgent(Agent):
         sender: str,
         user_prompt: UserPrompt,
     ) -> str:
-        """Prompt the user for a response and block until the user selects one."""
-        loop = asyncio.get_event_loop()
-        prompt_id = self._dashboard.push_prompt(sender, user_prompt)
-        return await loop.run_in_executor(
-            None,
-            self._dashboard.wait_for_response,
-            prompt_id,
-        )
+        """Prompt the user and wait until they select a response.
+
+        Returns ``user_prompt.default`` if ``user_prompt.timeout_s`` passes
+        first. Waiting does not occupy a thread, so any number of prompts
+        can be pending.
+        """
+        self._record({sender: [user_prompt]})
+        return await self._dashboard.ask(sender, user_prompt)
 
     @action
     async def get_messages(self) -> dict[str, Any]:
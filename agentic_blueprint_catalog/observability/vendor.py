@@ -0,0 +1,76 @@
+"""Download the dashboard's third-party front-end files into ``assets/vendor``.
+
+Run once on a machine with internet access (for example before copying the
+package to an air-gapped cluster):
+
+    python -m agentic_blueprint_catalog.observability.vendor
+
+Once the files are present, the dashboard serves Leaflet and the Share Tech
+Mono font itself instead of linking to unpkg.com and Google Fonts. Map tiles
+are still fetched from the tile server by the browser.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+
+import requests
+
+from agentic_blueprint_catalog.observability.dashboard import _ASSETS_DIR
+
+LEAFLET_URL = 'https://unpkg.com/leaflet@1.9.4/dist/'
+LEAFLET_FILES = (
+    'leaflet.js',
+    'leaflet.css',
+    'images/layers.png',
+    'images/layers-2x.png',
+    'images/marker-icon.png',
+    'images/marker-icon-2x.png',
+    'images/marker-shadow.png',
+)
+FONT_CSS_URL = 'https://fonts.googleapis.com/css2?family=Share+Tech+Mono&display=swap'
+# Google Fonts picks the font format from the user agent; ask for woff2.
+_BROWSER_UA = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+
+def _save(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    print(f'Wrote {path} ({len(content)} bytes)')
+
+
+def _get(url: str, **kwargs: str) -> bytes:
+    resp = requests.get(url, headers=kwargs, timeout=30)
+    resp.raise_for_status()
+    return resp.content
+
+
+def vendor(dest: str) -> None:
+    """Download Leaflet and the dashboard font into ``dest``."""
+    for name in LEAFLET_FILES:
+        _save(os.path.join(dest, 'leaflet', name), _get(LEAFLET_URL + name))
+
+    css = _get(FONT_CSS_URL, **{'User-Agent': _BROWSER_UA}).decode()
+    for i, url in enumerate(re.findall(r'url\((https://[^)]+)\)', css)):
+        fname = f'share-tech-mono-{i}.woff2'
+        _save(os.path.join(dest, 'fonts', fname), _get(url))
+        css = css.replace(url, fname)
+    _save(os.path.join(dest, 'fonts', 'share-tech-mono.css'), css.encode())
+
+
+def main() -> None:
+    """Parse arguments and download the files."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--dest',
+        default=os.path.join(_ASSETS_DIR, 'vendor'),
+        help='Target directory (default: the dashboard assets/vendor directory)',
+    )
+    vendor(parser.parse_args().dest)
+
+
+if __name__ == '__main__':
+    main()
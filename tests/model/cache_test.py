@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import sqlite3
+
+import pytest
+from langchain_core.outputs import Generation
+
+from agentic_blueprint_catalog.model.cache import ResponseCache
+
+
+def test_path_expands_user(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.chdir(tmp_path)
+    cache = ResponseCache('~/.cache/responses.db')
+    assert cache.path == str(tmp_path / 'home' / '.cache' / 'responses.db')
+    assert os.path.exists(cache.path)
+    assert not (tmp_path / '~').exists()
+    cache.close()
+
+
+def test_disk_evictions_count_deleted_rows(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / 'responses.db')
+    cache = ResponseCache(path, max_memory_entries=100, max_disk_entries=10)
+    for i in range(25):
+        cache.update(f'prompt {i}', 'model', [Generation(text=str(i))])
+    (rows,) = sqlite3.connect(path).execute('SELECT COUNT(*) FROM responses').fetchone()
+    assert cache.stats().evictions == 25 - rows
+    cache.close()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from agentic_blueprint_catalog.model.expression import evaluate
+from agentic_blueprint_catalog.model.expression import ExpressionError
+from agentic_blueprint_catalog.model.expression import MAX_LENGTH
+from agentic_blueprint_catalog.model.model import calculate_many
+
+
+@pytest.mark.parametrize(
+    ('expression', 'expected'),
+    (
+        ('347 * 892', 309524),
+        ('2**10 + 1 << 2', 4100),
+        ('sqrt(x**2 + y**2)', 5.0),
+        ('max(1, -x, 7 // 2)', 3),
+        ('round(pi, 2)', 3.14),
+    ),
+)
+def test_evaluate(expression: str, expected: float) -> None:
+    assert evaluate(expression, {'x': 3, 'y': 4}) == expected
+
+
+@pytest.mark.parametrize(
+    'expression',
+    (
+        '9**9**9',
+        '1<<10**8',
+        '(2**9000) * (2**9000)',
+        '10**5000 * 10**5000',
+    ),
+)
+def test_large_integers_rejected(expression: str) -> None:
+    with pytest.raises(ExpressionError, match='too large'):
+        evaluate(expression)
+
+
+@pytest.mark.parametrize(
+    'expression',
+    (
+        '(1).real',
+        'x.__class__',
+        '[1, 2][0]',
+        '(lambda: 1)()',
+        'round(1.5, ndigits=0)',
+        'max(*[1, 2])',
+        'max(**{})',
+        "'a' * 3",
+        'b"a"',
+        'None',
+        'True',
+        '...',
+        '_pow',
+        '__builtins__',
+        '_pow(2, 3)',
+        '__import__("os")',
+        'print(1)',
+        '[1, 2]',
+        '1 if x else 2',
+        'x == 1',
+        '(y := 1)',
+    ),
+)
+def test_disallowed_syntax_rejected(expression: str) -> None:
+    with pytest.raises(ExpressionError):
+        evaluate(expression, {'x': 1})
+
+
+def test_long_expression_rejected() -> None:
+    with pytest.raises(ExpressionError, match='longer than'):
+        evaluate('1+' * (MAX_LENGTH // 2) + '1')
+
+
+@pytest.mark.parametrize('expression', ('(' * 500 + '1' + ')' * 500, '-' * (MAX_LENGTH - 1) + '1'))
+def test_deep_nesting_rejected(expression: str) -> None:
+    with pytest.raises(ExpressionError):
+        evaluate(expression)
+
+
+def test_calculate_many_reports_errors_in_place() -> None:
+    expressions = ['1 + 1', '9**9**9', '1/0', 'x', '2 * 3']
+    lines = calculate_many.invoke({'expressions': expressions}).splitlines()
+    assert len(lines) == len(expressions)
+    assert lines[0] == '1 + 1 = 2'
+    assert lines[1].startswith('9**9**9: Error: Result too large')
+    assert lines[2].startswith('1/0: Error: ZeroDivisionError')
+    assert lines[3] == 'x: Error: Unknown name: x'
+    assert lines[4] == '2 * 3 = 6'
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import http.server
+import threading
+from collections.abc import Generator
+
+import pytest
+
+from agentic_blueprint_catalog.model.model import get_http_clients
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def server_url() -> Generator[str, None, None]:
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_client_shared_across_event_loops(server_url: str) -> None:
+    _, client = get_http_clients(server_url)
+    results: list[object] = []
+
+    async def get() -> int:
+        # Two requests per loop, so the second reuses a pooled connection.
+        for _ in range(2):
+            response = await client.get(server_url)
+        return response.status_code
+
+    def agent() -> None:
+        try:
+            results.append(asyncio.run(get()))
+        except Exception as e:
+            results.append(e)
+
+    # Like Academy's thread executor: each agent runs its own loop in a thread.
+    for _ in range(2):
+        thread = threading.Thread(target=agent)
+        thread.start()
+        thread.join()
+
+    assert results == [200, 200]
+    assert get_http_clients(server_url)[1] is client
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agentic_blueprint_catalog.model.scheduler import RequestScheduler
+
+
+def test_followers_survive_cancelled_owner() -> None:
+    async def main() -> None:
+        scheduler = RequestScheduler(max_concurrency=4)
+        calls = 0
+        started = asyncio.Event()
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(0.05)
+            return 'ok'
+
+        owner = asyncio.create_task(scheduler.run(call, key='k'))
+        await started.wait()
+        followers = [asyncio.create_task(scheduler.run(call, key='k')) for _ in range(3)]
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        assert await asyncio.gather(*followers) == ['ok'] * 3
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        # The cancelled run, then one run shared by the followers.
+        assert calls == 2  # noqa: PLR2004
+
+    asyncio.run(main())
+
+
+def test_followers_share_owner_error() -> None:
+    async def main() -> None:
+        scheduler = RequestScheduler(max_concurrency=4)
+        calls = 0
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            raise ValueError('bad request')
+
+        results = await asyncio.gather(*(scheduler.run(call, key='k') for _ in range(4)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert calls == 1
+
+    asyncio.run(main())
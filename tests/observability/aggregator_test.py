@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from agentic_blueprint_catalog.observability.aggregator import AggregatorAgent
+from agentic_blueprint_catalog.observability.message import Message
+from agentic_blueprint_catalog.observability.message import Registration
+from agentic_blueprint_catalog.observability.message import Stats
+from agentic_blueprint_catalog.observability.message import UserPrompt
+
+
+class _Upstream:
+    """Records what an aggregator sends to its upstream agent."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, Any]] = []
+
+    async def message_forward(self, batches: dict[str, list[Message]]) -> bool:
+        self.calls.append(('message_forward', batches))
+        return True
+
+    async def prompt_user(self, sender: str, user_prompt: UserPrompt) -> str:
+        self.calls.append(('prompt_user', sender))
+        return user_prompt.responses[0]
+
+
+def _registration(agent_id: str) -> Registration:
+    return Registration(
+        agent_id=agent_id,
+        agent_name=f'name-{agent_id}',
+        fqdn='localhost',
+        cpu='cpu',
+        gpu='',
+        os='Linux',
+        arch='x86_64',
+        python_version='3.12',
+        geolocation={},
+    )
+
+
+def test_prompt_forwards_pending_registration_first() -> None:
+    upstream = _Upstream()
+    aggregator = AggregatorAgent(upstream)  # type: ignore[arg-type]
+    registration = _registration('a')
+    stats = Stats(agent_id='a', cpu_percent=1.0, memory_rss_mb=2.0, memory_vms_mb=3.0)
+    prompt = UserPrompt(agent_id='a', prompt='Continue?', responses=['yes', 'no'])
+
+    async def run() -> str:
+        await aggregator.message_batch('a', [registration, stats])
+        return await aggregator.prompt_user('a', prompt)
+
+    assert asyncio.run(run()) == 'yes'
+    assert upstream.calls == [
+        ('message_forward', {'a': [registration]}),
+        ('prompt_user', 'a'),
+    ]
+    # The stats still wait for the next flush, without the registration.
+    assert aggregator._summarize() == {'a': [stats]}
+
+
+def test_prompt_without_pending_registration() -> None:
+    upstream = _Upstream()
+    aggregator = AggregatorAgent(upstream)  # type: ignore[arg-type]
+    prompt = UserPrompt(agent_id='a', prompt='Continue?', responses=['yes', 'no'])
+
+    assert asyncio.run(aggregator.prompt_user('a', prompt)) == 'yes'
+    assert upstream.calls == [('prompt_user', 'a')]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from agentic_blueprint_catalog.observability import broadcast
+from agentic_blueprint_catalog.observability.broadcast import Broadcaster
+from agentic_blueprint_catalog.observability.broadcast import QueueSubscriber
+
+
+def test_resume_replays_missed_events() -> None:
+    broadcaster = Broadcaster()
+    for i in range(3):
+        broadcaster.publish('log', {'i': i})
+    sub = broadcaster.subscribe(last_event_id=1)
+    assert sub.replay == [
+        'id: 2\nevent: log\ndata: {"i": 1}\n\n',
+        'id: 3\nevent: log\ndata: {"i": 2}\n\n',
+    ]
+    broadcaster.publish('log', {'i': 3})
+    assert isinstance(sub, QueueSubscriber)
+    assert sub.get(timeout=0) == 'id: 4\nevent: log\ndata: {"i": 3}\n\n'
+
+
+def test_resume_outside_window_needs_snapshot() -> None:
+    broadcaster = Broadcaster(replay_window=2)
+    for i in range(5):
+        broadcaster.publish('log', {'i': i})
+    assert broadcaster.subscribe(last_event_id=1).replay is None
+    assert broadcaster.subscribe().replay is None
+
+
+def test_encoding_happens_outside_lock(monkeypatch: pytest.MonkeyPatch) -> None:
+    broadcaster = Broadcaster()
+    dumps = json.dumps
+
+    def checked_dumps(data: Any) -> str:
+        assert not broadcaster._lock.locked()
+        return dumps(data)
+
+    monkeypatch.setattr(broadcast.json, 'dumps', checked_dumps)
+    broadcaster.publish('log', {'i': 0})
+    sub = broadcaster.subscribe(last_event_id=0)
+    broadcaster.publish('log', {'i': 1})
+    assert sub.replay == ['id: 1\nevent: log\ndata: {"i": 0}\n\n']
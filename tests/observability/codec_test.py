@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from agentic_blueprint_catalog.observability.codec import _FIXED_STATS_TAG
+from agentic_blueprint_catalog.observability.codec import _HEADER
+from agentic_blueprint_catalog.observability.codec import _STATS_TAG
+from agentic_blueprint_catalog.observability.codec import Decoder
+from agentic_blueprint_catalog.observability.codec import Encoder
+from agentic_blueprint_catalog.observability.message import Log
+from agentic_blueprint_catalog.observability.message import Message
+from agentic_blueprint_catalog.observability.message import Registration
+from agentic_blueprint_catalog.observability.message import Stats
+
+_GPU = {'index': 0, 'utilization_percent': 40, 'memory_used_mb': 1024.0, 'memory_total_mb': 40960.0}
+
+
+@pytest.mark.parametrize(
+    ('gpu', 'tag'),
+    (
+        ([], _FIXED_STATS_TAG),
+        ([_GPU, {**_GPU, 'index': 1}], _FIXED_STATS_TAG),
+        ([{**_GPU, 'utilization_percent': 40.5}], _STATS_TAG),
+        ([{'index': 0, 'name': 'A100'}], _STATS_TAG),
+        ([{**_GPU, 'index': 70000}], _STATS_TAG),
+    ),
+)
+def test_stats_round_trip(gpu: list[dict[str, object]], tag: int) -> None:
+    stats = Stats('agent', cpu_percent=12.5, memory_rss_mb=345.6, memory_vms_mb=1234.5, gpu=gpu)
+    frame = Encoder().encode([stats])
+    # One message: the count varint follows the header, then the tag.
+    assert frame[_HEADER.size + 1] == tag
+    assert Decoder().decode('sender', frame) == [stats]
+
+
+def test_mixed_frame_round_trip() -> None:
+    messages: list[Message] = [
+        Registration('agent', 'Spinner', 'host', 'cpu', 'gpu', 'Linux', 'x86_64', '3.12.4', {'city': 'Chicago'}),
+        Log('agent', 'Spinner', 'started', 'INFO'),
+        Stats('agent', 1.0, 2.0, 3.0, [_GPU]),
+    ]
+    encoder, decoder = Encoder(), Decoder()
+    assert decoder.decode('sender', encoder.encode(messages)) == messages
+    assert decoder.decode('sender', encoder.encode(messages)) == messages
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from agentic_blueprint_catalog.observability.dashboard import Dashboard
+from agentic_blueprint_catalog.observability.message import UserPrompt
+from agentic_blueprint_catalog.observability.prompts import PromptPolicy
+
+
+def test_init_payload_matches_snapshot() -> None:
+    dashboard = Dashboard(port=0)
+    for i in range(5):
+        dashboard.agent_heartbeat(f'agent-{i}')
+    assert json.loads(dashboard._init_payload(None, None)) == dashboard._snapshot()
+    dashboard.agent_heartbeat('agent-2')
+    assert json.loads(dashboard._init_payload(None, None)) == dashboard._snapshot()
+
+
+def test_init_payload_cache_hits_during_heartbeats() -> None:
+    dashboard = Dashboard(port=0)
+    agents = [f'agent-{i}' for i in range(50)]
+    for agent in agents:
+        dashboard.agent_heartbeat(agent)
+    dashboard._init_payload(None, None)
+    hits = dashboard._init_cache_hits
+
+    for _ in range(10):
+        dashboard.agent_heartbeat('agent-3')
+        payload = json.loads(dashboard._init_payload(None, None))
+        assert payload == dashboard._snapshot()
+
+    # Only the agent that sent a heartbeat is encoded again.
+    assert dashboard._init_cache_hits - hits == 10 * (len(agents) - 1)
+
+
+def test_init_payload_delta_has_changed_agents() -> None:
+    dashboard = Dashboard(port=0)
+    for i in range(5):
+        dashboard.agent_heartbeat(f'agent-{i}')
+    full = json.loads(dashboard._init_payload(None, None))
+    dashboard.agent_heartbeat('agent-1')
+    delta = json.loads(dashboard._init_payload(full['version'], 0))
+    assert delta['delta']
+    assert list(delta['agents']) == ['agent-1']
+
+
+def test_ask_from_unregistered_agent() -> None:
+    dashboard = Dashboard(port=0)
+    prompt = UserPrompt(agent_id='unknown', prompt='Continue?', responses=['yes', 'no'], timeout_s=0.01, default='no')
+    assert asyncio.run(dashboard.ask('unknown', prompt)) == 'no'
+
+
+def test_policy_answers_unregistered_agent() -> None:
+    dashboard = Dashboard(port=0)
+    dashboard.add_prompt_policy(PromptPolicy(pattern='Continue', response='yes'))
+    prompt = UserPrompt(agent_id='unknown', prompt='Continue?', responses=['yes', 'no'])
+    assert asyncio.run(dashboard.ask('unknown', prompt)) == 'yes'
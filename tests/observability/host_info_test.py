@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pathlib
+import time
+
+import pytest
+
+from agentic_blueprint_catalog.observability.host_info import _read_cache
+from agentic_blueprint_catalog.observability.host_info import _write_cache
+from agentic_blueprint_catalog.observability.host_info import DEFAULT_TTL_S
+from agentic_blueprint_catalog.observability.host_info import FAILED_LOOKUP_TTL_S
+from agentic_blueprint_catalog.observability.host_info import HostInfo
+
+
+@pytest.mark.parametrize(
+    ('source', 'age_s', 'override', 'hit'),
+    (
+        ('ipinfo', 2 * FAILED_LOOKUP_TTL_S, False, True),
+        ('ipinfo', 2 * DEFAULT_TTL_S, False, False),
+        ('override', 2 * FAILED_LOOKUP_TTL_S, True, True),
+        ('override', 60, False, False),
+        ('failed', 60, False, True),
+        ('failed', 2 * FAILED_LOOKUP_TTL_S, False, False),
+    ),
+)
+def test_read_cache_ttl(tmp_path: pathlib.Path, source: str, age_s: float, override: bool, hit: bool) -> None:
+    path = str(tmp_path / 'host-info.json')
+    _write_cache(path, HostInfo('host', 'cpu', 'gpu', gathered_at=time.time() - age_s, geolocation_source=source))
+    assert (_read_cache(path, DEFAULT_TTL_S, override) is not None) == hit
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import time
+
+from agentic_blueprint_catalog.observability.journal import Batches
+from agentic_blueprint_catalog.observability.journal import Journal
+from agentic_blueprint_catalog.observability.message import Log
+
+
+def _batches(i: int) -> Batches:
+    return {f'agent-{i}': [Log(agent_id=f'agent-{i}', agent_name='worker', message=f'record {i}')]}
+
+
+def _append_and_wait(journal: Journal, i: int, ts: float) -> None:
+    # Waiting until the record is readable makes every record a separate
+    # write, so rotation does not depend on how the writer batches them.
+    journal.append(_batches(i), ts)
+    deadline = time.monotonic() + 5
+    while ts not in [t for t, _ in journal.read()]:
+        assert time.monotonic() < deadline, 'record was not written'
+        time.sleep(0.001)
+
+
+def test_close_writes_queued_records(tmp_path: pathlib.Path) -> None:
+    journal = Journal(str(tmp_path))
+    journal.start()
+    for i in range(100):
+        journal.append(_batches(i), 1000.0 + i)
+    journal.close()
+    journal.close()
+
+    records = list(journal.read())
+    assert [ts for ts, _ in records] == [1000.0 + i for i in range(100)]
+    assert [batches for _, batches in records] == [_batches(i) for i in range(100)]
+    assert len(journal.segments()) == 1
+
+
+def test_rotation_and_time_range(tmp_path: pathlib.Path) -> None:
+    journal = Journal(str(tmp_path), segment_bytes=1, fsync_interval_s=0)
+    journal.start()
+    for i, ts in enumerate((1000.0, 2000.0, 3000.0, 4000.0)):
+        _append_and_wait(journal, i, ts)
+    journal.close()
+
+    # One record per segment, each named after its record's time.
+    assert [start for start, _ in journal.segments()] == [1000.0, 2000.0, 3000.0, 4000.0]
+
+    def times(since: float | None = None, until: float | None = None) -> list[float]:
+        return [ts for ts, _ in journal.read(since, until)]
+
+    assert times() == [1000.0, 2000.0, 3000.0, 4000.0]
+    assert times(since=2000.0, until=3000.0) == [2000.0, 3000.0]
+    assert times(since=2500.0) == [3000.0, 4000.0]
+    assert times(until=1500.0) == [1000.0]
+    assert times(since=5000.0) == []
+
+
+def test_reopen_appends_new_segment(tmp_path: pathlib.Path) -> None:
+    for i in range(2):
+        journal = Journal(str(tmp_path))
+        journal.start()
+        journal.append(_batches(i), 1000.0 + i)
+        journal.close()
+
+    assert [start for start, _ in journal.segments()] == [1000.0, 1001.0]
+    assert [batches for _, batches in journal.read()] == [_batches(0), _batches(1)]
+
+
+def test_read_stops_at_torn_record(tmp_path: pathlib.Path) -> None:
+    journal = Journal(str(tmp_path))
+    journal.start()
+    for i in range(3):
+        journal.append(_batches(i), 1000.0 + i)
+    journal.close()
+    (_, path), = journal.segments()
+
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 5)
+    assert [batches for _, batches in journal.read()] == [_batches(0), _batches(1)]
+
+
+def test_read_stops_at_corrupt_record(tmp_path: pathlib.Path) -> None:
+    journal = Journal(str(tmp_path))
+    journal.start()
+    for i in range(3):
+        journal.append(_batches(i), 1000.0 + i)
+    journal.close()
+    (_, path), = journal.segments()
+
+    with open(path, 'r+b') as f:
+        # Flip a byte in the payload of the last record; its CRC no longer matches.
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    assert [batches for _, batches in journal.read()] == [_batches(0), _batches(1)]
+
+
+def test_retention_removes_expired_segments(tmp_path: pathlib.Path) -> None:
+    now = time.time()
+    journal = Journal(str(tmp_path), segment_bytes=1, fsync_interval_s=0, retention_s=3600)
+    journal.start()
+    for i, ts in enumerate((now - 10000, now - 9000, now - 10)):
+        _append_and_wait(journal, i, ts)
+    journal.close()
+
+    # The first segment is removed once its successor starts before the
+    # cutoff. The second is kept because the third starts after the cutoff.
+    starts = [start for start, _ in journal.segments()]
+    assert starts == [int((now - 9000) * 1000) / 1000, int((now - 10) * 1000) / 1000]
+    assert [batches for _, batches in journal.read()] == [_batches(1), _batches(2)]
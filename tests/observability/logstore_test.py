@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from agentic_blueprint_catalog.observability.logstore import LogFilter
+from agentic_blueprint_catalog.observability.logstore import LogStore
+
+
+def _store(capacity: int, n: int) -> LogStore:
+    store = LogStore(capacity)
+    for i in range(n):
+        store.append({'agent_id': f'agent-{i % 3}', 'level': 'ERROR' if i % 5 == 0 else 'INFO', 'message': f'step {i} done', 'time': float(i)})
+    return store
+
+
+def test_query_after_wraparound() -> None:
+    store = _store(capacity=10, n=25)
+    assert [e['seq'] for e in store.query()] == list(range(15, 25))
+    assert [e['seq'] for e in store.query(LogFilter(agent='agent-0'))] == [15, 18, 21, 24]
+    assert [e['seq'] for e in store.query(LogFilter(level='ERROR'))] == [15, 20]
+    assert [e['seq'] for e in store.query(LogFilter(text='Step 17'))] == [17]
+    # Evicted entries are gone from the word index too.
+    assert store.query(LogFilter(text='step 3')) == []
+
+
+def test_query_pages_backwards() -> None:
+    store = _store(capacity=100, n=50)
+    page = store.query(LogFilter(since=10.0, until=40.0), limit=5)
+    assert [e['seq'] for e in page] == [35, 36, 37, 38, 39]
+    page = store.query(LogFilter(since=10.0, until=40.0), limit=5, before=page[0]['seq'])
+    assert [e['seq'] for e in page] == [30, 31, 32, 33, 34]
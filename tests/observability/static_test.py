@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+import pathlib
+
+from agentic_blueprint_catalog.observability.static import StaticBundle
+
+
+def test_reload_reads_only_changed_assets(tmp_path: pathlib.Path) -> None:
+    (tmp_path / 'a.png').write_bytes(b'a')
+    (tmp_path / 'b.png').write_bytes(b'b')
+    bundle = StaticBundle('<html></html>', str(tmp_path))
+    page = bundle.page
+
+    assert bundle.reload(['a.png', 'b.png']) == []
+
+    (tmp_path / 'b.png').write_bytes(b'bb')
+    (tmp_path / 'c.png').write_bytes(b'c')
+    os.remove(tmp_path / 'a.png')
+    assert sorted(bundle.reload(['a.png', 'b.png', 'c.png'])) == ['a.png', 'b.png', 'c.png']
+    assert bundle.names() == ['b.png', 'c.png']
+    b = bundle.asset('b.png')
+    assert b is not None
+    assert b.body == b'bb'
+    assert bundle.page is page